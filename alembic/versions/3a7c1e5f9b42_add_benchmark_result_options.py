@@ -0,0 +1,74 @@
+"""add benchmark result options
+
+Revision ID: 3a7c1e5f9b42
+Revises: 6d1e9b3f4c21
+Create Date: 2026-10-19 00:00:00.000000
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "3a7c1e5f9b42"
+down_revision: Union[str, Sequence[str], None] = "6d1e9b3f4c21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = set(sa.inspect(bind).get_table_names())
+    if "benchmark_result_option" in tables:
+        return
+
+    op.create_table(
+        "benchmark_result_option",
+        sa.Column("result_id", sa.Integer(), nullable=False),
+        sa.Column("option_id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.String(length=191), nullable=False),
+        sa.ForeignKeyConstraint(["result_id"], ["benchmarkresult.id"]),
+        sa.ForeignKeyConstraint(["option_id"], ["benchmarkoption.id"]),
+        sa.PrimaryKeyConstraint("result_id", "option_id"),
+    )
+    op.create_index(
+        "ix_benchmark_result_option_option_value",
+        "benchmark_result_option",
+        ["option_id", "value"],
+    )
+
+    option_benchmarks = dict(bind.execute(sa.text("SELECT id, benchmark_id FROM benchmarkoption")).all())
+    results = bind.execute(
+        sa.text("SELECT id, benchmark_id, option_values FROM benchmarkresult WHERE option_values IS NOT NULL")
+    ).all()
+
+    rows = []
+    for result_id, benchmark_id, raw in results:
+        try:
+            values = json.loads(raw)
+        except (TypeError, json.JSONDecodeError):
+            continue
+        if not isinstance(values, dict):
+            continue
+        for key, value in values.items():
+            value = str(value).strip()
+            option_id = int(key) if str(key).isdigit() else None
+            if value and option_benchmarks.get(option_id) == benchmark_id:
+                rows.append({"result_id": result_id, "option_id": option_id, "value": value})
+
+    if rows:
+        bind.execute(
+            sa.text(
+                "INSERT INTO benchmark_result_option (result_id, option_id, value) "
+                "VALUES (:result_id, :option_id, :value)"
+            ),
+            rows,
+        )
+
+
+def downgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "benchmark_result_option" in tables:
+        op.drop_index("ix_benchmark_result_option_option_value", table_name="benchmark_result_option")
+        op.drop_table("benchmark_result_option")
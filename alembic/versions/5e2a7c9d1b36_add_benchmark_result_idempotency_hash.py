@@ -0,0 +1,31 @@
+"""add benchmark result idempotency hash
+
+Revision ID: 5e2a7c9d1b36
+Revises: d3e8f1b6a472
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "5e2a7c9d1b36"
+down_revision: Union[str, Sequence[str], None] = "d3e8f1b6a472"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows stored before keep a NULL idempotency hash; their keys were never recorded.
+    existing_columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("benchmarkresult")}
+    if "idempotency_hash" not in existing_columns:
+        op.add_column("benchmarkresult", sa.Column("idempotency_hash", sa.String(length=40), nullable=True))
+        op.create_index("ix_benchmarkresult_idempotency_hash", "benchmarkresult", ["idempotency_hash"])
+
+
+def downgrade() -> None:
+    existing_columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("benchmarkresult")}
+    if "idempotency_hash" in existing_columns:
+        op.drop_index("ix_benchmarkresult_idempotency_hash", table_name="benchmarkresult")
+        op.drop_column("benchmarkresult", "idempotency_hash")
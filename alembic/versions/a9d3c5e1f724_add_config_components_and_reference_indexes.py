@@ -0,0 +1,130 @@
+"""add config components and reference indexes
+
+Revision ID: a9d3c5e1f724
+Revises: f2b7d4e9a160
+Create Date: 2026-10-19 00:00:00.000000
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a9d3c5e1f724"
+down_revision: Union[str, Sequence[str], None] = "f2b7d4e9a160"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs that delete handlers look up by.
+REFERENCE_COLUMNS = (
+    ("config", "cpu_id"),
+    ("config", "gpu_id"),
+    ("config", "motherboard_id"),
+    ("config", "disk_id"),
+    ("config", "os_id"),
+    ("config", "ram_id"),
+    ("cpu", "cpu_brand_id"),
+    ("cpu", "cpu_family_id"),
+    ("gpu", "gpu_manufacturer_id"),
+    ("gpu", "gpu_brand_id"),
+    ("gpu", "gpu_model_id"),
+    ("gpu", "gpu_vram_type_id"),
+    ("motherboard", "manufacturer_id"),
+    ("motherboard", "chipset_id"),
+    ("benchmark", "benchmark_target_id"),
+    ("benchmarkoption", "benchmark_id"),
+    ("benchmarkresult", "benchmark_id"),
+    ("benchmarkresult", "config_id"),
+)
+
+
+# Frozen copies of utils.config_components.component_ids and models.config.config_component_rows.
+def _component_ids(raw: str | None, fallback_id: int | None, fallback_quantity: int | None = 1) -> list[int]:
+    if raw:
+        try:
+            values = json.loads(raw)
+        except json.JSONDecodeError:
+            values = None
+
+        if isinstance(values, list):
+            ids = []
+            for value in values:
+                try:
+                    component_id = int(value)
+                except (TypeError, ValueError):
+                    continue
+                if component_id > 0:
+                    ids.append(component_id)
+            return ids
+
+    if fallback_id is None:
+        return []
+
+    quantity = max(int(fallback_quantity or 1), 1)
+    return [int(fallback_id)] * quantity
+
+
+def _config_component_rows(config) -> list[dict]:
+    return [
+        {"config_id": config.id, "kind": kind, "slot": slot, "component_id": component_id}
+        for kind, ids in (
+            ("cpu", _component_ids(config.cpu_component_ids, config.cpu_id, config.cpu_quantity)),
+            ("gpu", _component_ids(config.gpu_component_ids, config.gpu_id, config.gpu_quantity)),
+        )
+        for slot, component_id in enumerate(ids)
+    ]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table_name, column in REFERENCE_COLUMNS:
+        index_name = f"ix_{table_name}_{column}"
+        if index_name not in {index["name"] for index in inspector.get_indexes(table_name)}:
+            op.create_index(index_name, table_name, [column])
+
+    if "config_component" in inspector.get_table_names():
+        return
+
+    config_component = op.create_table(
+        "config_component",
+        sa.Column("config_id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=8), nullable=False),
+        sa.Column("slot", sa.Integer(), nullable=False),
+        sa.Column("component_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["config_id"], ["config.id"]),
+        sa.PrimaryKeyConstraint("config_id", "kind", "slot"),
+    )
+    op.create_index("ix_config_component_kind_component", "config_component", ["kind", "component_id"])
+
+    config = sa.table(
+        "config",
+        *(sa.column(name, sa.Integer) for name in ("id", "cpu_id", "cpu_quantity", "gpu_id", "gpu_quantity")),
+        sa.column("cpu_component_ids", sa.String),
+        sa.column("gpu_component_ids", sa.String),
+    )
+    configs = bind.execute(
+        sa.select(
+            config.c.id,
+            config.c.cpu_component_ids, config.c.cpu_id, config.c.cpu_quantity,
+            config.c.gpu_component_ids, config.c.gpu_id, config.c.gpu_quantity,
+        )
+    ).all()
+    rows = [row for config_row in configs for row in _config_component_rows(config_row)]
+    if rows:
+        op.bulk_insert(config_component, rows)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "config_component" in inspector.get_table_names():
+        op.drop_index("ix_config_component_kind_component", table_name="config_component")
+        op.drop_table("config_component")
+
+    for table_name, column in REFERENCE_COLUMNS:
+        index_name = f"ix_{table_name}_{column}"
+        if index_name in {index["name"] for index in inspector.get_indexes(table_name)}:
+            op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,117 @@
+"""add benchmark result settings key
+
+Revision ID: b81f2d6e4a37
+Revises: 3a7c1e5f9b42
+Create Date: 2026-10-19 00:00:00.000000
+"""
+import hashlib
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b81f2d6e4a37"
+down_revision: Union[str, Sequence[str], None] = "3a7c1e5f9b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copies of the utils.result_settings helpers as of this revision.
+def _dedupe_setting_parts(value: str | None) -> str:
+    parts = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if part and part not in parts:
+            parts.append(part)
+    return ", ".join(parts)
+
+
+def _custom_settings(settings: str | None, labels: list[str]) -> str:
+    generated_settings = ", ".join(labels)
+    custom_settings = (settings or "").strip()
+    if generated_settings and custom_settings == generated_settings:
+        custom_settings = ""
+    elif generated_settings and custom_settings.startswith(f"{generated_settings}, "):
+        custom_settings = custom_settings[len(generated_settings) + 2:].strip()
+    return custom_settings
+
+
+def _settings_key(selected: list[tuple[int, str]], custom_settings: str | None) -> str:
+    canonical = json.dumps(
+        {
+            "options": [[int(option_id), value] for option_id, value in selected],
+            "custom": _dedupe_setting_parts(custom_settings),
+        },
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing_columns = {column["name"] for column in sa.inspect(bind).get_columns("benchmarkresult")}
+    if "settings_key" not in existing_columns:
+        op.add_column("benchmarkresult", sa.Column("settings_key", sa.String(length=40), nullable=True))
+        op.create_index("ix_benchmarkresult_settings_key", "benchmarkresult", ["settings_key"])
+
+    options = sa.table(
+        "benchmarkoption",
+        sa.column("id", sa.Integer),
+        sa.column("benchmark_id", sa.Integer),
+        sa.column("name", sa.String),
+        sa.column("sort_order", sa.Integer),
+    )
+    results = sa.table(
+        "benchmarkresult",
+        sa.column("id", sa.Integer),
+        sa.column("benchmark_id", sa.Integer),
+        sa.column("option_values", sa.Text),
+        sa.column("settings", sa.Text),
+        sa.column("settings_key", sa.String),
+    )
+
+    options_by_benchmark = {}
+    for option_id, benchmark_id, name in bind.execute(
+        sa.select(options.c.id, options.c.benchmark_id, options.c.name).order_by(options.c.sort_order, options.c.id)
+    ).all():
+        options_by_benchmark.setdefault(benchmark_id, []).append((option_id, name))
+
+    rows = []
+    for result_id, benchmark_id, raw, settings in bind.execute(
+        sa.select(results.c.id, results.c.benchmark_id, results.c.option_values, results.c.settings)
+        .where(results.c.settings_key.is_(None))
+    ).all():
+        try:
+            values = json.loads(raw) if raw else {}
+        except json.JSONDecodeError:
+            values = {}
+        if not isinstance(values, dict):
+            values = {}
+        values = {str(key): str(value).strip() for key, value in values.items() if str(value).strip()}
+
+        selected = [
+            (option_id, name, values[str(option_id)])
+            for option_id, name in options_by_benchmark.get(benchmark_id, [])
+            if values.get(str(option_id))
+        ]
+        custom = _custom_settings(settings, [f"{name}: {value}" for _id, name, value in selected])
+        rows.append({
+            "row_id": result_id,
+            "key": _settings_key([(option_id, value) for option_id, _name, value in selected], custom),
+        })
+
+    if rows:
+        bind.execute(
+            results.update().where(results.c.id == sa.bindparam("row_id")).values(settings_key=sa.bindparam("key")),
+            rows,
+        )
+
+
+def downgrade() -> None:
+    existing_columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("benchmarkresult")}
+    if "settings_key" in existing_columns:
+        op.drop_index("ix_benchmarkresult_settings_key", table_name="benchmarkresult")
+        op.drop_column("benchmarkresult", "settings_key")
@@ -0,0 +1,76 @@
+"""add name_key columns
+
+Revision ID: c6f1a8d3e592
+Revises: e4a9c2f7d815
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c6f1a8d3e592"
+down_revision: Union[str, Sequence[str], None] = "e4a9c2f7d815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NAME_KEY_LENGTH = 191
+
+# table -> (index name, indexed columns, unique)
+NAME_KEY_INDEXES = {
+    "cpubrand": ("ix_cpubrand_name_key", ["name_key"], True),
+    "cpufamily": ("ix_cpufamily_name_key", ["name_key", "cpu_brand_id"], True),
+    "gpumanufacturer": ("ix_gpumanufacturer_name_key", ["name_key"], True),
+    "gpubrand": ("ix_gpubrand_name_key", ["name_key"], True),
+    "gpumodel": ("ix_gpumodel_name_key", ["name_key", "gpu_brand_id"], True),
+    "gpuvramtype": ("ix_gpuvramtype_name_key", ["name_key"], True),
+    "motherboardmanufacturer": ("ix_motherboardmanufacturer_name_key", ["name_key"], True),
+    "motherboardchipset": ("ix_motherboardchipset_name_key", ["name_key"], True),
+    "ram": ("ix_ram_name_key", ["name_key"], True),
+    "disk": ("ix_disk_name_key", ["name_key"], True),
+    "os": ("ix_os_name_key", ["name_key"], True),
+    "config": ("ix_config_name_key", ["name_key"], True),
+    "benchmarktarget": ("ix_benchmarktarget_name_key", ["name_key"], True),
+    "benchmark": ("ix_benchmark_name_key", ["name_key"], False),
+}
+
+
+def _name_key(name: str) -> str:
+    return " ".join(name.split()).casefold()[:NAME_KEY_LENGTH]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for table_name, (index_name, columns, unique) in NAME_KEY_INDEXES.items():
+        if "name_key" in {column["name"] for column in inspector.get_columns(table_name)}:
+            continue
+        op.add_column(table_name, sa.Column("name_key", sa.String(length=NAME_KEY_LENGTH), nullable=True))
+
+        parent_columns = [sa.column(column, sa.Integer) for column in columns[1:]]
+        table = sa.table(
+            table_name,
+            sa.column("id", sa.Integer),
+            sa.column("name", sa.String),
+            sa.column("name_key", sa.String),
+            *parent_columns,
+        )
+        rows = bind.execute(sa.select(table.c.id, table.c.name, *[table.c[column] for column in columns[1:]])).all()
+        if rows:
+            bind.execute(
+                table.update().where(table.c.id == sa.bindparam("row_id")).values(name_key=sa.bindparam("key")),
+                [{"row_id": row[0], "key": _name_key(row[1])} for row in rows],
+            )
+
+        # Names that already differ only in case keep a non-unique index until they are merged.
+        keys = {(_name_key(row[1]), *row[2:]) for row in rows}
+        op.create_index(index_name, table_name, columns, unique=unique and len(keys) == len(rows))
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table_name, (index_name, _columns, _unique) in NAME_KEY_INDEXES.items():
+        if "name_key" in {column["name"] for column in inspector.get_columns(table_name)}:
+            op.drop_index(index_name, table_name=table_name)
+            op.drop_column(table_name, "name_key")
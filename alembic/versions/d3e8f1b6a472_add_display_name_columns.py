@@ -0,0 +1,196 @@
+"""add display name columns
+
+Revision ID: d3e8f1b6a472
+Revises: a9d3c5e1f724
+Create Date: 2026-10-19 00:00:00.000000
+"""
+import json
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d3e8f1b6a472"
+down_revision: Union[str, Sequence[str], None] = "a9d3c5e1f724"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DISPLAY_NAME_LENGTH = 255
+DISPLAY_NAME_TABLES = ("cpu", "gpu", "motherboard", "config")
+
+
+# Frozen copies of the utils.display_names and utils.config_components helpers as of this revision.
+def _compact(parts) -> str:
+    return " ".join(str(part).strip() for part in parts if part is not None and str(part).strip())
+
+
+def _with_details(name: str, details) -> str:
+    details = [str(detail).strip() for detail in details if detail is not None and str(detail).strip()]
+    return f"{name} ({', '.join(details)})" if details else name
+
+
+def _cpu_display_name(brand, family, model, speed, core_count) -> str:
+    return _with_details(_compact([brand, family, model]), [speed, f"{core_count} cores" if core_count else None])
+
+
+def _gpu_display_name(manufacturer, brand, model, vram_size, vram_type) -> str:
+    return _with_details(_compact([manufacturer, brand, model]), [_compact([vram_size, vram_type])])
+
+
+def _motherboard_display_name(manufacturer, model, chipset) -> str:
+    return _with_details(_compact([manufacturer, model]), [chipset])
+
+
+def _summarize_components(names) -> list[str]:
+    counts = Counter(name for name in names if name)
+    return [f"{count}x {name}" if count > 1 else name for name, count in counts.items()]
+
+
+def _config_display_name(name: str, cpu_names, gpu_names) -> str:
+    hardware = " / ".join(
+        ", ".join(summary)
+        for summary in (_summarize_components(cpu_names), _summarize_components(gpu_names))
+        if summary
+    )
+    return f"{name}: {hardware}" if hardware else name
+
+
+def _component_ids(raw: str | None, fallback_id: int | None, fallback_quantity: int | None = 1) -> list[int]:
+    if raw:
+        try:
+            values = json.loads(raw)
+        except json.JSONDecodeError:
+            values = None
+
+        if isinstance(values, list):
+            ids = []
+            for value in values:
+                try:
+                    component_id = int(value)
+                except (TypeError, ValueError):
+                    continue
+                if component_id > 0:
+                    ids.append(component_id)
+            return ids
+
+    if fallback_id is None:
+        return []
+
+    quantity = max(int(fallback_quantity or 1), 1)
+    return [int(fallback_id)] * quantity
+
+
+def _table(name: str, *columns: str):
+    return sa.table(name, *(sa.column(column) for column in columns))
+
+
+def _write_display_names(bind, table, names: dict[int, str]) -> None:
+    if names:
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam("row_id")).values(display_name=sa.bindparam("new_name")),
+            [{"row_id": row_id, "new_name": name[:DISPLAY_NAME_LENGTH]} for row_id, name in names.items()],
+        )
+
+
+def _backfill_display_names(bind) -> None:
+    """Fill every NULL display_name; components first, since config names are built from theirs."""
+    cpu = _table("cpu", "id", "display_name", "model", "speed", "core_count", "cpu_brand_id", "cpu_family_id")
+    cpu_brand, cpu_family = _table("cpubrand", "id", "name"), _table("cpufamily", "id", "name")
+    _write_display_names(bind, cpu, {
+        row.id: _cpu_display_name(row.brand, row.family, row.model, row.speed, row.core_count)
+        for row in bind.execute(
+            sa.select(
+                cpu.c.id, cpu_brand.c.name.label("brand"), cpu_family.c.name.label("family"),
+                cpu.c.model, cpu.c.speed, cpu.c.core_count,
+            )
+            .select_from(cpu)
+            .outerjoin(cpu_brand, cpu_brand.c.id == cpu.c.cpu_brand_id)
+            .outerjoin(cpu_family, cpu_family.c.id == cpu.c.cpu_family_id)
+            .where(cpu.c.display_name.is_(None))
+        )
+    })
+
+    gpu = _table(
+        "gpu", "id", "display_name", "vram_size",
+        "gpu_manufacturer_id", "gpu_brand_id", "gpu_model_id", "gpu_vram_type_id",
+    )
+    gpu_manufacturer, gpu_brand = _table("gpumanufacturer", "id", "name"), _table("gpubrand", "id", "name")
+    gpu_model, gpu_vram_type = _table("gpumodel", "id", "name"), _table("gpuvramtype", "id", "name")
+    _write_display_names(bind, gpu, {
+        row.id: _gpu_display_name(row.manufacturer, row.brand, row.model, row.vram_size, row.vram_type)
+        for row in bind.execute(
+            sa.select(
+                gpu.c.id, gpu_manufacturer.c.name.label("manufacturer"), gpu_brand.c.name.label("brand"),
+                gpu_model.c.name.label("model"), gpu.c.vram_size, gpu_vram_type.c.name.label("vram_type"),
+            )
+            .select_from(gpu)
+            .outerjoin(gpu_manufacturer, gpu_manufacturer.c.id == gpu.c.gpu_manufacturer_id)
+            .outerjoin(gpu_brand, gpu_brand.c.id == gpu.c.gpu_brand_id)
+            .outerjoin(gpu_model, gpu_model.c.id == gpu.c.gpu_model_id)
+            .outerjoin(gpu_vram_type, gpu_vram_type.c.id == gpu.c.gpu_vram_type_id)
+            .where(gpu.c.display_name.is_(None))
+        )
+    })
+
+    motherboard = _table("motherboard", "id", "display_name", "model", "manufacturer_id", "chipset_id")
+    manufacturer = _table("motherboardmanufacturer", "id", "name")
+    chipset = _table("motherboardchipset", "id", "name")
+    _write_display_names(bind, motherboard, {
+        row.id: _motherboard_display_name(row.manufacturer, row.model, row.chipset)
+        for row in bind.execute(
+            sa.select(
+                motherboard.c.id, manufacturer.c.name.label("manufacturer"),
+                motherboard.c.model, chipset.c.name.label("chipset"),
+            )
+            .select_from(motherboard)
+            .outerjoin(manufacturer, manufacturer.c.id == motherboard.c.manufacturer_id)
+            .outerjoin(chipset, chipset.c.id == motherboard.c.chipset_id)
+            .where(motherboard.c.display_name.is_(None))
+        )
+    })
+
+    config = _table(
+        "config", "id", "display_name", "name",
+        "cpu_component_ids", "cpu_id", "cpu_quantity", "gpu_component_ids", "gpu_id", "gpu_quantity",
+    )
+    configs = bind.execute(
+        sa.select(
+            config.c.id, config.c.name,
+            config.c.cpu_component_ids, config.c.cpu_id, config.c.cpu_quantity,
+            config.c.gpu_component_ids, config.c.gpu_id, config.c.gpu_quantity,
+        ).where(config.c.display_name.is_(None))
+    ).all()
+    if not configs:
+        return
+    cpu_names = dict(bind.execute(sa.select(cpu.c.id, cpu.c.display_name)).all())
+    gpu_names = dict(bind.execute(sa.select(gpu.c.id, gpu.c.display_name)).all())
+    _write_display_names(bind, config, {
+        row.id: _config_display_name(
+            row.name,
+            [cpu_names.get(cpu_id) for cpu_id in _component_ids(row.cpu_component_ids, row.cpu_id, row.cpu_quantity)],
+            [gpu_names.get(gpu_id) for gpu_id in _component_ids(row.gpu_component_ids, row.gpu_id, row.gpu_quantity)],
+        )
+        for row in configs
+    })
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for table_name in DISPLAY_NAME_TABLES:
+        if "display_name" in {column["name"] for column in inspector.get_columns(table_name)}:
+            continue
+        op.add_column(table_name, sa.Column("display_name", sa.String(DISPLAY_NAME_LENGTH), nullable=True))
+        op.create_index(f"ix_{table_name}_display_name", table_name, ["display_name"])
+
+    _backfill_display_names(bind)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table_name in DISPLAY_NAME_TABLES:
+        if "display_name" in {column["name"] for column in inspector.get_columns(table_name)}:
+            op.drop_index(f"ix_{table_name}_display_name", table_name=table_name)
+            op.drop_column(table_name, "display_name")
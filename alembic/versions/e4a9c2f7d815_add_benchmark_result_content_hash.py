@@ -0,0 +1,32 @@
+"""add benchmark result content hash
+
+Revision ID: e4a9c2f7d815
+Revises: b81f2d6e4a37
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e4a9c2f7d815"
+down_revision: Union[str, Sequence[str], None] = "b81f2d6e4a37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows keep a NULL hash: they may already contain duplicates, and
+    # only results written from now on are deduplicated.
+    existing_columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("benchmarkresult")}
+    if "content_hash" not in existing_columns:
+        op.add_column("benchmarkresult", sa.Column("content_hash", sa.String(length=40), nullable=True))
+        op.create_index("ix_benchmarkresult_content_hash", "benchmarkresult", ["content_hash"], unique=True)
+
+
+def downgrade() -> None:
+    existing_columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("benchmarkresult")}
+    if "content_hash" in existing_columns:
+        op.drop_index("ix_benchmarkresult_content_hash", table_name="benchmarkresult")
+        op.drop_column("benchmarkresult", "content_hash")
@@ -0,0 +1,93 @@
+"""add parsed speed and size columns
+
+Revision ID: f2b7d4e9a160
+Revises: c6f1a8d3e592
+Create Date: 2026-10-19 00:00:00.000000
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f2b7d4e9a160"
+down_revision: Union[str, Sequence[str], None] = "c6f1a8d3e592"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copies of the models.units parsers as of this revision.
+_NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?(?!\d)|\d+(?:[.,]\d+)?"
+_THOUSANDS = re.compile(r",(?=\d{3}(?!\d))")
+_CLOCK = re.compile(rf"({_NUMBER})\s*([GM]Hz)?", re.IGNORECASE)
+_SIZE = re.compile(rf"(?:(\d+)\s*[x×*]\s*)?({_NUMBER})\s*([KMGT])(?:i?B)?\b", re.IGNORECASE)
+_SIZE_POWERS = {"k": 1, "m": 2, "g": 3, "t": 4}
+
+
+def _number(value: str) -> float:
+    return float(_THOUSANDS.sub("", value).replace(",", "."))
+
+
+def _parse_clock_mhz(text: str | None) -> int | None:
+    if not text:
+        return None
+    matches = _CLOCK.findall(text)
+    with_unit = [match for match in matches if match[1]]
+    if with_unit:
+        value, unit = with_unit[-1]
+        value = _number(value)
+        return round(value * 1000 if unit.lower() == "ghz" else value)
+    if not matches:
+        return None
+    value = _number(matches[-1][0])
+    return round(value * 1000 if value <= 10 else value)
+
+
+def _parse_size_bytes(text: str | None) -> int | None:
+    if not text:
+        return None
+    match = _SIZE.search(text)
+    if match:
+        count, value, unit = match.groups()
+        return round(int(count or 1) * _number(value) * 1024 ** _SIZE_POWERS[unit.lower()])
+    bare = re.search(_NUMBER, text)
+    if bare is None:
+        return None
+    return round(_number(bare.group(0)) * 1024 ** 2)
+
+
+PARSED_COLUMNS = (
+    ("cpu", "speed", "speed_mhz", sa.Integer(), _parse_clock_mhz),
+    ("gpu", "vram_size", "vram_bytes", sa.BigInteger(), _parse_size_bytes),
+    ("config", "ram_size", "ram_bytes", sa.BigInteger(), _parse_size_bytes),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for table_name, source, target, column_type, parser in PARSED_COLUMNS:
+        if target in {column["name"] for column in inspector.get_columns(table_name)}:
+            continue
+        op.add_column(table_name, sa.Column(target, column_type, nullable=True))
+        op.create_index(f"ix_{table_name}_{target}", table_name, [target])
+
+        table = sa.table(table_name, sa.column("id", sa.Integer), sa.column(source, sa.String), sa.column(target))
+        updates = [
+            {"row_id": row_id, "value": value}
+            for row_id, raw in bind.execute(sa.select(table.c.id, table.c[source])).all()
+            if (value := parser(raw)) is not None
+        ]
+        if updates:
+            bind.execute(
+                table.update().where(table.c.id == sa.bindparam("row_id")).values({target: sa.bindparam("value")}),
+                updates,
+            )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table_name, _source, target, _column_type, _parser in PARSED_COLUMNS:
+        if target in {column["name"] for column in inspector.get_columns(table_name)}:
+            op.drop_index(f"ix_{table_name}_{target}", table_name=table_name)
+            op.drop_column(table_name, target)
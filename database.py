@@ -1,6 +1,7 @@
 # database.py
 from sqlmodel import SQLModel, create_engine, Session
-from sqlalchemy import inspect, text
+from sqlalchemy import bindparam, inspect, select, text
+import json
 import os
 
 # Load .env if available
@@ -17,10 +18,15 @@ from models.motherboard import MotherboardManufacturer, MotherboardChipset, Moth
 from models.ram import RAM
 from models.disk import Disk
 from models.oses import OS
-from models.config import Config
+from models.config import Config, ConfigComponent, config_component_rows
 from models.benchmark import BenchmarkTarget, Benchmark, BenchmarkOption
-from models.benchmark_results import BenchmarkResult
+from models.benchmark_results import BenchmarkResult, BenchmarkResultOption
 from models.settings import Setting  # <-- new: key/value settings table
+from models.display_name import refresh_display_names
+from models.name_key import NAME_KEY_LENGTH, normalize_name_key
+from models.units import parse_clock_mhz, parse_size_bytes
+from utils.display_names import DISPLAY_NAME_LENGTH
+from utils.result_settings import settings_key, split_settings
 
 
 def _env(name: str, default: str | None = None) -> str | None:
@@ -64,6 +70,7 @@ def check_tables_exist() -> bool:
         "benchmarktarget", "benchmark",
         "benchmarkoption",
         "benchmarkresult",
+        "benchmark_result_option",
         "settings",  # ensure our new settings table is considered
     }
     return required.issubset(tables)
@@ -75,9 +82,24 @@ def init_db():
     Always call create_all so newly added models (e.g., 'settings') are created
     even on an existing database.
     """
+    existing_tables = set(inspect(engine).get_table_names())
+    had_result_options = "benchmark_result_option" in existing_tables
+    had_config_components = "config_component" in existing_tables
     SQLModel.metadata.create_all(bind=engine)
     _ensure_config_quantity_columns()
     _ensure_benchmark_result_settings_column()
+    _ensure_name_key_columns()
+    backfill_name_keys()
+    _ensure_parsed_unit_columns()
+    backfill_parsed_units()
+    _ensure_display_name_columns()
+    _ensure_indexes()
+    backfill_display_names()
+    if not had_config_components:
+        _backfill_config_components()
+    if not had_result_options:
+        _backfill_benchmark_result_options()
+    _backfill_benchmark_result_settings_keys()
 
 
 def _ensure_config_quantity_columns():
@@ -115,6 +137,15 @@ def _ensure_benchmark_result_settings_column():
         statements.append("ALTER TABLE benchmarkresult ADD COLUMN settings TEXT")
     if "option_values" not in existing_columns:
         statements.append("ALTER TABLE benchmarkresult ADD COLUMN option_values TEXT")
+    if "settings_key" not in existing_columns:
+        statements.append("ALTER TABLE benchmarkresult ADD COLUMN settings_key VARCHAR(40)")
+        statements.append("CREATE INDEX ix_benchmarkresult_settings_key ON benchmarkresult (settings_key)")
+    if "content_hash" not in existing_columns:
+        statements.append("ALTER TABLE benchmarkresult ADD COLUMN content_hash VARCHAR(40)")
+        statements.append("CREATE UNIQUE INDEX ix_benchmarkresult_content_hash ON benchmarkresult (content_hash)")
+    if "idempotency_hash" not in existing_columns:
+        statements.append("ALTER TABLE benchmarkresult ADD COLUMN idempotency_hash VARCHAR(40)")
+        statements.append("CREATE INDEX ix_benchmarkresult_idempotency_hash ON benchmarkresult (idempotency_hash)")
 
     if not statements:
         return
@@ -124,6 +155,233 @@ def _ensure_benchmark_result_settings_column():
             conn.execute(text(statement))
 
 
+def _name_key_tables():
+    """Yield (table, index) for every table with a name_key column and the index that covers it."""
+    for table in SQLModel.metadata.sorted_tables:
+        if "name_key" in table.c:
+            yield table, next(index for index in table.indexes if "name_key" in index.columns)
+
+
+def _ensure_name_key_columns():
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = [
+        (table, index)
+        for table, index in _name_key_tables()
+        if table.name in existing_tables
+        and "name_key" not in {column["name"] for column in inspector.get_columns(table.name)}
+    ]
+    if not missing:
+        return
+
+    with engine.begin() as conn:
+        for table, _index in missing:
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN name_key VARCHAR({NAME_KEY_LENGTH})"))
+    backfill_name_keys()
+
+    with engine.begin() as conn:
+        for table, index in missing:
+            columns = ", ".join(column.name for column in index.columns)
+            unique = index.unique
+            if unique and conn.execute(
+                text(f"SELECT 1 FROM {table.name} GROUP BY {columns} HAVING COUNT(*) > 1 LIMIT 1")
+            ).first():
+                # Rows that differ only in case or spacing predate the check; index without
+                # the constraint until they are merged, the API still refuses new duplicates.
+                print(f"[init_db] {table.name} has names that differ only in case; {index.name} created non-unique.")
+                unique = False
+            conn.execute(text(f"CREATE {'UNIQUE ' if unique else ''}INDEX {index.name} ON {table.name} ({columns})"))
+
+
+def backfill_name_keys():
+    """Fill name_key for rows written outside the ORM, e.g. by the SQL hardware seed files."""
+    with engine.begin() as conn:
+        existing_tables = set(inspect(conn).get_table_names())
+        for table, _index in _name_key_tables():
+            if table.name not in existing_tables:
+                continue
+            rows = conn.execute(select(table.c.id, table.c.name).where(table.c.name_key.is_(None))).all()
+            if rows:
+                conn.execute(
+                    table.update().where(table.c.id == bindparam("row_id")).values(name_key=bindparam("key")),
+                    [{"row_id": row_id, "key": normalize_name_key(name)} for row_id, name in rows],
+                )
+
+
+# (table, free-text column, parsed column, SQL type, parser)
+PARSED_UNIT_COLUMNS = (
+    ("cpu", "speed", "speed_mhz", "INTEGER", parse_clock_mhz),
+    ("gpu", "vram_size", "vram_bytes", "BIGINT", parse_size_bytes),
+    ("config", "ram_size", "ram_bytes", "BIGINT", parse_size_bytes),
+)
+
+
+def _ensure_parsed_unit_columns():
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    statements = []
+    for table, _source, target, sql_type, _parser in PARSED_UNIT_COLUMNS:
+        if table not in existing_tables:
+            continue
+        if target not in {column["name"] for column in inspector.get_columns(table)}:
+            statements.append(f"ALTER TABLE {table} ADD COLUMN {target} {sql_type}")
+            statements.append(f"CREATE INDEX ix_{table}_{target} ON {table} ({target})")
+
+    if not statements:
+        return
+
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+
+
+def backfill_parsed_units():
+    """Parse speed/size columns of rows written before the numeric columns existed."""
+    with engine.begin() as conn:
+        for table, source, target, _sql_type, parser in PARSED_UNIT_COLUMNS:
+            rows = conn.execute(
+                text(f"SELECT id, {source} FROM {table} WHERE {target} IS NULL AND {source} IS NOT NULL")
+            ).all()
+            updates = [
+                {"id": row_id, "value": value}
+                for row_id, raw in rows
+                if (value := parser(raw)) is not None
+            ]
+            if updates:
+                conn.execute(text(f"UPDATE {table} SET {target} = :value WHERE id = :id"), updates)
+
+
+DISPLAY_NAME_TABLES = ("cpu", "gpu", "motherboard", "config")
+
+
+def _ensure_display_name_columns():
+    """Add the display_name columns; _ensure_indexes creates their indexes."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = [
+        table
+        for table in DISPLAY_NAME_TABLES
+        if table in existing_tables
+        and "display_name" not in {column["name"] for column in inspector.get_columns(table)}
+    ]
+    if not missing:
+        return
+
+    with engine.begin() as conn:
+        for table in missing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN display_name VARCHAR({DISPLAY_NAME_LENGTH})"))
+
+
+def backfill_display_names():
+    """Fill display_name for rows written outside the ORM, e.g. by the SQL hardware seed files."""
+    with engine.begin() as conn:
+        refresh_display_names(conn, only_missing=True)
+
+
+def _ensure_indexes():
+    """Create plain indexes declared on the models after their table already existed."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = [
+        index
+        for table in SQLModel.metadata.sorted_tables
+        if table.name in existing_tables
+        for index in table.indexes
+        if not index.unique and index.name not in {existing["name"] for existing in inspector.get_indexes(table.name)}
+    ]
+    if not missing:
+        return
+
+    with engine.begin() as conn:
+        for index in missing:
+            index.create(bind=conn)
+
+
+def _backfill_config_components():
+    """Populate config_component from the component lists of existing configs."""
+    with engine.begin() as conn:
+        configs = conn.execute(
+            text(
+                "SELECT id, cpu_component_ids, cpu_id, cpu_quantity, gpu_component_ids, gpu_id, gpu_quantity "
+                "FROM config"
+            )
+        ).all()
+        rows = [row for config in configs for row in config_component_rows(config.id, config)]
+        if rows:
+            conn.execute(ConfigComponent.__table__.insert(), rows)
+
+
+def _backfill_benchmark_result_options():
+    """Populate benchmark_result_option from the option_values JSON of existing results."""
+    with engine.begin() as conn:
+        option_benchmarks = dict(conn.execute(text("SELECT id, benchmark_id FROM benchmarkoption")).all())
+        results = conn.execute(
+            text("SELECT id, benchmark_id, option_values FROM benchmarkresult WHERE option_values IS NOT NULL")
+        ).all()
+
+        rows = []
+        for result_id, benchmark_id, raw in results:
+            try:
+                values = json.loads(raw)
+            except (TypeError, json.JSONDecodeError):
+                continue
+            if not isinstance(values, dict):
+                continue
+            for key, value in values.items():
+                value = str(value).strip()
+                option_id = int(key) if str(key).isdigit() else None
+                if value and option_benchmarks.get(option_id) == benchmark_id:
+                    rows.append({"result_id": result_id, "option_id": option_id, "value": value})
+
+        if rows:
+            conn.execute(
+                text(
+                    "INSERT INTO benchmark_result_option (result_id, option_id, value) "
+                    "VALUES (:result_id, :option_id, :value)"
+                ),
+                rows,
+            )
+
+
+def _backfill_benchmark_result_settings_keys():
+    """Compute settings_key for results written before the column existed or outside the API."""
+    with engine.begin() as conn:
+        results = conn.execute(
+            text("SELECT id, benchmark_id, option_values, settings FROM benchmarkresult WHERE settings_key IS NULL")
+        ).all()
+        if not results:
+            return
+
+        options_by_benchmark = {}
+        for option_id, benchmark_id, name in conn.execute(
+            text("SELECT id, benchmark_id, name FROM benchmarkoption ORDER BY sort_order, id")
+        ).all():
+            options_by_benchmark.setdefault(benchmark_id, []).append((option_id, name))
+
+        rows = []
+        for result_id, benchmark_id, raw, settings in results:
+            try:
+                values = json.loads(raw) if raw else {}
+            except json.JSONDecodeError:
+                values = {}
+            if not isinstance(values, dict):
+                values = {}
+            values = {str(key): str(value).strip() for key, value in values.items() if str(value).strip()}
+
+            selected = [
+                (option_id, name, values[str(option_id)])
+                for option_id, name in options_by_benchmark.get(benchmark_id, [])
+                if values.get(str(option_id))
+            ]
+            _generated, custom = split_settings(settings, [f"{name}: {value}" for _id, name, value in selected])
+            rows.append({
+                "id": result_id,
+                "settings_key": settings_key([(option_id, value) for option_id, _name, value in selected], custom),
+            })
+
+        conn.execute(text("UPDATE benchmarkresult SET settings_key = :settings_key WHERE id = :id"), rows)
+
+
 def get_db():
     session = Session(engine)
     try:
@@ -11,7 +11,7 @@ from pydantic import BaseModel
 from sqlalchemy.sql import text
 from sqlmodel import Session, select
 
-from routers import cpu, gpu, motherboard, ram, disk, oses, config, benchmark, benchmark_results
+from routers import cpu, gpu, motherboard, ram, disk, oses, config, benchmark, benchmark_results, catalog, submissions
 from models.benchmark import Benchmark, BenchmarkOption, BenchmarkTarget
 from models.benchmark_results import BenchmarkResult
 from models.config import Config
@@ -32,6 +32,7 @@ from utils.auth import (
     check_login_rate_limit,
     clear_login_rate_limit,
 )
+from utils.catalog_cache import lookup_dicts
 from utils.hardware_loader import run_if_enabled
 from database import init_db, engine
 
@@ -159,18 +160,18 @@ def public_results_data(response: Response):
             "configurations": session.exec(select(Config)).all(),
             "cpus": session.exec(select(CPU)).all(),
             "gpus": session.exec(select(GPU)).all(),
-            "cpuBrands": session.exec(select(CPUBrand)).all(),
-            "cpuFamilies": session.exec(select(CPUFamily)).all(),
-            "gpuManufacturers": session.exec(select(GPUManufacturer)).all(),
-            "gpuBrands": session.exec(select(GPUBrand)).all(),
-            "gpuModels": session.exec(select(GPUModel)).all(),
-            "gpuVramTypes": session.exec(select(GPUVRAMType)).all(),
+            "cpuBrands": lookup_dicts(session, CPUBrand),
+            "cpuFamilies": lookup_dicts(session, CPUFamily),
+            "gpuManufacturers": lookup_dicts(session, GPUManufacturer),
+            "gpuBrands": lookup_dicts(session, GPUBrand),
+            "gpuModels": lookup_dicts(session, GPUModel),
+            "gpuVramTypes": lookup_dicts(session, GPUVRAMType),
             "motherboards": session.exec(select(Motherboard)).all(),
-            "motherboardManufacturers": session.exec(select(MotherboardManufacturer)).all(),
-            "motherboardChipsets": session.exec(select(MotherboardChipset)).all(),
-            "ramTypes": session.exec(select(RAM)).all(),
-            "disks": session.exec(select(Disk)).all(),
-            "oses": session.exec(select(OS)).all(),
+            "motherboardManufacturers": lookup_dicts(session, MotherboardManufacturer),
+            "motherboardChipsets": lookup_dicts(session, MotherboardChipset),
+            "ramTypes": lookup_dicts(session, RAM),
+            "disks": lookup_dicts(session, Disk),
+            "oses": lookup_dicts(session, OS),
         }
 
     with _public_results_cache_lock:
@@ -193,6 +194,8 @@ app.include_router(oses.router, prefix="/api/oses", tags=["OS"])
 app.include_router(config.router, prefix="/api/config", tags=["Config"])
 app.include_router(benchmark.router, prefix="/api/benchmark", tags=["Benchmark"])
 app.include_router(benchmark_results.router, prefix="/api/benchmark_results", tags=["Benchmark Results"])
+app.include_router(catalog.router, prefix="/api/catalog", tags=["Catalog"])
+app.include_router(submissions.router, prefix="/api/submissions", tags=["Submissions"])
 
 healthz_app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
 
@@ -1,6 +1,7 @@
 from typing import List, Optional, TYPE_CHECKING
 from sqlalchemy import Column, Text
 from sqlmodel import Field, SQLModel, Relationship
+from models.name_key import NAME_KEY_LENGTH, maintain_name_key
 
 if TYPE_CHECKING:
     from models.benchmark_results import BenchmarkResult
@@ -8,6 +9,7 @@ if TYPE_CHECKING:
 class BenchmarkTarget(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
 
     benchmarks: List["Benchmark"] = Relationship(back_populates="target")
 
@@ -15,10 +17,11 @@ class BenchmarkTarget(SQLModel, table=True):
 class Benchmark(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, index=True)
 
     lower_is_better: bool = Field(default=False, nullable=False)
 
-    benchmark_target_id: Optional[int] = Field(default=None, foreign_key="benchmarktarget.id")
+    benchmark_target_id: Optional[int] = Field(default=None, foreign_key="benchmarktarget.id", index=True)
 
     target: Optional[BenchmarkTarget] = Relationship(back_populates="benchmarks")
 
@@ -28,9 +31,12 @@ class Benchmark(SQLModel, table=True):
 
 class BenchmarkOption(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    benchmark_id: int = Field(foreign_key="benchmark.id")
+    benchmark_id: int = Field(foreign_key="benchmark.id", index=True)
     name: str
     values: str = Field(sa_column=Column(Text, nullable=False))
     sort_order: int = Field(default=0, nullable=False)
 
     benchmark: Optional[Benchmark] = Relationship(back_populates="options")
+
+
+maintain_name_key(BenchmarkTarget, Benchmark)
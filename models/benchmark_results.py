@@ -1,18 +1,37 @@
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column, Text
+from sqlalchemy import Column, Index, Text
 from models.config import Config
 from models.benchmark import Benchmark
+from utils.result_settings import OPTION_VALUE_LENGTH
 
 
 class BenchmarkResult(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
-    benchmark_id: int = Field(foreign_key="benchmark.id")
-    config_id: int = Field(foreign_key="config.id")
+    benchmark_id: int = Field(foreign_key="benchmark.id", index=True)
+    config_id: int = Field(foreign_key="config.id", index=True)
     result: float
     option_values: str = Field(default=None, sa_column=Column(Text, nullable=True))
     settings: str = Field(default=None, sa_column=Column(Text, nullable=True))
+    settings_key: str = Field(default=None, max_length=40, nullable=True, index=True)
+    content_hash: str = Field(default=None, max_length=40, nullable=True, unique=True, index=True)
+    idempotency_hash: str = Field(default=None, max_length=40, nullable=True, index=True)
     timestamp: str = Field(default=None, nullable=True)
     notes: str = Field(default=None, nullable=True)
 
     benchmark: "Benchmark" = Relationship(back_populates="benchmark_results")
     config: "Config" = Relationship(back_populates="benchmark_results")
+
+
+class BenchmarkResultOption(SQLModel, table=True):
+    """
+    Selected benchmark option value of a result, one row per option.
+    Mirrors BenchmarkResult.option_values so results can be filtered by option in SQL.
+    """
+    __tablename__ = "benchmark_result_option"
+    __table_args__ = (
+        Index("ix_benchmark_result_option_option_value", "option_id", "value"),
+    )
+
+    result_id: int = Field(foreign_key="benchmarkresult.id", primary_key=True)
+    option_id: int = Field(foreign_key="benchmarkoption.id", primary_key=True)
+    value: str = Field(max_length=OPTION_VALUE_LENGTH)
@@ -1,21 +1,42 @@
+from sqlalchemy import BigInteger, Column, Index, delete, event, insert, inspect
 from sqlmodel import Field, SQLModel, Relationship
 from typing import Optional, List
+from models.name_key import NAME_KEY_LENGTH, maintain_name_key
+from models.units import maintain_parsed_column, parse_size_bytes
+from utils.config_components import component_ids
+from utils.display_names import DISPLAY_NAME_LENGTH
+
+
+def _slots(kind: str) -> dict:
+    return {
+        "primaryjoin": f"and_(Config.id == ConfigComponent.config_id, ConfigComponent.kind == '{kind}')",
+        "order_by": "ConfigComponent.slot",
+        "viewonly": True,
+    }
+
+
+def _slot_component(model: str) -> dict:
+    return {"primaryjoin": f"{model}.id == foreign(ConfigComponent.component_id)", "viewonly": True}
+
 
 class Config(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
+    display_name: Optional[str] = Field(default=None, max_length=DISPLAY_NAME_LENGTH, index=True)
 
-    cpu_id: Optional[int] = Field(default=None, foreign_key="cpu.id")
+    cpu_id: Optional[int] = Field(default=None, foreign_key="cpu.id", index=True)
     cpu_quantity: int = Field(default=1, ge=1)
     cpu_component_ids: Optional[str] = None
-    motherboard_id: Optional[int] = Field(default=None, foreign_key="motherboard.id")
-    gpu_id: Optional[int] = Field(default=None, foreign_key="gpu.id")
+    motherboard_id: Optional[int] = Field(default=None, foreign_key="motherboard.id", index=True)
+    gpu_id: Optional[int] = Field(default=None, foreign_key="gpu.id", index=True)
     gpu_quantity: int = Field(default=1, ge=1)
     gpu_component_ids: Optional[str] = None
-    disk_id: Optional[int] = Field(default=None, foreign_key="disk.id")
-    os_id: Optional[int] = Field(default=None, foreign_key="os.id")
-    ram_id: Optional[int] = Field(default=None, foreign_key="ram.id")
+    disk_id: Optional[int] = Field(default=None, foreign_key="disk.id", index=True)
+    os_id: Optional[int] = Field(default=None, foreign_key="os.id", index=True)
+    ram_id: Optional[int] = Field(default=None, foreign_key="ram.id", index=True)
     ram_size: str
+    ram_bytes: Optional[int] = Field(default=None, sa_column=Column(BigInteger, index=True))
 
     cpu_driver_version: Optional[str] = None
     mb_chipset_driver_version: Optional[str] = None
@@ -42,8 +63,73 @@ class Config(SQLModel, table=True):
     cpu: Optional["CPU"] = Relationship()
     motherboard: Optional["Motherboard"] = Relationship()
     gpu: Optional["GPU"] = Relationship()
+    # Every CPU/GPU slot in slot order; read only, config_component is written from the component columns.
+    cpu_slots: List["ConfigComponent"] = Relationship(sa_relationship_kwargs=_slots("cpu"))
+    gpu_slots: List["ConfigComponent"] = Relationship(sa_relationship_kwargs=_slots("gpu"))
     disk: Optional["Disk"] = Relationship()
     os: Optional["OS"] = Relationship()
     ram: Optional["RAM"] = Relationship()
 
     benchmark_results: List["BenchmarkResult"] = Relationship(back_populates="config")
+
+
+class ConfigComponent(SQLModel, table=True):
+    """
+    One CPU or GPU slot of a config, one row per slot.
+    Mirrors Config.cpu_component_ids/gpu_component_ids so component references can use an index.
+    """
+    __tablename__ = "config_component"
+    __table_args__ = (
+        Index("ix_config_component_kind_component", "kind", "component_id"),
+    )
+
+    config_id: int = Field(foreign_key="config.id", primary_key=True)
+    kind: str = Field(max_length=8, primary_key=True)
+    slot: int = Field(primary_key=True)
+    component_id: int
+
+    cpu: Optional["CPU"] = Relationship(sa_relationship_kwargs=_slot_component("CPU"))
+    gpu: Optional["GPU"] = Relationship(sa_relationship_kwargs=_slot_component("GPU"))
+
+
+# kind -> (component list column, primary ID column, quantity column)
+COMPONENT_COLUMNS = {
+    "cpu": ("cpu_component_ids", "cpu_id", "cpu_quantity"),
+    "gpu": ("gpu_component_ids", "gpu_id", "gpu_quantity"),
+}
+
+
+def config_component_rows(config_id: int, values) -> list[dict]:
+    """ConfigComponent rows of a config; values is anything with the Config component attributes."""
+    return [
+        {"config_id": config_id, "kind": kind, "slot": slot, "component_id": component_id}
+        for kind, columns in COMPONENT_COLUMNS.items()
+        for slot, component_id in enumerate(component_ids(*(getattr(values, column) for column in columns)))
+    ]
+
+
+def _write_config_components(_mapper, connection, config):
+    table = ConfigComponent.__table__
+    connection.execute(delete(table).where(table.c.config_id == config.id))
+    rows = config_component_rows(config.id, config)
+    if rows:
+        connection.execute(insert(table), rows)
+
+
+def _update_config_components(mapper, connection, config):
+    state = inspect(config)
+    columns = [column for columns in COMPONENT_COLUMNS.values() for column in columns]
+    if any(state.attrs[column].history.has_changes() for column in columns):
+        _write_config_components(mapper, connection, config)
+
+
+def _delete_config_components(_mapper, connection, config):
+    table = ConfigComponent.__table__
+    connection.execute(delete(table).where(table.c.config_id == config.id))
+
+
+event.listen(Config, "after_insert", _write_config_components)
+event.listen(Config, "after_update", _update_config_components)
+event.listen(Config, "before_delete", _delete_config_components)
+maintain_name_key(Config)
+maintain_parsed_column(Config, "ram_size", "ram_bytes", parse_size_bytes)
@@ -1,12 +1,16 @@
 from sqlmodel import Field, SQLModel, Relationship
 from typing import List, Optional
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
+from models.name_key import NAME_KEY_LENGTH, maintain_name_key
+from models.units import maintain_parsed_column, parse_clock_mhz
+from utils.display_names import DISPLAY_NAME_LENGTH
 
 
 class CPUBrand(SQLModel, table=True):
     """CPU brand (e.g., Intel, AMD)."""
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
 
     families: List["CPUFamily"] = Relationship(back_populates="brand")
     cpus: List["CPU"] = Relationship(back_populates="brand")
@@ -16,9 +20,11 @@ class CPUFamily(SQLModel, table=True):
     """Family under a brand (e.g., Pentium III, K6-2)."""
     __table_args__ = (
         UniqueConstraint("cpu_brand_id", "name", name="uq_cpufamily_brand_name"),
+        Index("ix_cpufamily_name_key", "name_key", "cpu_brand_id", unique=True),
     )
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH)
 
     cpu_brand_id: int = Field(foreign_key="cpubrand.id")
 
@@ -34,11 +40,17 @@ class CPU(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     model: str
     speed: str
+    speed_mhz: Optional[int] = Field(default=None, index=True)
     core_count: int
+    display_name: Optional[str] = Field(default=None, max_length=DISPLAY_NAME_LENGTH, index=True)
     serial: Optional[str] = None
 
-    cpu_brand_id: int = Field(foreign_key="cpubrand.id")
-    cpu_family_id: int = Field(foreign_key="cpufamily.id")
+    cpu_brand_id: int = Field(foreign_key="cpubrand.id", index=True)
+    cpu_family_id: int = Field(foreign_key="cpufamily.id", index=True)
 
     brand: Optional[CPUBrand] = Relationship(back_populates="cpus")
     family: Optional[CPUFamily] = Relationship(back_populates="cpus")
+
+
+maintain_name_key(CPUBrand, CPUFamily)
+maintain_parsed_column(CPU, "speed", "speed_mhz", parse_clock_mhz)
@@ -1,7 +1,12 @@
 from sqlmodel import Field, SQLModel
 from typing import Optional
+from models.name_key import NAME_KEY_LENGTH, maintain_name_key
 
 
 class Disk(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
+
+
+maintain_name_key(Disk)
@@ -0,0 +1,254 @@
+from sqlalchemy import bindparam, event, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models.config import COMPONENT_COLUMNS, Config, ConfigComponent
+from models.cpu import CPU, CPUBrand, CPUFamily
+from models.gpu import GPU, GPUBrand, GPUManufacturer, GPUModel, GPUVRAMType
+from models.motherboard import Motherboard, MotherboardChipset, MotherboardManufacturer
+from utils.catalog_cache import get_lookup
+from utils.config_components import component_ids
+from utils.display_names import (
+    DISPLAY_NAME_LENGTH,
+    config_display_name,
+    cpu_display_name,
+    gpu_display_name,
+    motherboard_display_name,
+)
+
+
+def _write_changed(conn: Connection, model, rows) -> list[int]:
+    """Store (id, stored name, new name) rows whose name changed with one executemany UPDATE; return their IDs."""
+    changed = [
+        {"row_id": row_id, "new_name": name[:DISPLAY_NAME_LENGTH]}
+        for row_id, stored, name in rows
+        if stored != name[:DISPLAY_NAME_LENGTH]
+    ]
+    if changed:
+        table = model.__table__
+        conn.execute(
+            update(table).where(table.c.id == bindparam("row_id")).values(display_name=bindparam("new_name")),
+            changed,
+        )
+    return [row["row_id"] for row in changed]
+
+
+def _display_names(conn: Connection, model, ids) -> dict[int, str | None]:
+    ids = set(ids)
+    if not ids:
+        return {}
+    return dict(conn.execute(select(model.id, model.display_name).where(model.id.in_(ids))).all())
+
+
+def _config_names(conn: Connection, configs) -> list[str]:
+    """Display names of configs; configs are rows or instances with the Config component attributes."""
+    slots = [
+        (
+            component_ids(config.cpu_component_ids, config.cpu_id, config.cpu_quantity),
+            component_ids(config.gpu_component_ids, config.gpu_id, config.gpu_quantity),
+        )
+        for config in configs
+    ]
+    cpus = _display_names(conn, CPU, (cpu_id for cpu_ids, _gpu_ids in slots for cpu_id in cpu_ids))
+    gpus = _display_names(conn, GPU, (gpu_id for _cpu_ids, gpu_ids in slots for gpu_id in gpu_ids))
+    return [
+        config_display_name(
+            config.name,
+            [cpus.get(cpu_id) for cpu_id in cpu_ids],
+            [gpus.get(gpu_id) for gpu_id in gpu_ids],
+        )
+        for config, (cpu_ids, gpu_ids) in zip(configs, slots)
+    ]
+
+
+def refresh_config_display_names(conn: Connection, *conditions) -> list[int]:
+    configs = conn.execute(
+        select(
+            Config.id, Config.display_name, Config.name,
+            Config.cpu_component_ids, Config.cpu_id, Config.cpu_quantity,
+            Config.gpu_component_ids, Config.gpu_id, Config.gpu_quantity,
+        ).where(*conditions)
+    ).all()
+    names = _config_names(conn, configs)
+    return _write_changed(conn, Config, [
+        (config.id, config.display_name, name) for config, name in zip(configs, names)
+    ])
+
+
+def _refresh_configs_using(conn: Connection, kind: str, component_ids_changed: list[int]) -> None:
+    if component_ids_changed:
+        refresh_config_display_names(conn, Config.id.in_(
+            select(ConfigComponent.config_id).where(
+                ConfigComponent.kind == kind,
+                ConfigComponent.component_id.in_(component_ids_changed),
+            )
+        ))
+
+
+def refresh_cpu_display_names(conn: Connection, *conditions) -> list[int]:
+    rows = conn.execute(
+        select(
+            CPU.id, CPU.display_name, CPUBrand.name.label("brand"), CPUFamily.name.label("family"),
+            CPU.model, CPU.speed, CPU.core_count,
+        )
+        .outerjoin(CPUBrand, CPUBrand.id == CPU.cpu_brand_id)
+        .outerjoin(CPUFamily, CPUFamily.id == CPU.cpu_family_id)
+        .where(*conditions)
+    )
+    changed = _write_changed(conn, CPU, [
+        (row.id, row.display_name, cpu_display_name(row.brand, row.family, row.model, row.speed, row.core_count))
+        for row in rows
+    ])
+    _refresh_configs_using(conn, "cpu", changed)
+    return changed
+
+
+def refresh_gpu_display_names(conn: Connection, *conditions) -> list[int]:
+    rows = conn.execute(
+        select(
+            GPU.id, GPU.display_name, GPUManufacturer.name.label("manufacturer"), GPUBrand.name.label("brand"),
+            GPUModel.name.label("model"), GPU.vram_size, GPUVRAMType.name.label("vram_type"),
+        )
+        .outerjoin(GPUManufacturer, GPUManufacturer.id == GPU.gpu_manufacturer_id)
+        .outerjoin(GPUBrand, GPUBrand.id == GPU.gpu_brand_id)
+        .outerjoin(GPUModel, GPUModel.id == GPU.gpu_model_id)
+        .outerjoin(GPUVRAMType, GPUVRAMType.id == GPU.gpu_vram_type_id)
+        .where(*conditions)
+    )
+    changed = _write_changed(conn, GPU, [
+        (
+            row.id,
+            row.display_name,
+            gpu_display_name(row.manufacturer, row.brand, row.model, row.vram_size, row.vram_type),
+        )
+        for row in rows
+    ])
+    _refresh_configs_using(conn, "gpu", changed)
+    return changed
+
+
+def refresh_motherboard_display_names(conn: Connection, *conditions) -> list[int]:
+    rows = conn.execute(
+        select(
+            Motherboard.id, Motherboard.display_name, MotherboardManufacturer.name.label("manufacturer"),
+            Motherboard.model, MotherboardChipset.name.label("chipset"),
+        )
+        .outerjoin(MotherboardManufacturer, MotherboardManufacturer.id == Motherboard.manufacturer_id)
+        .outerjoin(MotherboardChipset, MotherboardChipset.id == Motherboard.chipset_id)
+        .where(*conditions)
+    )
+    return _write_changed(conn, Motherboard, [
+        (row.id, row.display_name, motherboard_display_name(row.manufacturer, row.model, row.chipset))
+        for row in rows
+    ])
+
+
+def refresh_display_names(conn: Connection, only_missing: bool = False) -> None:
+    """Recompute every stored display name, or only the ones still NULL (rows written by raw SQL)."""
+    for model, refresh in (
+        (CPU, refresh_cpu_display_names),
+        (GPU, refresh_gpu_display_names),
+        (Motherboard, refresh_motherboard_display_names),
+        (Config, refresh_config_display_names),
+    ):
+        refresh(conn, *([model.display_name.is_(None)] if only_missing else []))
+
+
+def _parent_name(instance, model, parent_id: int | None) -> str | None:
+    """
+    Name of a lookup parent through the catalog cache. A parent already loaded in the flushing session
+    is read from there instead, as it may carry a rename the cached snapshot has not seen yet.
+    """
+    if parent_id is None:
+        return None
+    session = Session.object_session(instance)
+    loaded = session.identity_map.get(session.identity_key(model, parent_id))
+    if loaded is not None and "name" in inspect(loaded).dict:
+        return loaded.name
+    parent = get_lookup(session, model, parent_id)
+    return parent.name if parent is not None else None
+
+
+def _set_cpu_display_name(_mapper, _conn, cpu):
+    cpu.display_name = cpu_display_name(
+        _parent_name(cpu, CPUBrand, cpu.cpu_brand_id),
+        _parent_name(cpu, CPUFamily, cpu.cpu_family_id),
+        cpu.model,
+        cpu.speed,
+        cpu.core_count,
+    )[:DISPLAY_NAME_LENGTH]
+
+
+def _set_gpu_display_name(_mapper, _conn, gpu):
+    gpu.display_name = gpu_display_name(
+        _parent_name(gpu, GPUManufacturer, gpu.gpu_manufacturer_id),
+        _parent_name(gpu, GPUBrand, gpu.gpu_brand_id),
+        _parent_name(gpu, GPUModel, gpu.gpu_model_id),
+        gpu.vram_size,
+        _parent_name(gpu, GPUVRAMType, gpu.gpu_vram_type_id),
+    )[:DISPLAY_NAME_LENGTH]
+
+
+def _set_motherboard_display_name(_mapper, _conn, motherboard):
+    motherboard.display_name = motherboard_display_name(
+        _parent_name(motherboard, MotherboardManufacturer, motherboard.manufacturer_id),
+        motherboard.model,
+        _parent_name(motherboard, MotherboardChipset, motherboard.chipset_id),
+    )[:DISPLAY_NAME_LENGTH]
+
+
+def _set_config_display_name(_mapper, conn, config):
+    config.display_name = _config_names(conn, [config])[0][:DISPLAY_NAME_LENGTH]
+
+
+def _set_when_changed(set_display_name, attributes: tuple[str, ...]):
+    """Recompute on update only when an attribute the display name is built from changed."""
+    def set_if_changed(mapper, conn, instance):
+        state = inspect(instance)
+        if any(state.attrs[attribute].history.has_changes() for attribute in attributes):
+            set_display_name(mapper, conn, instance)
+    return set_if_changed
+
+
+def _cascade_component_rename(kind: str):
+    def cascade(_mapper, conn, component):
+        if inspect(component).attrs.display_name.history.has_changes():
+            _refresh_configs_using(conn, kind, [component.id])
+    return cascade
+
+
+def _cascade_parent_rename(refresh, foreign_key):
+    def cascade(_mapper, conn, parent):
+        if inspect(parent).attrs.name.history.has_changes():
+            refresh(conn, foreign_key == parent.id)
+    return cascade
+
+
+for model, set_display_name, attributes in (
+    (CPU, _set_cpu_display_name, ("cpu_brand_id", "cpu_family_id", "model", "speed", "core_count")),
+    (
+        GPU,
+        _set_gpu_display_name,
+        ("gpu_manufacturer_id", "gpu_brand_id", "gpu_model_id", "vram_size", "gpu_vram_type_id"),
+    ),
+    (Motherboard, _set_motherboard_display_name, ("manufacturer_id", "model", "chipset_id")),
+    (Config, _set_config_display_name, ("name", *COMPONENT_COLUMNS["cpu"], *COMPONENT_COLUMNS["gpu"])),
+):
+    event.listen(model, "before_insert", set_display_name)
+    event.listen(model, "before_update", _set_when_changed(set_display_name, attributes))
+
+event.listen(CPU, "after_update", _cascade_component_rename("cpu"))
+event.listen(GPU, "after_update", _cascade_component_rename("gpu"))
+
+# Renaming a parent rewrites its children with one set-based refresh instead of per-row ORM updates.
+for parent, refresh, foreign_key in (
+    (CPUBrand, refresh_cpu_display_names, CPU.cpu_brand_id),
+    (CPUFamily, refresh_cpu_display_names, CPU.cpu_family_id),
+    (GPUManufacturer, refresh_gpu_display_names, GPU.gpu_manufacturer_id),
+    (GPUBrand, refresh_gpu_display_names, GPU.gpu_brand_id),
+    (GPUModel, refresh_gpu_display_names, GPU.gpu_model_id),
+    (GPUVRAMType, refresh_gpu_display_names, GPU.gpu_vram_type_id),
+    (MotherboardManufacturer, refresh_motherboard_display_names, Motherboard.manufacturer_id),
+    (MotherboardChipset, refresh_motherboard_display_names, Motherboard.chipset_id),
+):
+    event.listen(parent, "after_update", _cascade_parent_rename(refresh, foreign_key))
@@ -1,12 +1,16 @@
 from sqlmodel import Field, SQLModel, Relationship
 from typing import List, Optional
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import BigInteger, Column, Index, UniqueConstraint
+from models.name_key import NAME_KEY_LENGTH, maintain_name_key
+from models.units import maintain_parsed_column, parse_size_bytes
+from utils.display_names import DISPLAY_NAME_LENGTH
 
 
 class GPUManufacturer(SQLModel, table=True):
     """Board partner / AIB (e.g., ASUS, Leadtek)."""
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
     gpus: List["GPU"] = Relationship(back_populates="manufacturer")
 
 
@@ -14,6 +18,7 @@ class GPUBrand(SQLModel, table=True):
     """Silicon brand (e.g., NVIDIA, ATI/AMD)."""
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
     models: List["GPUModel"] = Relationship(back_populates="brand")
     gpus: List["GPU"] = Relationship(back_populates="brand")
 
@@ -22,9 +27,11 @@ class GPUModel(SQLModel, table=True):
     """Model within a brand (e.g., TNT2 M64, GTX 1080)."""
     __table_args__ = (
         UniqueConstraint("gpu_brand_id", "name", name="uq_gpumodel_brand_name"),
+        Index("ix_gpumodel_name_key", "name_key", "gpu_brand_id", unique=True),
     )
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH)
     gpu_brand_id: int = Field(foreign_key="gpubrand.id")
 
     brand: Optional[GPUBrand] = Relationship(back_populates="models")
@@ -35,6 +42,7 @@ class GPUVRAMType(SQLModel, table=True):
     """VRAM type (e.g., SDR, DDR, GDDR5, GDDR6)."""
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
     gpus: List["GPU"] = Relationship(back_populates="vram_type")
 
 
@@ -45,14 +53,20 @@ class GPU(SQLModel, table=True):
     """
     id: Optional[int] = Field(default=None, primary_key=True)
     vram_size: str
+    vram_bytes: Optional[int] = Field(default=None, sa_column=Column(BigInteger, index=True))
+    display_name: Optional[str] = Field(default=None, max_length=DISPLAY_NAME_LENGTH, index=True)
     serial: Optional[str] = None
 
-    gpu_manufacturer_id: Optional[int] = Field(default=None, foreign_key="gpumanufacturer.id")
-    gpu_brand_id: int = Field(foreign_key="gpubrand.id")
-    gpu_model_id: int = Field(foreign_key="gpumodel.id")
-    gpu_vram_type_id: int = Field(foreign_key="gpuvramtype.id")
+    gpu_manufacturer_id: Optional[int] = Field(default=None, foreign_key="gpumanufacturer.id", index=True)
+    gpu_brand_id: int = Field(foreign_key="gpubrand.id", index=True)
+    gpu_model_id: int = Field(foreign_key="gpumodel.id", index=True)
+    gpu_vram_type_id: int = Field(foreign_key="gpuvramtype.id", index=True)
 
     manufacturer: Optional[GPUManufacturer] = Relationship(back_populates="gpus")
     brand: Optional[GPUBrand] = Relationship(back_populates="gpus")
     model: Optional[GPUModel] = Relationship(back_populates="gpus")
     vram_type: Optional[GPUVRAMType] = Relationship(back_populates="gpus")
+
+
+maintain_name_key(GPUManufacturer, GPUBrand, GPUModel, GPUVRAMType)
+maintain_parsed_column(GPU, "vram_size", "vram_bytes", parse_size_bytes)
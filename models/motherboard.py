@@ -1,11 +1,14 @@
 from typing import List, Optional
 from sqlmodel import SQLModel, Field, Relationship
+from models.name_key import NAME_KEY_LENGTH, maintain_name_key
+from utils.display_names import DISPLAY_NAME_LENGTH
 
 
 class MotherboardManufacturer(SQLModel, table=True):
     """Board maker (e.g., ASUS, MSI, Gigabyte)."""
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
     motherboards: List["Motherboard"] = Relationship(back_populates="manufacturer")
 
 
@@ -13,6 +16,7 @@ class MotherboardChipset(SQLModel, table=True):
     """Chipset (e.g., Intel 440BX, AMD B550, VIA KT133)."""
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
     motherboards: List["Motherboard"] = Relationship(back_populates="chipset")
 
 
@@ -23,11 +27,15 @@ class Motherboard(SQLModel, table=True):
     """
     id: Optional[int] = Field(default=None, primary_key=True)
     model: str
-    manufacturer_id: int = Field(foreign_key="motherboardmanufacturer.id")
-    chipset_id: int = Field(foreign_key="motherboardchipset.id")
+    manufacturer_id: int = Field(foreign_key="motherboardmanufacturer.id", index=True)
+    chipset_id: int = Field(foreign_key="motherboardchipset.id", index=True)
+    display_name: Optional[str] = Field(default=None, max_length=DISPLAY_NAME_LENGTH, index=True)
 
     serial: Optional[str] = None
     notes: Optional[str] = None
 
     manufacturer: Optional[MotherboardManufacturer] = Relationship(back_populates="motherboards")
     chipset: Optional[MotherboardChipset] = Relationship(back_populates="motherboards")
+
+
+maintain_name_key(MotherboardManufacturer, MotherboardChipset)
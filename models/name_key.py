@@ -0,0 +1,21 @@
+from sqlalchemy import event
+
+NAME_KEY_LENGTH = 191
+
+
+def normalize_name_key(name: str | None) -> str | None:
+    """Case- and whitespace-insensitive form of a name, used for uniqueness checks."""
+    if name is None:
+        return None
+    return " ".join(name.split()).casefold()[:NAME_KEY_LENGTH]
+
+
+def _set_name_key(_mapper, _connection, target):
+    target.name_key = normalize_name_key(target.name)
+
+
+def maintain_name_key(*models):
+    """Keep name_key in sync with name on every ORM insert and update of the given models."""
+    for model in models:
+        event.listen(model, "before_insert", _set_name_key)
+        event.listen(model, "before_update", _set_name_key)
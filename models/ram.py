@@ -1,5 +1,6 @@
 from typing import Optional
 from sqlmodel import SQLModel, Field
+from models.name_key import NAME_KEY_LENGTH, maintain_name_key
 
 
 class RAM(SQLModel, table=True):
@@ -8,3 +9,7 @@ class RAM(SQLModel, table=True):
     """
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True)
+    name_key: Optional[str] = Field(default=None, max_length=NAME_KEY_LENGTH, unique=True, index=True)
+
+
+maintain_name_key(RAM)
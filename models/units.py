@@ -0,0 +1,59 @@
+import re
+
+from sqlalchemy import event
+
+# A comma before exactly three digits separates thousands ('1,024'); any other comma is a decimal point ('1,5').
+_NUMBER = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?(?!\d)|\d+(?:[.,]\d+)?"
+_THOUSANDS = re.compile(r",(?=\d{3}(?!\d))")
+_CLOCK = re.compile(rf"({_NUMBER})\s*([GM]Hz)?", re.IGNORECASE)
+_SIZE = re.compile(rf"(?:(\d+)\s*[x×*]\s*)?({_NUMBER})\s*([KMGT])(?:i?B)?\b", re.IGNORECASE)
+_SIZE_POWERS = {"k": 1, "m": 2, "g": 3, "t": 4}
+
+
+def _number(value: str) -> float:
+    return float(_THOUSANDS.sub("", value).replace(",", "."))
+
+
+def parse_clock_mhz(text: str | None) -> int | None:
+    """
+    Clock speed in MHz from free text: '700MHz' -> 700, '2.4GHz' -> 2400, '5 3600 3.6GHz' -> 3600.
+    The last number with a unit wins; a bare number up to 10 is taken as GHz, otherwise MHz.
+    """
+    if not text:
+        return None
+    matches = _CLOCK.findall(text)
+    with_unit = [match for match in matches if match[1]]
+    if with_unit:
+        value, unit = with_unit[-1]
+        value = _number(value)
+        return round(value * 1000 if unit.lower() == "ghz" else value)
+    if not matches:
+        return None
+    value = _number(matches[-1][0])
+    return round(value * 1000 if value <= 10 else value)
+
+
+def parse_size_bytes(text: str | None) -> int | None:
+    """
+    Memory size in bytes (binary units) from free text: '32MB', '8 GB', '2x4GB', '1,024MB', '512';
+    a bare number is taken as megabytes.
+    """
+    if not text:
+        return None
+    match = _SIZE.search(text)
+    if match:
+        count, value, unit = match.groups()
+        return round(int(count or 1) * _number(value) * 1024 ** _SIZE_POWERS[unit.lower()])
+    bare = re.search(_NUMBER, text)
+    if bare is None:
+        return None
+    return round(_number(bare.group(0)) * 1024 ** 2)
+
+
+def maintain_parsed_column(model, source: str, target: str, parser) -> None:
+    """Keep a numeric column parsed from a free-text column on every ORM insert and update."""
+    def set_parsed(_mapper, _connection, instance):
+        setattr(instance, target, parser(getattr(instance, source)))
+
+    event.listen(model, "before_insert", set_parsed)
+    event.listen(model, "before_update", set_parsed)
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from sqlalchemy import delete
 from sqlmodel import Session, select
-from utils.helper import validate_and_normalize_name
+from utils.helper import list_rows, parse_fields, validate_and_normalize_name
 from models.benchmark import Benchmark, BenchmarkOption, BenchmarkTarget
-from models.benchmark_results import BenchmarkResult
+from models.benchmark_results import BenchmarkResult, BenchmarkResultOption
 from database import get_db
+from utils.db_write import commit_and_return, is_referenced
+from utils.option_cache import invalidate_benchmark_options
 
 router = APIRouter()
 
@@ -12,10 +15,7 @@ router = APIRouter()
 def create_benchmark_target(benchmark_target: BenchmarkTarget, db: Session = Depends(get_db)):
     benchmark_target.name = validate_and_normalize_name(benchmark_target.name, db, BenchmarkTarget)
 
-    db.add(benchmark_target)
-    db.commit()
-    db.refresh(benchmark_target)
-    return benchmark_target
+    return commit_and_return(db, benchmark_target)
 
 
 @router.get("/target/", response_model=list[BenchmarkTarget])
@@ -42,9 +42,7 @@ def update_benchmark_target(target_id: int, benchmark_target: BenchmarkTarget, d
 
     db_benchmark_target.name = benchmark_target.name
 
-    db.commit()
-    db.refresh(db_benchmark_target)
-    return db_benchmark_target
+    return commit_and_return(db, db_benchmark_target)
 
 
 @router.delete("/target/{target_id}")
@@ -53,7 +51,7 @@ def delete_benchmark_target(target_id: int, db: Session = Depends(get_db)):
     if benchmark_target is None:
         raise HTTPException(status_code=404, detail="Benchmark target not found")
 
-    has_benchmark = db.exec(select(Benchmark).where(Benchmark.benchmark_target_id == target_id)).first()
+    has_benchmark = is_referenced(db, Benchmark.benchmark_target_id == target_id)
     if has_benchmark:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -97,9 +95,8 @@ def get_options_for_benchmark(benchmark_id: int, db: Session = Depends(get_db)):
 @router.post("/options/", response_model=BenchmarkOption)
 def create_benchmark_option(option: BenchmarkOption, db: Session = Depends(get_db)):
     option = _validate_option_payload(option, db)
-    db.add(option)
-    db.commit()
-    db.refresh(option)
+    option = commit_and_return(db, option)
+    invalidate_benchmark_options(option.benchmark_id)
     return option
 
 
@@ -110,14 +107,14 @@ def update_benchmark_option(option_id: int, option: BenchmarkOption, db: Session
         raise HTTPException(status_code=404, detail="Benchmark option not found")
 
     option = _validate_option_payload(option, db)
+    previous_benchmark_id = db_option.benchmark_id
     db_option.benchmark_id = option.benchmark_id
     db_option.name = option.name
     db_option.values = option.values
     db_option.sort_order = option.sort_order
 
-    db.add(db_option)
-    db.commit()
-    db.refresh(db_option)
+    db_option = commit_and_return(db, db_option)
+    invalidate_benchmark_options(previous_benchmark_id, db_option.benchmark_id)
     return db_option
 
 
@@ -127,8 +124,11 @@ def delete_benchmark_option(option_id: int, db: Session = Depends(get_db)):
     if db_option is None:
         raise HTTPException(status_code=404, detail="Benchmark option not found")
 
+    benchmark_id = db_option.benchmark_id
+    db.exec(delete(BenchmarkResultOption).where(BenchmarkResultOption.option_id == option_id))
     db.delete(db_option)
     db.commit()
+    invalidate_benchmark_options(benchmark_id)
     return {"message": "Benchmark option deleted successfully"}
 
 
@@ -138,16 +138,12 @@ def create_benchmark(benchmark: Benchmark, db: Session = Depends(get_db)):
     if benchmark.benchmark_target_id is not None and not db.get(BenchmarkTarget, benchmark.benchmark_target_id):
         raise HTTPException(status_code=400, detail="Invalid benchmark target")
 
-    db.add(benchmark)            
-    db.commit()
-    db.refresh(benchmark)
-    return benchmark
+    return commit_and_return(db, benchmark)
 
 
-@router.get("/", response_model=list[Benchmark])
-def get_benchmarks(db: Session = Depends(get_db)):
-    benchmarks = db.exec(select(Benchmark)).all()
-    return benchmarks
+@router.get("/")
+def get_benchmarks(db: Session = Depends(get_db), fields: str | None = None):
+    return list_rows(db, select(Benchmark), parse_fields(fields, Benchmark))
 
 
 @router.get("/{benchmark_id}", response_model=Benchmark)
@@ -172,9 +168,7 @@ def update_benchmark(benchmark_id: int, benchmark: Benchmark, db: Session = Depe
     db_benchmark.benchmark_target_id = benchmark.benchmark_target_id
     db_benchmark.lower_is_better = benchmark.lower_is_better
 
-    db.commit()
-    db.refresh(db_benchmark)
-    return db_benchmark
+    return commit_and_return(db, db_benchmark)
 
 
 
@@ -184,7 +178,7 @@ def delete_benchmark(benchmark_id: int, db: Session = Depends(get_db)):
     if benchmark is None:
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    has_results = db.exec(select(BenchmarkResult).where(BenchmarkResult.benchmark_id == benchmark_id)).first()
+    has_results = is_referenced(db, BenchmarkResult.benchmark_id == benchmark_id)
     if has_results:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -197,4 +191,5 @@ def delete_benchmark(benchmark_id: int, db: Session = Depends(get_db)):
 
     db.delete(benchmark)
     db.commit()
+    invalidate_benchmark_options(benchmark_id)
     return {"message": "Benchmark deleted successfully"}
@@ -1,80 +1,386 @@
-import json
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response, UploadFile, status
+from pydantic import BaseModel
+from sqlalchemy import and_, bindparam, delete, exists, func, inspect, or_, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 from sqlmodel import Session, select
-from utils.helper import validate_and_normalize_name
+from utils.helper import (
+    apply_expand,
+    apply_range_filter,
+    apply_sort,
+    expand_row,
+    list_rows,
+    parse_expand,
+    parse_fields,
+    validate_and_normalize_name,
+)
 from utils.config_components import config_has_cpu, config_has_gpu
-from models.benchmark import Benchmark, BenchmarkOption
-from models.benchmark_results import BenchmarkResult
-from models.config import Config
+from utils.db_write import MULTI_ROW_INSERT_SIZE, commit_and_return, require_references
+from utils.option_cache import CachedOption, get_benchmark_options
+from utils.result_import import detect_format, import_results, iter_import_rows
+from utils.result_ingest import (
+    RESULT_FIELDS,
+    RESULT_HASH_FIELDS,
+    ingest_results,
+    result_content_hash,
+    result_idempotency_hash,
+    result_ids_by_hash,
+)
+from utils.result_settings import generate_settings, parse_option_values, selected_options
+from utils.tool_output import TOOL_PARSERS, ingest_tool_output, parse_tool_files
+from models.benchmark import Benchmark
+from models.benchmark_results import BenchmarkResult, BenchmarkResultOption
+from models.config import Config, ConfigComponent
+from models.cpu import CPU, CPUFamily
+from models.gpu import GPU, GPUModel
 from database import get_db
 
 router = APIRouter()
 
+# Hardware expansions go through the result's config and are embedded next to it; cpu and gpu are slot lists.
+RESULT_EXPANSIONS = {
+    "benchmark": BenchmarkResult.benchmark,
+    "config": BenchmarkResult.config,
+    "cpu": (BenchmarkResult.config, Config.cpu_slots, ConfigComponent.cpu),
+    "gpu": (BenchmarkResult.config, Config.gpu_slots, ConfigComponent.gpu),
+    "motherboard": (BenchmarkResult.config, Config.motherboard),
+    "os": (BenchmarkResult.config, Config.os),
+    "ram": (BenchmarkResult.config, Config.ram),
+    "disk": (BenchmarkResult.config, Config.disk),
+}
+
 
 def _parse_option_values(raw: str | None) -> dict[str, str]:
-    if not raw:
-        return {}
     try:
-        parsed = json.loads(raw)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid result option values")
-    if not isinstance(parsed, dict):
-        raise HTTPException(status_code=400, detail="Invalid result option values")
-    return {str(key): str(value).strip() for key, value in parsed.items() if str(value).strip()}
+        return parse_option_values(raw)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _benchmark_options(benchmark_id: int, db: Session) -> list[CachedOption]:
+    return get_benchmark_options(db, [benchmark_id])[benchmark_id]
 
 
 def _apply_generated_settings(benchmark_result: BenchmarkResult, db: Session):
+    option_values = _parse_option_values(benchmark_result.option_values)
+    options = _benchmark_options(benchmark_result.benchmark_id, db) if option_values else []
+    benchmark_result.settings, benchmark_result.settings_key, _selected = generate_settings(
+        option_values, options, benchmark_result.settings
+    )
+
+
+def _sync_result_options(benchmark_result: BenchmarkResult, db: Session, replace: bool = True):
+    """Mirror the result's option_values JSON into benchmark_result_option rows."""
+    if replace:
+        db.exec(delete(BenchmarkResultOption).where(BenchmarkResultOption.result_id == benchmark_result.id))
+
     option_values = _parse_option_values(benchmark_result.option_values)
     if not option_values:
-        if benchmark_result.settings is not None:
-            benchmark_result.settings = benchmark_result.settings.strip() or None
         return
 
-    options = db.exec(
-        select(BenchmarkOption)
-        .where(BenchmarkOption.benchmark_id == benchmark_result.benchmark_id)
-        .order_by(BenchmarkOption.sort_order, BenchmarkOption.id)
-    ).all()
-    labels = []
-    for option in options:
-        selected = option_values.get(str(option.id))
-        if selected:
-            labels.append(f"{option.name}: {selected}")
-
-    generated_settings = ", ".join(labels)
-    custom_settings = (benchmark_result.settings or "").strip()
-    if generated_settings and custom_settings == generated_settings:
-        custom_settings = ""
-    elif generated_settings and custom_settings.startswith(f"{generated_settings}, "):
-        custom_settings = custom_settings[len(generated_settings) + 2:].strip()
-
-    if labels:
-        benchmark_result.settings = ", ".join([generated_settings] + ([custom_settings] if custom_settings else []))
-    elif custom_settings:
-        benchmark_result.settings = custom_settings
-    else:
-        benchmark_result.settings = None
+    options = _benchmark_options(benchmark_result.benchmark_id, db)
+    db.add_all([
+        BenchmarkResultOption(result_id=benchmark_result.id, option_id=option.id, value=selected)
+        for option, selected in selected_options(option_values, options)
+    ])
+
+
+def _parse_option_filters(raw: list[str] | None) -> list[tuple[int, str]]:
+    filters = []
+    for item in raw or []:
+        option_id, separator, value = item.partition(":")
+        value = value.strip()
+        try:
+            parsed_id = int(option_id)
+        except ValueError:
+            parsed_id = None
+        if not separator or parsed_id is None or not value:
+            raise HTTPException(status_code=400, detail="Option filters must look like '<option_id>:<value>'")
+        filters.append((parsed_id, value))
+    return filters
+
+
+def _apply_option_filters(statement, option: list[str] | None):
+    for option_id, value in _parse_option_filters(option):
+        statement = statement.where(
+            BenchmarkResult.id.in_(
+                select(BenchmarkResultOption.result_id).where(
+                    BenchmarkResultOption.option_id == option_id,
+                    BenchmarkResultOption.value == value,
+                )
+            )
+        )
+    return statement
 
 
-@router.post("/", response_model=BenchmarkResult)
-def create_benchmark_result(benchmark_result: BenchmarkResult, db: Session = Depends(get_db)):
-    benchmark = db.get(Benchmark, benchmark_result.benchmark_id)
-    if benchmark is None:
-        raise HTTPException(status_code=400, detail="Invalid benchmark ID")
+def _result_by_hash(content_hash: str, db: Session, exclude_id: int | None = None) -> BenchmarkResult | None:
+    statement = select(BenchmarkResult).where(BenchmarkResult.content_hash == content_hash)
+    if exclude_id is not None:
+        statement = statement.where(BenchmarkResult.id != exclude_id)
+    return db.exec(statement).first()
+
+
+def _stored_result(benchmark_result: BenchmarkResult, db: Session) -> BenchmarkResult | None:
+    """The row a retried submission stored the first time; 409 if its Idempotency-Key was used for another result."""
+    if benchmark_result.idempotency_hash is not None:
+        keyed = db.exec(
+            select(BenchmarkResult).where(BenchmarkResult.idempotency_hash == benchmark_result.idempotency_hash)
+        ).first()
+        if keyed is not None:
+            if keyed.content_hash != benchmark_result.content_hash:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Idempotency key was already used with a different result"
+                )
+            return keyed
+    if benchmark_result.content_hash is None:
+        return None
+    return _result_by_hash(benchmark_result.content_hash, db)
+
+
+def _replayed(stored: BenchmarkResult, response: Response | None) -> BenchmarkResult:
+    if response is not None:
+        response.headers["Idempotent-Replayed"] = "true"
+    return stored
 
-    config = db.get(Config, benchmark_result.config_id)
-    if config is None:
-        raise HTTPException(status_code=400, detail="Invalid config ID")
+
+@router.post("/", response_model=BenchmarkResult)
+def create_benchmark_result(
+    benchmark_result: BenchmarkResult,
+    db: Session = Depends(get_db),
+    idempotency_key: Annotated[str | None, Header()] = None,
+    response: Response = None,
+):
+    require_references(db, [
+        (Benchmark, benchmark_result.benchmark_id, "Invalid benchmark ID"),
+        (Config, benchmark_result.config_id, "Invalid config ID"),
+    ])
 
     if hasattr(benchmark_result, "name"):
         benchmark_result.name = validate_and_normalize_name(benchmark_result.name, db, BenchmarkResult)
 
     _apply_generated_settings(benchmark_result, db)
+
+    # Retried submissions resolve to the row stored the first time, flagged by an Idempotent-Replayed header.
+    benchmark_result.content_hash = result_content_hash(benchmark_result.model_dump(), idempotency_key)
+    benchmark_result.idempotency_hash = result_idempotency_hash(idempotency_key)
+    stored = _stored_result(benchmark_result, db)
+    if stored is not None:
+        return _replayed(stored, response)
+
     db.add(benchmark_result)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        stored = _stored_result(benchmark_result, db)
+        if stored is None:
+            raise
+        return _replayed(stored, response)
+    _sync_result_options(benchmark_result, db, replace=False)
+    return commit_and_return(db, benchmark_result)
+
+
+BULK_MAX_RESULTS = 5000
+
+
+@router.post("/bulk", response_model=dict)
+def create_benchmark_results_bulk(
+    benchmark_results: list[BenchmarkResult],
+    db: Session = Depends(get_db),
+    idempotency_key: Annotated[str | None, Header()] = None,
+):
+    if len(benchmark_results) > BULK_MAX_RESULTS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_RESULTS} results can be created at once")
+
+    created, duplicates, errors = ingest_results(
+        db,
+        [result.model_dump(include=set(RESULT_FIELDS)) for result in benchmark_results],
+        idempotency_key=idempotency_key,
+    )
     db.commit()
-    db.refresh(benchmark_result)
-    return benchmark_result
+    return {"created": created, "duplicates": duplicates, "failed": len(errors), "errors": errors}
+
+
+@router.post("/import", response_model=dict)
+def import_benchmark_results(
+    file: UploadFile,
+    file_format: Annotated[str | None, Query(alias="format")] = None,
+    chunk_size: int = 1000,
+    start_row: int = 0,
+    db: Session = Depends(get_db),
+):
+    if chunk_size < 1 or chunk_size > BULK_MAX_RESULTS:
+        raise HTTPException(status_code=400, detail=f"Chunk size must be between 1 and {BULK_MAX_RESULTS}")
+    if start_row < 0:
+        raise HTTPException(status_code=400, detail="Start row cannot be negative")
+    try:
+        resolved_format = detect_format(file.filename, file_format)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return import_results(db, iter_import_rows(file.file, resolved_format), chunk_size, start_row)
+
+
+@router.post("/tool-output", response_model=dict)
+def import_tool_output(
+    files: list[UploadFile],
+    config_id: int,
+    db: Session = Depends(get_db),
+    tool: str | None = None,
+):
+    """Parse raw benchmark tool output files (SuperPi, Quake, 3DMark, CrystalDiskMark) into results of one config."""
+    if len(files) > BULK_MAX_RESULTS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_RESULTS} files can be imported at once")
+    if tool is not None and tool not in TOOL_PARSERS:
+        raise HTTPException(status_code=400, detail=f"Unknown tool '{tool}'. Use: {', '.join(TOOL_PARSERS)}")
+    require_references(db, [(Config, config_id, "Invalid config ID")])
+
+    parsed = parse_tool_files(((file.filename or "upload", file.file.read) for file in files), tool)
+    return ingest_tool_output(db, config_id, parsed)
+
+
+class ResultSelection(BaseModel):
+    """Results matched by a bulk operation; timestamp_from is inclusive, timestamp_to exclusive."""
+    ids: list[int] | None = None
+    config_id: int | None = None
+    benchmark_id: int | None = None
+    timestamp_from: str | None = None
+    timestamp_to: str | None = None
+    dry_run: bool = False
+
+
+class ResultBulkUpdate(ResultSelection):
+    set_config_id: int | None = None
+    set_benchmark_id: int | None = None
+
+
+def _selection_conditions(selection: ResultSelection) -> list:
+    conditions = []
+    if selection.ids is not None:
+        if not selection.ids:
+            raise HTTPException(status_code=400, detail="ID list cannot be empty")
+        conditions.append(BenchmarkResult.id.in_(set(selection.ids)))
+    if selection.config_id is not None:
+        conditions.append(BenchmarkResult.config_id == selection.config_id)
+    if selection.benchmark_id is not None:
+        conditions.append(BenchmarkResult.benchmark_id == selection.benchmark_id)
+    if selection.timestamp_from:
+        conditions.append(BenchmarkResult.timestamp >= selection.timestamp_from)
+    if selection.timestamp_to:
+        conditions.append(BenchmarkResult.timestamp < selection.timestamp_to)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="At least one filter is required")
+    return conditions
+
+
+def _count_results(conditions: list, db: Session) -> int:
+    return db.exec(select(func.count()).select_from(BenchmarkResult).where(*conditions)).one()
+
+
+def _rehash_moved_results(db: Session, moved: list, values: dict) -> bool:
+    """
+    Store the content hash the moved rows will have after values are applied, a chunk at a time.
+    Their old hashes are cleared first, so any stored match is a real duplicate; returns False on one.
+    """
+    db.exec(
+        update(BenchmarkResult).where(*moved).values(content_hash=None).execution_options(synchronize_session=False)
+    )
+    table = BenchmarkResult.__table__
+    hash_columns = [getattr(BenchmarkResult, field) for field in RESULT_HASH_FIELDS]
+    last_id = 0
+    while True:
+        rows = db.exec(
+            select(BenchmarkResult.id, *hash_columns)
+            .where(*moved, BenchmarkResult.id > last_id)
+            .order_by(BenchmarkResult.id)
+            .limit(MULTI_ROW_INSERT_SIZE)
+        ).all()
+        if not rows:
+            return True
+        last_id = rows[-1].id
+        rehashed = {}
+        for row in rows:
+            content_hash = result_content_hash({**row._asdict(), **values})
+            if content_hash is not None:
+                if content_hash in rehashed:
+                    return False
+                rehashed[content_hash] = row.id
+        if not rehashed:
+            continue
+        if result_ids_by_hash(db, list(rehashed)):
+            return False
+        db.execute(
+            update(table).where(table.c.id == bindparam("result_id")).values(content_hash=bindparam("new_hash")),
+            [{"result_id": result_id, "new_hash": content_hash} for content_hash, result_id in rehashed.items()],
+        )
+
+
+@router.post("/bulk/update", response_model=dict)
+def update_benchmark_results_bulk(changes: ResultBulkUpdate, db: Session = Depends(get_db)):
+    conditions = _selection_conditions(changes)
+    values = {}
+    references = []
+    if changes.set_config_id is not None:
+        values["config_id"] = changes.set_config_id
+        references.append((Config, changes.set_config_id, "Invalid config ID"))
+    if changes.set_benchmark_id is not None:
+        values["benchmark_id"] = changes.set_benchmark_id
+        references.append((Benchmark, changes.set_benchmark_id, "Invalid benchmark ID"))
+    if not values:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+    require_references(db, references)
+
+    if changes.set_benchmark_id is not None:
+        # Selected options belong to the old benchmark and cannot follow the result.
+        moved_ids = select(BenchmarkResult.id).where(
+            *conditions, BenchmarkResult.benchmark_id != changes.set_benchmark_id
+        )
+        if db.exec(select(exists().where(BenchmarkResultOption.result_id.in_(moved_ids)))).one():
+            raise HTTPException(
+                status_code=400,
+                detail="Results with benchmark options cannot be moved to another benchmark"
+            )
+
+    matched = _count_results(conditions, db)
+    if changes.dry_run:
+        return {"matched": matched, "dry_run": True}
+
+    # The content hash covers config and benchmark, so moved rows are rehashed to stay deduplicated;
+    # rows that do not move keep their stored hash, which may derive from an idempotency key.
+    moving = or_(*(getattr(BenchmarkResult, field) != value for field, value in values.items()))
+    if not _rehash_moved_results(db, [*conditions, moving], values):
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Updated results would duplicate existing benchmark results."
+        )
+    updated = db.exec(
+        update(BenchmarkResult).where(*conditions).values(**values).execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return {"matched": matched, "updated": updated, "dry_run": False}
+
+
+@router.post("/bulk/delete", response_model=dict)
+def delete_benchmark_results_bulk(selection: ResultSelection, db: Session = Depends(get_db)):
+    conditions = _selection_conditions(selection)
+    matched = _count_results(conditions, db)
+    if selection.dry_run:
+        return {"matched": matched, "dry_run": True}
+
+    db.exec(
+        delete(BenchmarkResultOption)
+        .where(BenchmarkResultOption.result_id.in_(select(BenchmarkResult.id).where(*conditions)))
+        .execution_options(synchronize_session=False)
+    )
+    deleted = db.exec(
+        delete(BenchmarkResult).where(*conditions).execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return {"matched": matched, "deleted": deleted, "dry_run": False}
 
 
 @router.put("/{result_id}", response_model=BenchmarkResult)
@@ -83,28 +389,40 @@ def update_benchmark_result(result_id: int, benchmark_result: BenchmarkResult, d
     if db_result is None:
         raise HTTPException(status_code=404, detail="Benchmark result not found")
 
+    references = []
     if benchmark_result.benchmark_id is not None:
-        benchmark = db.get(Benchmark, benchmark_result.benchmark_id)
-        if benchmark is None:
-            raise HTTPException(status_code=400, detail="Invalid benchmark ID")
-
+        references.append((Benchmark, benchmark_result.benchmark_id, "Invalid benchmark ID"))
     if benchmark_result.config_id is not None:
-        config = db.get(Config, benchmark_result.config_id)
-        if config is None:
-            raise HTTPException(status_code=400, detail="Invalid config ID")
+        references.append((Config, benchmark_result.config_id, "Invalid config ID"))
+    require_references(db, references)
 
     if hasattr(benchmark_result, "name"):
         benchmark_result.name = validate_and_normalize_name(benchmark_result.name, db, BenchmarkResult,
                                                             current_id=result_id)
 
     _apply_generated_settings(benchmark_result, db)
-    for key, value in benchmark_result.dict(exclude_unset=True).items():
+    changes = benchmark_result.model_dump(exclude_unset=True, exclude={"id", "content_hash", "idempotency_hash"})
+    for key, value in changes.items():
         setattr(db_result, key, value)
 
+    # Edits that keep what identifies the run keep the stored hash, which may derive from an idempotency key.
+    state = inspect(db_result)
+    if not any(state.attrs[field].history.has_changes() for field in RESULT_HASH_FIELDS):
+        duplicate = None
+    else:
+        db_result.content_hash = result_content_hash(db_result.model_dump())
+        with db.no_autoflush:
+            duplicate = db_result.content_hash and _result_by_hash(db_result.content_hash, db, exclude_id=result_id)
+    if duplicate is not None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="An identical benchmark result already exists."
+        )
+
     db.add(db_result)
-    db.commit()
-    db.refresh(db_result)
-    return db_result
+    _sync_result_options(db_result, db)
+    return commit_and_return(db, db_result)
 
 
 @router.delete("/{result_id}", response_model=dict)
@@ -113,26 +431,87 @@ def delete_benchmark_result(result_id: int, db: Session = Depends(get_db)):
     if db_result is None:
         raise HTTPException(status_code=404, detail="Benchmark result not found")
 
+    db.exec(delete(BenchmarkResultOption).where(BenchmarkResultOption.result_id == result_id))
     db.delete(db_result)
     db.commit()
     return {"message": "Benchmark result deleted successfully"}
 
 
-@router.get("/", response_model=list[BenchmarkResult])
-def get_benchmark_results(db: Session = Depends(get_db)):
-    results = db.exec(select(BenchmarkResult)).all()
-    return results
-
-
-@router.get("/config/{config_id}", response_model=list[BenchmarkResult])
-def get_results_by_config(config_id: int, db: Session = Depends(get_db)):
-    results = db.exec(select(BenchmarkResult).where(BenchmarkResult.config_id == config_id)).all()
-    return results
+@router.get("/")
+def get_benchmark_results(
+    db: Session = Depends(get_db),
+    option: Annotated[list[str] | None, Query()] = None,
+    min_cpu_speed_mhz: int | None = None,
+    max_cpu_speed_mhz: int | None = None,
+    min_vram_bytes: int | None = None,
+    max_vram_bytes: int | None = None,
+    min_ram_bytes: int | None = None,
+    max_ram_bytes: int | None = None,
+    sort: str | None = None,
+    expand: str | None = None,
+    fields: str | None = None,
+):
+    """Hardware ranges and hardware sorts apply to each config's primary CPU and GPU."""
+    expansions = parse_expand(expand, RESULT_EXPANSIONS)
+    columns = parse_fields(fields, BenchmarkResult)
+    statement = _apply_option_filters(select(BenchmarkResult), option)
+    hardware_columns = {
+        "cpu_speed_mhz": CPU.speed_mhz,
+        "vram_bytes": GPU.vram_bytes,
+        "ram_bytes": Config.ram_bytes,
+    }
+    bounds = {
+        "cpu_speed_mhz": (min_cpu_speed_mhz, max_cpu_speed_mhz),
+        "vram_bytes": (min_vram_bytes, max_vram_bytes),
+        "ram_bytes": (min_ram_bytes, max_ram_bytes),
+    }
+    used = {name for name, (minimum, maximum) in bounds.items() if minimum is not None or maximum is not None}
+    if sort and sort.lstrip("-") in hardware_columns:
+        used.add(sort.lstrip("-"))
+
+    if used:
+        statement = statement.join(Config, Config.id == BenchmarkResult.config_id)
+    if "cpu_speed_mhz" in used:
+        statement = statement.join(CPU, CPU.id == Config.cpu_id)
+    if "vram_bytes" in used:
+        statement = statement.join(GPU, GPU.id == Config.gpu_id)
+    for name in used:
+        statement = apply_range_filter(statement, hardware_columns[name], *bounds[name])
+
+    statement = apply_sort(
+        statement,
+        sort,
+        {
+            "id": BenchmarkResult.id,
+            "result": BenchmarkResult.result,
+            "timestamp": BenchmarkResult.timestamp,
+            **hardware_columns,
+        },
+        BenchmarkResult.id,
+    )
+    return list_rows(db, statement, columns, expansions)
+
+
+@router.get("/config/{config_id}")
+def get_results_by_config(
+    config_id: int,
+    db: Session = Depends(get_db),
+    option: Annotated[list[str] | None, Query()] = None,
+    expand: str | None = None,
+):
+    expansions = parse_expand(expand, RESULT_EXPANSIONS)
+    statement = select(BenchmarkResult).where(BenchmarkResult.config_id == config_id)
+    results = db.exec(apply_expand(_apply_option_filters(statement, option), expansions)).all()
+    return [expand_row(result, expansions) for result in results]
 
 
 @router.get("/cpu/{cpu_id}", response_model=list[BenchmarkResult])
-def get_results_by_cpu(cpu_id: int, db: Session = Depends(get_db)):
-    results = db.exec(select(BenchmarkResult)).all()
+def get_results_by_cpu(
+    cpu_id: int,
+    db: Session = Depends(get_db),
+    option: Annotated[list[str] | None, Query()] = None,
+):
+    results = db.exec(_apply_option_filters(select(BenchmarkResult), option)).all()
     configs = {config.id: config for config in db.exec(select(Config)).all()}
     return [
         result
@@ -142,8 +521,12 @@ def get_results_by_cpu(cpu_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/gpu/{gpu_id}", response_model=list[BenchmarkResult])
-def get_results_by_gpu(gpu_id: int, db: Session = Depends(get_db)):
-    results = db.exec(select(BenchmarkResult)).all()
+def get_results_by_gpu(
+    gpu_id: int,
+    db: Session = Depends(get_db),
+    option: Annotated[list[str] | None, Query()] = None,
+):
+    results = db.exec(_apply_option_filters(select(BenchmarkResult), option)).all()
     configs = {config.id: config for config in db.exec(select(Config)).all()}
     return [
         result
@@ -153,8 +536,13 @@ def get_results_by_gpu(gpu_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/cpu-gpu/{cpu_id}/{gpu_id}", response_model=list[BenchmarkResult])
-def get_results_by_cpu_and_gpu(cpu_id: int, gpu_id: int, db: Session = Depends(get_db)):
-    results = db.exec(select(BenchmarkResult)).all()
+def get_results_by_cpu_and_gpu(
+    cpu_id: int,
+    gpu_id: int,
+    db: Session = Depends(get_db),
+    option: Annotated[list[str] | None, Query()] = None,
+):
+    results = db.exec(_apply_option_filters(select(BenchmarkResult), option)).all()
     configs = {config.id: config for config in db.exec(select(Config)).all()}
     return [
         result
@@ -165,12 +553,193 @@ def get_results_by_cpu_and_gpu(cpu_id: int, gpu_id: int, db: Session = Depends(g
     ]
 
 
-@router.get("/{result_id}", response_model=BenchmarkResult)
-def get_benchmark_result(result_id: int, db: Session = Depends(get_db)):
-    result = db.get(BenchmarkResult, result_id)
+STATS_DIMENSIONS = ("benchmark", "settings", "config", "cpu", "cpu_family", "gpu", "gpu_model")
+STATS_MAX_GROUPS = 5000
+# Percentiles need every raw value of the page's groups, so they are opt-in and bounded by the page's result count.
+STATS_MAX_PERCENTILE_VALUES = 100_000
+
+
+def _stats_dimension_columns(dimension: str) -> tuple[list, list]:
+    """Return the (group key columns, display label columns) of a stats dimension."""
+    if dimension == "benchmark":
+        return [BenchmarkResult.benchmark_id.label("benchmark_id")], [Benchmark.name.label("benchmark_name")]
+    if dimension == "settings":
+        return [BenchmarkResult.settings_key.label("settings_key")], [
+            _settings_group(BenchmarkResult.settings).label("settings")
+        ]
+    if dimension == "config":
+        return [BenchmarkResult.config_id.label("config_id")], [Config.name.label("config_name")]
+    if dimension == "cpu":
+        return [Config.cpu_id.label("cpu_id")], []
+    if dimension == "cpu_family":
+        return [CPU.cpu_family_id.label("cpu_family_id")], [CPUFamily.name.label("cpu_family_name")]
+    if dimension == "gpu":
+        return [Config.gpu_id.label("gpu_id")], []
+    if dimension == "gpu_model":
+        return [GPU.gpu_model_id.label("gpu_model_id")], [GPUModel.name.label("gpu_model_name")]
+    raise HTTPException(
+        status_code=400,
+        detail=f"Unknown group_by dimension '{dimension}'. Use: {', '.join(STATS_DIMENSIONS)}",
+    )
+
+
+def _parse_percentiles(raw: str | None) -> list[float]:
+    percentiles = []
+    for part in (raw or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = float(part)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Percentiles must be numbers between 0 and 100")
+        if not 0 <= value <= 100:
+            raise HTTPException(status_code=400, detail="Percentiles must be numbers between 0 and 100")
+        percentiles.append(value)
+    return percentiles
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    # Linear interpolation between closest ranks, same as numpy's default.
+    position = (len(sorted_values) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _percentile_label(percentile: float) -> str:
+    return f"p{percentile:g}".replace(".", "_")
+
+
+@router.get("/stats", response_model=list)
+def get_result_stats(
+    group_by: str = "benchmark,settings",
+    benchmark_id: int | None = None,
+    percentiles: str | None = None,
+    limit: int = 500,
+    offset: int = 0,
+    db: Session = Depends(get_db),
+):
+    dimensions = []
+    for part in group_by.split(","):
+        part = part.strip()
+        if part and part not in dimensions:
+            dimensions.append(part)
+    if not dimensions:
+        raise HTTPException(status_code=400, detail="At least one group_by dimension is required")
+    if limit < 1 or limit > STATS_MAX_GROUPS:
+        raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {STATS_MAX_GROUPS}")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Offset cannot be negative")
+    requested_percentiles = _parse_percentiles(percentiles)
+
+    group_columns = []
+    label_columns = []
+    for dimension in dimensions:
+        keys, labels = _stats_dimension_columns(dimension)
+        group_columns.extend(keys)
+        label_columns.extend(labels)
+    key_count = len(group_columns)
+    label_count = len(label_columns)
+
+    def with_joins(statement):
+        if "benchmark" in dimensions:
+            statement = statement.join(Benchmark, Benchmark.id == BenchmarkResult.benchmark_id)
+        if {"config", "cpu", "cpu_family", "gpu", "gpu_model"} & set(dimensions):
+            statement = statement.join(Config, Config.id == BenchmarkResult.config_id)
+        if "cpu_family" in dimensions:
+            statement = statement.outerjoin(CPU, CPU.id == Config.cpu_id)
+            statement = statement.outerjoin(CPUFamily, CPUFamily.id == CPU.cpu_family_id)
+        if "gpu_model" in dimensions:
+            statement = statement.outerjoin(GPU, GPU.id == Config.gpu_id)
+            statement = statement.outerjoin(GPUModel, GPUModel.id == GPU.gpu_model_id)
+        if benchmark_id is not None:
+            statement = statement.where(BenchmarkResult.benchmark_id == benchmark_id)
+        return statement
+
+    # Squared deviations from a per-group window mean: the two-pass variance in SQL, without the cancellation
+    # of avg(x*x) - avg(x)*avg(x) on large results.
+    key_columns = [column.element for column in group_columns]
+    rows = with_joins(
+        select(
+            *group_columns,
+            *label_columns,
+            BenchmarkResult.id,
+            BenchmarkResult.result,
+            func.avg(BenchmarkResult.result).over(partition_by=key_columns).label("group_mean"),
+        ).select_from(BenchmarkResult)
+    ).subquery()
+    row_keys = [rows.c[column.name] for column in group_columns]
+    deviation = rows.c.result - rows.c.group_mean
+    aggregate_statement = select(
+        *row_keys,
+        *[func.min(rows.c[column.name]).label(column.name) for column in label_columns],
+        func.count(rows.c.id),
+        func.min(rows.c.result),
+        func.max(rows.c.result),
+        func.avg(rows.c.result),
+        func.sum(deviation * deviation),
+    ).group_by(*row_keys).order_by(*row_keys).offset(offset).limit(limit)
+
+    groups = {}
+    for row in db.exec(aggregate_statement).all():
+        key = tuple(row[:key_count])
+        labels = row[key_count:key_count + label_count]
+        count, minimum, maximum, mean, squared_deviations = row[key_count + label_count:]
+        groups[key] = {
+            **{column.name: value for column, value in zip(group_columns, key)},
+            **{column.name: value for column, value in zip(label_columns, labels)},
+            "count": count,
+            "min": minimum,
+            "max": maximum,
+            "mean": mean,
+            "stddev": (squared_deviations / (count - 1)) ** 0.5 if count > 1 else None,
+            "median": None,
+            "percentiles": {},
+        }
+
+    if requested_percentiles and sum(group["count"] for group in groups.values()) > STATS_MAX_PERCENTILE_VALUES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Percentiles are limited to {STATS_MAX_PERCENTILE_VALUES} results per page; lower the limit",
+        )
+
+    if groups and requested_percentiles:
+        # Percentiles only need the raw values of the groups on this page.
+        group_filter = (
+            key_columns[0].in_([key[0] for key in groups])
+            if key_count == 1
+            else tuple_(*key_columns).in_(list(groups))
+        )
+        values_statement = with_joins(
+            select(*key_columns, BenchmarkResult.result).select_from(BenchmarkResult)
+        ).where(group_filter).order_by(*key_columns, BenchmarkResult.result)
+
+        values_by_group = {}
+        for row in db.exec(values_statement).all():
+            values_by_group.setdefault(tuple(row[:key_count]), []).append(row[key_count])
+
+        for key, values in values_by_group.items():
+            group = groups.get(key)
+            if group is None:
+                continue
+            group["median"] = _percentile(values, 50)
+            group["percentiles"] = {
+                _percentile_label(percentile): _percentile(values, percentile)
+                for percentile in requested_percentiles
+            }
+
+    return list(groups.values())
+
+
+@router.get("/{result_id}")
+def get_benchmark_result(result_id: int, db: Session = Depends(get_db), expand: str | None = None):
+    expansions = parse_expand(expand, RESULT_EXPANSIONS)
+    statement = select(BenchmarkResult).where(BenchmarkResult.id == result_id)
+    result = db.exec(apply_expand(statement, expansions)).first()
     if result is None:
         raise HTTPException(status_code=404, detail="Benchmark result not found")
-    return result
+    return expand_row(result, expansions)
 
 
 def calculate_percentage_change(old_value: float, new_value: float) -> float:
@@ -183,6 +752,26 @@ def normalize_result_settings(value: str | None) -> str:
     return (value or "").strip()
 
 
+def _parse_id_list(raw: str | None) -> list[int]:
+    ids = []
+    for part in (raw or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = int(part)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="IDs must be a comma-separated list of integers")
+        if value not in ids:
+            ids.append(value)
+    return ids
+
+
+def _settings_group(column):
+    """SQL counterpart of normalize_result_settings for grouping and joins."""
+    return func.coalesce(func.trim(column), "")
+
+
 @router.get("/compare/configs", response_model=list)
 def compare_configs(
     config_id_1: int,
@@ -193,50 +782,70 @@ def compare_configs(
     if benchmark_id is not None and not db.get(Benchmark, benchmark_id):
         raise HTTPException(status_code=404, detail="Benchmark not found")
 
-    results_1 = db.exec(select(BenchmarkResult).where(BenchmarkResult.config_id == config_id_1)).all()
-    results_2 = db.exec(select(BenchmarkResult).where(BenchmarkResult.config_id == config_id_2)).all()
-
-    if not results_1 or not results_2:
+    configs_with_results = set(db.exec(
+        select(BenchmarkResult.config_id)
+        .where(BenchmarkResult.config_id.in_([config_id_1, config_id_2]))
+        .group_by(BenchmarkResult.config_id)
+    ).all())
+    if config_id_1 not in configs_with_results or config_id_2 not in configs_with_results:
         raise HTTPException(
             status_code=404,
             detail="Benchmark results for one or both configurations not found"
         )
 
-    comparison = []
-
-    for result_1 in results_1:
-        if benchmark_id is not None and result_1.benchmark_id != benchmark_id:
-            continue
-
-        result_1_settings = normalize_result_settings(result_1.settings)
-        result_2 = next(
-            (
-                r for r in results_2
-                if r.benchmark_id == result_1.benchmark_id
-                and normalize_result_settings(r.settings) == result_1_settings
+    result_1 = aliased(BenchmarkResult)
+    result_2 = aliased(BenchmarkResult)
+
+    # Config 2 contributes its first result per (benchmark, settings key) group.
+    first_match = (
+        select(func.min(BenchmarkResult.id).label("id"))
+        .where(BenchmarkResult.config_id == config_id_2)
+        .group_by(BenchmarkResult.benchmark_id, BenchmarkResult.settings_key)
+        .subquery()
+    )
+
+    statement = (
+        select(
+            result_1.benchmark_id,
+            Benchmark.name,
+            Benchmark.lower_is_better,
+            _settings_group(result_1.settings),
+            result_1.result,
+            result_2.result,
+        )
+        .select_from(result_1)
+        .join(Benchmark, Benchmark.id == result_1.benchmark_id)
+        .join(
+            result_2,
+            and_(
+                result_2.benchmark_id == result_1.benchmark_id,
+                result_2.settings_key == result_1.settings_key,
             ),
-            None,
         )
-        if result_2:
-            benchmark = db.get(Benchmark, result_1.benchmark_id)
-            if not benchmark:
-                continue
+        .join(first_match, first_match.c.id == result_2.id)
+        .where(result_1.config_id == config_id_1)
+        .order_by(result_1.id)
+    )
+    if benchmark_id is not None:
+        statement = statement.where(result_1.benchmark_id == benchmark_id)
 
-            percentage_change = calculate_percentage_change(result_1.result, result_2.result)
-
-            # Flip if lower numbers are better
-            if benchmark.lower_is_better:
-                percentage_change = -percentage_change
-
-            comparison.append({
-                "benchmark_id": result_1.benchmark_id,
-                "benchmark_name": benchmark.name,
-                "settings": result_1_settings,
-                "lower_is_better": benchmark.lower_is_better,
-                "config_1_result": result_1.result,
-                "config_2_result": result_2.result,
-                "percentage_change": round(percentage_change, 2),
-            })
+    comparison = []
+    for row_benchmark_id, benchmark_name, lower_is_better, settings, value_1, value_2 in db.exec(statement).all():
+        percentage_change = calculate_percentage_change(value_1, value_2)
+
+        # Flip if lower numbers are better
+        if lower_is_better:
+            percentage_change = -percentage_change
+
+        comparison.append({
+            "benchmark_id": row_benchmark_id,
+            "benchmark_name": benchmark_name,
+            "settings": settings,
+            "lower_is_better": lower_is_better,
+            "config_1_result": value_1,
+            "config_2_result": value_2,
+            "percentage_change": round(percentage_change, 2),
+        })
 
     if benchmark_id is not None and not comparison:
         raise HTTPException(
@@ -245,3 +854,93 @@ def compare_configs(
         )
 
     return comparison
+
+
+@router.get("/compare/matrix", response_model=dict)
+def compare_matrix(
+    config_ids: str,
+    baseline_config_id: int | None = None,
+    benchmark_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    ids = _parse_id_list(config_ids)
+    if not ids:
+        raise HTTPException(status_code=400, detail="At least one config ID is required")
+
+    baseline_id = ids[0] if baseline_config_id is None else baseline_config_id
+    if baseline_id not in ids:
+        raise HTTPException(status_code=400, detail="Baseline config must be one of the compared configs")
+
+    known_ids = set(db.exec(select(Config.id).where(Config.id.in_(ids))).all())
+    if len(known_ids) != len(ids):
+        raise HTTPException(status_code=404, detail="Config not found")
+
+    settings = func.min(_settings_group(BenchmarkResult.settings))
+    statement = (
+        select(
+            BenchmarkResult.benchmark_id,
+            Benchmark.name,
+            Benchmark.lower_is_better,
+            BenchmarkResult.settings_key,
+            settings,
+            BenchmarkResult.config_id,
+            func.avg(BenchmarkResult.result),
+            func.count(BenchmarkResult.id),
+        )
+        .join(Benchmark, Benchmark.id == BenchmarkResult.benchmark_id)
+        .where(BenchmarkResult.config_id.in_(ids))
+        .group_by(
+            BenchmarkResult.benchmark_id,
+            Benchmark.name,
+            Benchmark.lower_is_better,
+            BenchmarkResult.settings_key,
+            BenchmarkResult.config_id,
+        )
+        .order_by(Benchmark.name, BenchmarkResult.benchmark_id, settings)
+    )
+    if benchmark_id is not None:
+        statement = statement.where(BenchmarkResult.benchmark_id == benchmark_id)
+
+    positions = {config_id: index for index, config_id in enumerate(ids)}
+    baseline_index = positions[baseline_id]
+    rows = {}
+    for row_benchmark_id, name, lower_is_better, key, row_settings, config_id, average, runs in db.exec(statement).all():
+        row = rows.get((row_benchmark_id, key))
+        if row is None:
+            row = rows[(row_benchmark_id, key)] = {
+                "benchmark_id": row_benchmark_id,
+                "benchmark_name": name,
+                "settings": row_settings,
+                "lower_is_better": lower_is_better,
+                "results": [None] * len(ids),
+                "runs": [0] * len(ids),
+            }
+        row["results"][positions[config_id]] = average
+        row["runs"][positions[config_id]] = runs
+
+    covered = [0] * len(ids)
+    for row in rows.values():
+        baseline = row["results"][baseline_index]
+        changes = []
+        for index, value in enumerate(row["results"]):
+            if value is not None:
+                covered[index] += 1
+            if value is None or baseline is None:
+                changes.append(None)
+                continue
+            percentage_change = calculate_percentage_change(baseline, value)
+            if row["lower_is_better"]:
+                percentage_change = -percentage_change
+            changes.append(round(percentage_change, 2))
+        row["percentage_change"] = changes
+        row["missing_config_ids"] = [ids[index] for index, value in enumerate(row["results"]) if value is None]
+
+    return {
+        "config_ids": ids,
+        "baseline_config_id": baseline_id,
+        "rows": list(rows.values()),
+        "coverage": [
+            {"config_id": config_id, "covered": covered[index], "missing": len(rows) - covered[index]}
+            for index, config_id in enumerate(ids)
+        ],
+    }
@@ -0,0 +1,445 @@
+import json
+
+from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel
+from sqlalchemy import bindparam, delete, func, insert, inspect, select, update
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session
+
+from models.config import Config, ConfigComponent
+from models.cpu import CPU, CPUBrand, CPUFamily
+from models.display_name import refresh_config_display_names
+from models.disk import Disk
+from models.gpu import GPU, GPUBrand, GPUManufacturer, GPUModel, GPUVRAMType
+from models.motherboard import Motherboard, MotherboardChipset, MotherboardManufacturer
+from models.name_key import normalize_name_key
+from models.oses import OS
+from models.ram import RAM
+from database import get_db
+from utils.catalog_cache import (
+    COMPONENTS,
+    LOOKUP,
+    LOOKUP_MODELS,
+    USAGE,
+    bump_catalog_generation,
+    cached_catalog_view,
+    lookup_rows,
+)
+from utils.catalog_search import PrefixIndex, Suggestion
+from utils.config_components import component_ids
+from utils.db_write import insert_ignoring_conflicts, require_references
+from utils.helper import normalize_name
+
+router = APIRouter()
+
+SUGGEST_MAX_LIMIT = 50
+
+
+class CPUBrandUpsert(BaseModel):
+    name: str
+    families: list[str] = []
+
+
+class GPUBrandUpsert(BaseModel):
+    name: str
+    models: list[str] = []
+
+
+class CatalogMerge(BaseModel):
+    kind: str
+    survivor_id: int
+    victim_ids: list[int]
+    dry_run: bool = False
+
+
+class CatalogUpsert(BaseModel):
+    cpu_brands: list[CPUBrandUpsert] = []
+    gpu_brands: list[GPUBrandUpsert] = []
+    gpu_manufacturers: list[str] = []
+    gpu_vram_types: list[str] = []
+    motherboard_manufacturers: list[str] = []
+    motherboard_chipsets: list[str] = []
+    ram: list[str] = []
+    disks: list[str] = []
+    oses: list[str] = []
+
+
+def _upsert_named(db: Session, model, names: list[tuple[int | None, str]], parent_column: str | None = None):
+    """
+    Make sure every (parent_id, name) pair exists, matching existing rows by name_key.
+    Returns ({(parent_id, name_key): id}, created count).
+    """
+    wanted = {}
+    for parent_id, name in names:
+        name = normalize_name(name)
+        wanted.setdefault((parent_id, normalize_name_key(name)), name)
+    if not wanted:
+        return {}, 0
+
+    table = model.__table__
+    parent = table.c[parent_column] if parent_column else None
+
+    def lookup() -> dict[tuple[int | None, str], int]:
+        columns = [table.c.id, table.c.name_key] + ([parent] if parent is not None else [])
+        statement = select(*columns).where(table.c.name_key.in_({key[1] for key in wanted}))
+        if parent is not None:
+            statement = statement.where(parent.in_({key[0] for key in wanted}))
+        found = {}
+        for row in db.execute(statement):
+            found.setdefault((row[2] if parent is not None else None, row[1]), row[0])
+        return found
+
+    ids = lookup()
+    missing = [
+        {"name": name, "name_key": key[1], **({parent_column: key[0]} if parent_column else {})}
+        for key, name in wanted.items()
+        if key not in ids
+    ]
+    if not missing:
+        return ids, 0
+
+    conflict_columns = ["name_key", parent_column] if parent_column else ["name_key"]
+    if _has_unique_index(db, table, conflict_columns):
+        insert_ignoring_conflicts(db, model, missing, conflict_columns)
+    else:
+        # init_db leaves the index non-unique while legacy names that differ only in case remain,
+        # so there is no conflict target; the lookup above already skipped the existing names.
+        db.execute(insert(table), missing)
+    return lookup(), len(missing)
+
+
+def _has_unique_index(db: Session, table, columns: list[str]) -> bool:
+    return any(
+        index["unique"] and set(index["column_names"]) == set(columns)
+        for index in inspect(db.connection()).get_indexes(table.name)
+    )
+
+
+def _summary(ids: dict, created: int) -> dict:
+    return {"created": created, "existing": len(ids) - created}
+
+
+@router.post("/bulk")
+def upsert_catalog(catalog: CatalogUpsert, db: Session = Depends(get_db)):
+    summary = {}
+
+    cpu_brand_ids, created = _upsert_named(db, CPUBrand, [(None, brand.name) for brand in catalog.cpu_brands])
+    summary["cpu_brands"] = _summary(cpu_brand_ids, created)
+    families = [
+        (cpu_brand_ids[(None, normalize_name_key(brand.name))], family)
+        for brand in catalog.cpu_brands
+        for family in brand.families
+    ]
+    summary["cpu_families"] = _summary(*_upsert_named(db, CPUFamily, families, "cpu_brand_id"))
+
+    gpu_brand_ids, created = _upsert_named(db, GPUBrand, [(None, brand.name) for brand in catalog.gpu_brands])
+    summary["gpu_brands"] = _summary(gpu_brand_ids, created)
+    models = [
+        (gpu_brand_ids[(None, normalize_name_key(brand.name))], model)
+        for brand in catalog.gpu_brands
+        for model in brand.models
+    ]
+    summary["gpu_models"] = _summary(*_upsert_named(db, GPUModel, models, "gpu_brand_id"))
+
+    flat_sections = (
+        ("gpu_manufacturers", GPUManufacturer),
+        ("gpu_vram_types", GPUVRAMType),
+        ("motherboard_manufacturers", MotherboardManufacturer),
+        ("motherboard_chipsets", MotherboardChipset),
+        ("ram", RAM),
+        ("disks", Disk),
+        ("oses", OS),
+    )
+    for section, model in flat_sections:
+        names = [(None, name) for name in getattr(catalog, section)]
+        summary[section] = _summary(*_upsert_named(db, model, names))
+
+    db.commit()
+    bump_catalog_generation(db.get_bind(), LOOKUP)
+    return summary
+
+
+# Config columns referencing one component per config; CPUs and GPUs go through config_component.
+CONFIG_COMPONENT_COLUMNS = {
+    "motherboard": Config.motherboard_id,
+    "ram": Config.ram_id,
+    "disk": Config.disk_id,
+    "os": Config.os_id,
+}
+USAGE_KINDS = ("cpu", "gpu", *CONFIG_COMPONENT_COLUMNS)
+
+
+def _component_reference_columns(kind: str):
+    """(config ID column, component ID column, extra conditions) of the references to one component kind."""
+    if kind in CONFIG_COMPONENT_COLUMNS:
+        column = CONFIG_COMPONENT_COLUMNS[kind]
+        return Config.id, column, [column.is_not(None)]
+    return ConfigComponent.config_id, ConfigComponent.component_id, [ConfigComponent.kind == kind]
+
+
+def _configs_by_component(db: Session, kind: str) -> dict[int, set[int]]:
+    """Config IDs using each component, including every slot of multi-CPU/GPU configs."""
+    config_column, component_column, conditions = _component_reference_columns(kind)
+    usage = {}
+    for config_id, component_id in db.execute(select(config_column, component_column).where(*conditions)):
+        usage.setdefault(component_id, set()).add(config_id)
+    return usage
+
+
+@router.get("/usage", response_model=dict)
+def get_component_usage(kind: str = "cpu", db: Session = Depends(get_db)):
+    """Number of configs using each component of a kind, from one grouped query over indexed columns."""
+    if kind not in USAGE_KINDS:
+        raise HTTPException(status_code=400, detail=f"Invalid kind. Use: {', '.join(USAGE_KINDS)}")
+    config_column, component_column, conditions = _component_reference_columns(kind)
+    rows = db.execute(
+        select(component_column, func.count(func.distinct(config_column))).where(*conditions).group_by(component_column)
+    )
+    return {component_id: count for component_id, count in rows}
+
+
+def _tree_node(fields: dict, configs: set[int], children_key: str | None = None, children=()):
+    """Returns (node, config IDs); a branch counts each config once even if several children use it."""
+    node = dict(fields)
+    if children_key is not None:
+        configs = set(configs).union(*(child_configs for _child, child_configs in children))
+        node[children_key] = [child for child, _child_configs in children]
+    node["usage"] = len(configs)
+    return node, configs
+
+
+def _by_name(rows, attribute: str = "name"):
+    return sorted(rows, key=lambda row: (getattr(row, attribute).casefold(), row.id))
+
+
+def _cpu_tree(db: Session) -> list[dict]:
+    usage = _configs_by_component(db, "cpu")
+    brands = db.execute(
+        select(CPUBrand)
+        .options(selectinload(CPUBrand.families).selectinload(CPUFamily.cpus))
+        .execution_options(populate_existing=True)
+    ).scalars()
+    return [
+        _tree_node({"id": brand.id, "name": brand.name}, set(), "families", [
+            _tree_node({"id": family.id, "name": family.name}, set(), "cpus", [
+                _tree_node(
+                    {
+                        "id": cpu.id,
+                        "display_name": cpu.display_name,
+                        "model": cpu.model,
+                        "speed": cpu.speed,
+                        "speed_mhz": cpu.speed_mhz,
+                        "core_count": cpu.core_count,
+                        "serial": cpu.serial,
+                    },
+                    usage.get(cpu.id, set()),
+                )
+                for cpu in _by_name(family.cpus, "model")
+            ])
+            for family in _by_name(brand.families)
+        ])[0]
+        for brand in _by_name(brands)
+    ]
+
+
+def _gpu_tree(db: Session) -> list[dict]:
+    usage = _configs_by_component(db, "gpu")
+    gpus = selectinload(GPUBrand.models).selectinload(GPUModel.gpus)
+    brands = db.execute(
+        select(GPUBrand)
+        .options(gpus.selectinload(GPU.manufacturer), gpus.selectinload(GPU.vram_type))
+        .execution_options(populate_existing=True)
+    ).scalars()
+    return [
+        _tree_node({"id": brand.id, "name": brand.name}, set(), "models", [
+            _tree_node({"id": model.id, "name": model.name}, set(), "gpus", [
+                _tree_node(
+                    {
+                        "id": gpu.id,
+                        "display_name": gpu.display_name,
+                        "vram_size": gpu.vram_size,
+                        "vram_bytes": gpu.vram_bytes,
+                        "serial": gpu.serial,
+                        "manufacturer_id": gpu.gpu_manufacturer_id,
+                        "manufacturer": gpu.manufacturer.name if gpu.manufacturer else None,
+                        "vram_type_id": gpu.gpu_vram_type_id,
+                        "vram_type": gpu.vram_type.name if gpu.vram_type else None,
+                    },
+                    usage.get(gpu.id, set()),
+                )
+                for gpu in sorted(model.gpus, key=lambda gpu: gpu.id)
+            ])
+            for model in _by_name(brand.models)
+        ])[0]
+        for brand in _by_name(brands)
+    ]
+
+
+def _motherboard_tree(db: Session) -> list[dict]:
+    usage = _configs_by_component(db, "motherboard")
+    manufacturers = db.execute(
+        select(MotherboardManufacturer).options(
+            selectinload(MotherboardManufacturer.motherboards).selectinload(Motherboard.chipset)
+        )
+        .execution_options(populate_existing=True)
+    ).scalars()
+    return [
+        _tree_node({"id": manufacturer.id, "name": manufacturer.name}, set(), "motherboards", [
+            _tree_node(
+                {
+                    "id": board.id,
+                    "display_name": board.display_name,
+                    "model": board.model,
+                    "serial": board.serial,
+                    "chipset_id": board.chipset_id,
+                    "chipset": board.chipset.name if board.chipset else None,
+                },
+                usage.get(board.id, set()),
+            )
+            for board in _by_name(manufacturer.motherboards, "model")
+        ])[0]
+        for manufacturer in _by_name(manufacturers)
+    ]
+
+
+CATALOG_TREES = {
+    "cpu": _cpu_tree,
+    "gpu": _gpu_tree,
+    "motherboard": _motherboard_tree,
+}
+
+
+@router.get("/tree", response_model=list)
+def get_catalog_tree(kind: str = "cpu", db: Session = Depends(get_db)):
+    """Nested catalog hierarchy with usage counts, cached until the next catalog or config write."""
+    if kind not in CATALOG_TREES:
+        raise HTTPException(status_code=400, detail=f"Invalid kind. Use: {', '.join(CATALOG_TREES)}")
+    return cached_catalog_view(db, f"tree:{kind}", lambda: CATALOG_TREES[kind](db))
+
+
+def _display_names(model):
+    return lambda db: db.execute(select(model.id, model.display_name)).all()
+
+
+SUGGEST_NAMES = {
+    "cpu": _display_names(CPU),
+    "gpu": _display_names(GPU),
+    "motherboard": _display_names(Motherboard),
+    "ram": lambda db: [(row.id, row.name) for row in lookup_rows(db, RAM).values()],
+    "disk": lambda db: [(row.id, row.name) for row in lookup_rows(db, Disk).values()],
+    "os": lambda db: [(row.id, row.name) for row in lookup_rows(db, OS).values()],
+}
+
+
+def _suggest_index(db: Session, kind: str) -> PrefixIndex:
+    usage = _configs_by_component(db, kind)
+    return PrefixIndex([
+        Suggestion(component_id, name, len(usage.get(component_id, ())))
+        for component_id, name in SUGGEST_NAMES[kind](db)
+    ])
+
+
+@router.get("/suggest", response_model=list)
+def suggest_catalog(kind: str = "cpu", q: str = "", limit: int = 10, db: Session = Depends(get_db)):
+    """Typeahead over composed display names, most used first. The index is rebuilt after catalog writes."""
+    if kind not in SUGGEST_NAMES:
+        raise HTTPException(status_code=400, detail=f"Invalid kind. Use: {', '.join(SUGGEST_NAMES)}")
+    if limit < 1 or limit > SUGGEST_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {SUGGEST_MAX_LIMIT}")
+
+    index = cached_catalog_view(db, f"suggest:{kind}", lambda: _suggest_index(db, kind))
+    return [suggestion._asdict() for suggestion in index.search(q, limit)]
+
+
+MERGE_MODELS = {
+    "cpu": CPU,
+    "gpu": GPU,
+    "motherboard": Motherboard,
+    "ram": RAM,
+    "disk": Disk,
+    "os": OS,
+}
+
+
+def _rewrite_component_lists(db: Session, kind: str, survivor_id: int, victim_ids: list[int]) -> None:
+    """Point the JSON component lists of the affected configs at the survivor, one executemany UPDATE."""
+    list_column = getattr(Config, f"{kind}_component_ids")
+    affected = select(ConfigComponent.config_id).where(
+        ConfigComponent.kind == kind,
+        ConfigComponent.component_id.in_(victim_ids),
+    )
+    victims = set(victim_ids)
+    statement = select(Config.id, list_column).where(Config.id.in_(affected), list_column.is_not(None))
+    rows = []
+    for config_id, raw in db.execute(statement):
+        merged = [survivor_id if component_id in victims else component_id for component_id in component_ids(raw, None)]
+        rows.append({"config_id": config_id, "component_ids": json.dumps(merged, separators=(",", ":"))})
+    if rows:
+        db.execute(
+            update(Config.__table__)
+            .where(Config.__table__.c.id == bindparam("config_id"))
+            .values({list_column.key: bindparam("component_ids")}),
+            rows,
+        )
+
+
+@router.post("/merge", response_model=dict)
+def merge_catalog_entries(merge: CatalogMerge, db: Session = Depends(get_db)):
+    """
+    Fold duplicate CPUs, GPUs, motherboards, RAM, disks or OSes into one survivor:
+    every config reference moves to the survivor, then the victims are deleted.
+    """
+    model = MERGE_MODELS.get(merge.kind)
+    if model is None:
+        raise HTTPException(status_code=400, detail=f"Invalid kind. Use: {', '.join(MERGE_MODELS)}")
+    victim_ids = sorted(set(merge.victim_ids))
+    if not victim_ids:
+        raise HTTPException(status_code=400, detail="At least one victim ID is required")
+    if merge.survivor_id in victim_ids:
+        raise HTTPException(status_code=400, detail="The survivor cannot also be a victim")
+    require_references(db, [
+        (model, merge.survivor_id, "Invalid survivor"),
+        (model, victim_ids, "Invalid victim"),
+    ])
+
+    config_column, component_column, conditions = _component_reference_columns(merge.kind)
+    configs = db.execute(
+        select(func.count(func.distinct(config_column))).where(*conditions, component_column.in_(victim_ids))
+    ).scalar()
+    summary = {"kind": merge.kind, "survivor_id": merge.survivor_id, "configs": configs, "dry_run": merge.dry_run}
+    if merge.dry_run:
+        return {**summary, "deleted": 0}
+
+    if merge.kind in CONFIG_COMPONENT_COLUMNS:
+        column = CONFIG_COMPONENT_COLUMNS[merge.kind]
+        db.execute(
+            update(Config).where(column.in_(victim_ids)).values({column.key: merge.survivor_id}),
+            execution_options={"synchronize_session": False},
+        )
+    else:
+        _rewrite_component_lists(db, merge.kind, merge.survivor_id, victim_ids)
+        primary = getattr(Config, f"{merge.kind}_id")
+        db.execute(
+            update(Config).where(primary.in_(victim_ids)).values({primary.key: merge.survivor_id}),
+            execution_options={"synchronize_session": False},
+        )
+        db.execute(
+            update(ConfigComponent)
+            .where(ConfigComponent.kind == merge.kind, ConfigComponent.component_id.in_(victim_ids))
+            .values(component_id=merge.survivor_id),
+            execution_options={"synchronize_session": False},
+        )
+        refresh_config_display_names(db.connection(), Config.id.in_(
+            select(ConfigComponent.config_id).where(
+                ConfigComponent.kind == merge.kind,
+                ConfigComponent.component_id == merge.survivor_id,
+            )
+        ))
+    deleted = db.execute(
+        delete(model).where(model.id.in_(victim_ids)),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+
+    db.commit()
+    bump_catalog_generation(db.get_bind(), LOOKUP if model in LOOKUP_MODELS else COMPONENTS, USAGE)
+    return {**summary, "deleted": deleted}
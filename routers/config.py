@@ -1,10 +1,21 @@
 import json
 
 from fastapi import APIRouter, HTTPException, Depends, status
+from pydantic import BaseModel
+from sqlalchemy import delete, func, update
 from sqlmodel import Session, select
 from sqlalchemy.exc import IntegrityError
-from utils.helper import validate_and_normalize_name
-from models.config import Config
+from utils.helper import (
+    apply_expand,
+    apply_range_filter,
+    apply_sort,
+    expand_row,
+    list_rows,
+    parse_expand,
+    parse_fields,
+    validate_and_normalize_name,
+)
+from models.config import Config, ConfigComponent
 from models.ram import RAM
 from models.cpu import CPU
 from models.motherboard import Motherboard
@@ -13,9 +24,22 @@ from models.disk import Disk
 from models.oses import OS
 from models.benchmark_results import BenchmarkResult
 from database import get_db
+from utils.catalog_cache import USAGE, bump_catalog_generation
+from utils.db_write import commit_and_return, is_referenced, require_references
 
 router = APIRouter()
 
+# cpu and gpu embed every slot as a list, so multi-CPU/GPU configs are complete.
+CONFIG_EXPANSIONS = {
+    "cpu": (Config.cpu_slots, ConfigComponent.cpu),
+    "gpu": (Config.gpu_slots, ConfigComponent.gpu),
+    "motherboard": Config.motherboard,
+    "os": Config.os,
+    "ram": Config.ram,
+    "disk": Config.disk,
+    "results": Config.benchmark_results,
+}
+
 
 def _parse_component_ids(raw: str | None, fallback_id: int | None, fallback_quantity: int | None) -> list[int]:
     if raw:
@@ -42,7 +66,7 @@ def _parse_component_ids(raw: str | None, fallback_id: int | None, fallback_quan
     return [int(fallback_id)] * quantity
 
 
-def _normalize_component_lists(config: Config, db: Session):
+def _apply_component_lists(config: Config) -> tuple[list[int], list[int]]:
     cpu_ids = _parse_component_ids(config.cpu_component_ids, config.cpu_id, config.cpu_quantity)
     gpu_ids = _parse_component_ids(config.gpu_component_ids, config.gpu_id, config.gpu_quantity)
 
@@ -51,19 +75,30 @@ def _normalize_component_lists(config: Config, db: Session):
     if not gpu_ids:
         raise HTTPException(status_code=400, detail="At least one GPU is required")
 
-    for cpu_id in cpu_ids:
-        if db.get(CPU, cpu_id) is None:
-            raise HTTPException(status_code=400, detail="Invalid CPU")
-    for gpu_id in gpu_ids:
-        if db.get(GPU, gpu_id) is None:
-            raise HTTPException(status_code=400, detail="Invalid GPU")
-
     config.cpu_id = cpu_ids[0]
     config.gpu_id = gpu_ids[0]
     config.cpu_quantity = len(cpu_ids)
     config.gpu_quantity = len(gpu_ids)
     config.cpu_component_ids = json.dumps(cpu_ids, separators=(",", ":"))
     config.gpu_component_ids = json.dumps(gpu_ids, separators=(",", ":"))
+    return cpu_ids, gpu_ids
+
+
+def normalize_config_components(config: Config, db: Session):
+    """
+    Normalize the component lists and validate every hardware reference of the config,
+    including each CPU/GPU slot, with a single query regardless of the number of components.
+    """
+    cpu_ids, gpu_ids = _apply_component_lists(config)
+
+    require_references(db, [
+        (CPU, cpu_ids, "Invalid CPU"),
+        (GPU, gpu_ids, "Invalid GPU"),
+        (Motherboard, config.motherboard_id, "Invalid Motherboard"),
+        (Disk, config.disk_id, "Invalid Disk"),
+        (OS, config.os_id, "Invalid OS"),
+        (RAM, config.ram_id, "Invalid RAM"),
+    ])
 
 
 def _validate_component_quantities(config: Config):
@@ -77,47 +112,44 @@ def _validate_component_quantities(config: Config):
 def create_config(config: Config, db: Session = Depends(get_db)):
     try:
         config.name = validate_and_normalize_name(config.name, db, Config)
-        _normalize_component_lists(config, db)
-        _validate_component_quantities(config)
-
         # Validate FKs
-        if db.get(CPU, config.cpu_id) is None:
-            raise HTTPException(status_code=400, detail="Invalid CPU")
-
-        if db.get(Motherboard, config.motherboard_id) is None:
-            raise HTTPException(status_code=400, detail="Invalid Motherboard")
-
-        if db.get(GPU, config.gpu_id) is None:
-            raise HTTPException(status_code=400, detail="Invalid GPU")
-
-        if db.get(Disk, config.disk_id) is None:
-            raise HTTPException(status_code=400, detail="Invalid Disk")
-
-        if db.get(OS, config.os_id) is None:
-            raise HTTPException(status_code=400, detail="Invalid OS")
-
-        if db.get(RAM, config.ram_id) is None:
-            raise HTTPException(status_code=400, detail="Invalid RAM")
+        normalize_config_components(config, db)
+        _validate_component_quantities(config)
 
-        db.add(config)
-        db.commit()
-        db.refresh(config)
-        return config
+        return commit_and_return(db, config)
 
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="A configuration with this name already exists")
 
-@router.get("/", response_model=list[Config])
-def get_configs(db: Session = Depends(get_db)):
-    return db.exec(select(Config)).all()
-
-@router.get("/{config_id}", response_model=Config)
-def get_config(config_id: int, db: Session = Depends(get_db)):
-    config = db.get(Config, config_id)
+# No response_model: expanded responses embed related rows the table models do not declare.
+@router.get("/")
+def get_configs(
+    db: Session = Depends(get_db),
+    min_ram_bytes: int | None = None,
+    max_ram_bytes: int | None = None,
+    sort: str | None = None,
+    expand: str | None = None,
+    fields: str | None = None,
+):
+    expansions = parse_expand(expand, CONFIG_EXPANSIONS)
+    columns = parse_fields(fields, Config)
+    statement = apply_range_filter(select(Config), Config.ram_bytes, min_ram_bytes, max_ram_bytes)
+    statement = apply_sort(
+        statement,
+        sort,
+        {"id": Config.id, "name": Config.name, "ram_bytes": Config.ram_bytes},
+        Config.id,
+    )
+    return list_rows(db, statement, columns, expansions)
+
+@router.get("/{config_id}")
+def get_config(config_id: int, db: Session = Depends(get_db), expand: str | None = None):
+    expansions = parse_expand(expand, CONFIG_EXPANSIONS)
+    config = db.exec(apply_expand(select(Config).where(Config.id == config_id), expansions)).first()
     if config is None:
         raise HTTPException(status_code=404, detail="Config not found")
-    return config
+    return expand_row(config, expansions)
 
 @router.put("/{config_id}", response_model=Config)
 def update_config(config_id: int, config: Config, db: Session = Depends(get_db)):
@@ -126,22 +158,9 @@ def update_config(config_id: int, config: Config, db: Session = Depends(get_db))
         raise HTTPException(status_code=404, detail="Config not found")
 
     # Validate FKs
-    _normalize_component_lists(config, db)
+    normalize_config_components(config, db)
     _validate_component_quantities(config)
 
-    if db.get(CPU, config.cpu_id) is None:
-        raise HTTPException(status_code=400, detail="Invalid CPU")
-    if db.get(Motherboard, config.motherboard_id) is None:
-        raise HTTPException(status_code=400, detail="Invalid Motherboard")
-    if db.get(GPU, config.gpu_id) is None:
-        raise HTTPException(status_code=400, detail="Invalid GPU")
-    if db.get(Disk, config.disk_id) is None:
-        raise HTTPException(status_code=400, detail="Invalid Disk")
-    if db.get(OS, config.os_id) is None:
-        raise HTTPException(status_code=400, detail="Invalid OS")
-    if db.get(RAM, config.ram_id) is None:
-        raise HTTPException(status_code=400, detail="Invalid RAM")
-
     if hasattr(config, "name"):
         config.name = validate_and_normalize_name(config.name, db, Config, current_id=config_id)
 
@@ -185,20 +204,130 @@ def update_config(config_id: int, config: Config, db: Session = Depends(get_db))
     db_config.notes = config.notes
 
     try:
-        db.commit()
-        db.refresh(db_config)
-        return db_config
+        return commit_and_return(db, db_config)
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="A configuration with this name already exists")
 
+
+class ConfigSelection(BaseModel):
+    """Configs matched by a bulk operation; every given filter must match."""
+    ids: list[int] | None = None
+    cpu_id: int | None = None
+    gpu_id: int | None = None
+    motherboard_id: int | None = None
+    disk_id: int | None = None
+    os_id: int | None = None
+    ram_id: int | None = None
+    dry_run: bool = False
+
+
+class ConfigBulkUpdate(ConfigSelection):
+    set_motherboard_id: int | None = None
+    set_disk_id: int | None = None
+    set_os_id: int | None = None
+    set_ram_id: int | None = None
+
+
+def _config_selection_conditions(selection: ConfigSelection, db: Session) -> list:
+    conditions = []
+    if selection.ids is not None:
+        ids = set(selection.ids)
+        if not ids:
+            raise HTTPException(status_code=400, detail="ID list cannot be empty")
+        if len(db.exec(select(Config.id).where(Config.id.in_(ids))).all()) != len(ids):
+            raise HTTPException(status_code=404, detail="Config not found")
+        conditions.append(Config.id.in_(ids))
+    for kind, component_id in (("cpu", selection.cpu_id), ("gpu", selection.gpu_id)):
+        if component_id is not None:
+            conditions.append(Config.id.in_(
+                select(ConfigComponent.config_id).where(
+                    ConfigComponent.kind == kind,
+                    ConfigComponent.component_id == component_id,
+                )
+            ))
+    for column, value in (
+        (Config.motherboard_id, selection.motherboard_id),
+        (Config.disk_id, selection.disk_id),
+        (Config.os_id, selection.os_id),
+        (Config.ram_id, selection.ram_id),
+    ):
+        if value is not None:
+            conditions.append(column == value)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="At least one filter is required")
+    return conditions
+
+
+def _count_configs(conditions: list, db: Session) -> int:
+    return db.exec(select(func.count()).select_from(Config).where(*conditions)).one()
+
+
+@router.post("/bulk/update", response_model=dict)
+def update_configs_bulk(changes: ConfigBulkUpdate, db: Session = Depends(get_db)):
+    fields = (
+        ("motherboard_id", Motherboard, changes.set_motherboard_id, "Invalid Motherboard"),
+        ("disk_id", Disk, changes.set_disk_id, "Invalid Disk"),
+        ("os_id", OS, changes.set_os_id, "Invalid OS"),
+        ("ram_id", RAM, changes.set_ram_id, "Invalid RAM"),
+    )
+    values = {field: value for field, _model, value, _detail in fields if value is not None}
+    if not values:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+
+    conditions = _config_selection_conditions(changes, db)
+    require_references(db, [(model, value, detail) for _field, model, value, detail in fields if value is not None])
+    matched = _count_configs(conditions, db)
+    if changes.dry_run:
+        return {"matched": matched, "dry_run": True}
+
+    updated = db.exec(
+        update(Config).where(*conditions).values(**values).execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    bump_catalog_generation(db.get_bind(), USAGE)
+    return {"matched": matched, "updated": updated, "dry_run": False}
+
+
+@router.post("/bulk/delete", response_model=dict)
+def delete_configs_bulk(selection: ConfigSelection, db: Session = Depends(get_db)):
+    conditions = _config_selection_conditions(selection, db)
+    selected_ids = select(Config.id).where(*conditions)
+
+    referenced = db.exec(
+        select(BenchmarkResult.config_id).where(BenchmarkResult.config_id.in_(selected_ids)).distinct()
+    ).all()
+    if referenced:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                "Cannot delete configs "
+                + ", ".join(str(config_id) for config_id in sorted(referenced))
+                + " because they are referenced by one or more benchmark results."
+            )
+        )
+    matched = _count_configs(conditions, db)
+    if selection.dry_run:
+        return {"matched": matched, "dry_run": True}
+
+    db.exec(
+        delete(ConfigComponent)
+        .where(ConfigComponent.config_id.in_(selected_ids))
+        .execution_options(synchronize_session=False)
+    )
+    deleted = db.exec(delete(Config).where(*conditions).execution_options(synchronize_session=False)).rowcount
+    db.commit()
+    bump_catalog_generation(db.get_bind(), USAGE)
+    return {"matched": matched, "deleted": deleted, "dry_run": False}
+
+
 @router.delete("/{config_id}")
 def delete_config(config_id: int, db: Session = Depends(get_db)):
     config = db.get(Config, config_id)
     if config is None:
         raise HTTPException(status_code=404, detail="Config not found")
 
-    has_results = db.exec(select(BenchmarkResult).where(BenchmarkResult.config_id == config_id)).first()
+    has_results = is_referenced(db, BenchmarkResult.config_id == config_id)
     if has_results:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
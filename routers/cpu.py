@@ -1,22 +1,31 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
-from utils.helper import validate_and_normalize_name
-from utils.config_components import config_has_cpu
-from models.config import Config
+from utils.helper import (
+    apply_expand,
+    apply_range_filter,
+    apply_sort,
+    expand_row,
+    list_rows,
+    parse_expand,
+    parse_fields,
+    validate_and_normalize_name,
+)
+from models.config import ConfigComponent
 from models.cpu import CPU, CPUBrand, CPUFamily
 from database import get_db
+from utils.catalog_cache import get_lookup
+from utils.db_write import commit_and_return, is_referenced
 
 router = APIRouter()
 
+CPU_EXPANSIONS = {"brand": CPU.brand, "family": CPU.family}
+
 
 @router.post("/brand/", response_model=CPUBrand)
 def create_cpu_brand(cpu_brand: CPUBrand, db: Session = Depends(get_db)):
     cpu_brand.name = validate_and_normalize_name(cpu_brand.name, db, CPUBrand)
-    db.add(cpu_brand)
-    db.commit()
-    db.refresh(cpu_brand)
-    return cpu_brand
+    return commit_and_return(db, cpu_brand)
 
 
 @router.get("/brand/", response_model=list[CPUBrand])
@@ -40,9 +49,7 @@ def update_cpu_brand(brand_id: int, cpu_brand: CPUBrand, db: Session = Depends(g
 
     cpu_brand.name = validate_and_normalize_name(cpu_brand.name, db, CPUBrand, current_id=brand_id)
     db_brand.name = cpu_brand.name
-    db.commit()
-    db.refresh(db_brand)
-    return db_brand
+    return commit_and_return(db, db_brand)
 
 
 @router.delete("/brand/{brand_id}")
@@ -51,8 +58,8 @@ def delete_cpu_brand(brand_id: int, db: Session = Depends(get_db)):
     if not brand:
         raise HTTPException(status_code=404, detail="CPU brand not found")
 
-    has_family = db.exec(select(CPUFamily).where(CPUFamily.cpu_brand_id == brand_id)).first()
-    has_cpu = db.exec(select(CPU).where(CPU.cpu_brand_id == brand_id)).first()
+    has_family = is_referenced(db, CPUFamily.cpu_brand_id == brand_id)
+    has_cpu = is_referenced(db, CPU.cpu_brand_id == brand_id)
     if has_family or has_cpu:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -70,14 +77,11 @@ def delete_cpu_brand(brand_id: int, db: Session = Depends(get_db)):
 def create_cpu_family(cpu_family: CPUFamily, db: Session = Depends(get_db)):
     cpu_family.name = validate_and_normalize_name(cpu_family.name, db, CPUFamily)
 
-    brand = db.get(CPUBrand, cpu_family.cpu_brand_id)
+    brand = get_lookup(db, CPUBrand, cpu_family.cpu_brand_id)
     if not brand:
         raise HTTPException(status_code=400, detail="Invalid CPU brand")
 
-    db.add(cpu_family)
-    db.commit()
-    db.refresh(cpu_family)
-    return cpu_family
+    return commit_and_return(db, cpu_family)
 
 
 @router.get("/family/", response_model=list[CPUFamily])
@@ -102,15 +106,13 @@ def update_cpu_family(family_id: int, cpu_family: CPUFamily, db: Session = Depen
     cpu_family.name = validate_and_normalize_name(cpu_family.name, db, CPUFamily, current_id=family_id)
 
     if cpu_family.cpu_brand_id is not None and cpu_family.cpu_brand_id != db_family.cpu_brand_id:
-        if not db.get(CPUBrand, cpu_family.cpu_brand_id):
+        if not get_lookup(db, CPUBrand, cpu_family.cpu_brand_id):
             raise HTTPException(status_code=400, detail="Invalid CPU brand")
         db_family.cpu_brand_id = cpu_family.cpu_brand_id
 
     db_family.name = cpu_family.name
     try:
-        db.commit()
-        db.refresh(db_family)
-        return db_family
+        return commit_and_return(db, db_family)
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Family name already exists under this brand")
@@ -122,7 +124,7 @@ def delete_cpu_family(family_id: int, db: Session = Depends(get_db)):
     if not family:
         raise HTTPException(status_code=404, detail="CPU family not found")
 
-    has_cpu = db.exec(select(CPU).where(CPU.cpu_family_id == family_id)).first()
+    has_cpu = is_referenced(db, CPU.cpu_family_id == family_id)
     if has_cpu:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -138,33 +140,47 @@ def delete_cpu_family(family_id: int, db: Session = Depends(get_db)):
 
 @router.post("/", response_model=CPU)
 def create_cpu(cpu: CPU, db: Session = Depends(get_db)):
-    brand = db.get(CPUBrand, cpu.cpu_brand_id)
+    brand = get_lookup(db, CPUBrand, cpu.cpu_brand_id)
     if not brand:
         raise HTTPException(status_code=400, detail="Invalid CPU brand")
 
-    family = db.get(CPUFamily, cpu.cpu_family_id)
+    family = get_lookup(db, CPUFamily, cpu.cpu_family_id)
     if not family:
         raise HTTPException(status_code=400, detail="Invalid CPU family")
     if family.cpu_brand_id != cpu.cpu_brand_id:
         raise HTTPException(status_code=400, detail="CPU family does not belong to the specified brand")
 
-    db.add(cpu)
-    db.commit()
-    db.refresh(cpu)
-    return cpu
-
-
-@router.get("/", response_model=list[CPU])
-def get_cpus(db: Session = Depends(get_db)):
-    return db.exec(select(CPU)).all()
+    return commit_and_return(db, cpu)
+
+
+@router.get("/")
+def get_cpus(
+    db: Session = Depends(get_db),
+    min_speed_mhz: int | None = None,
+    max_speed_mhz: int | None = None,
+    sort: str | None = None,
+    expand: str | None = None,
+    fields: str | None = None,
+):
+    expansions = parse_expand(expand, CPU_EXPANSIONS)
+    columns = parse_fields(fields, CPU)
+    statement = apply_range_filter(select(CPU), CPU.speed_mhz, min_speed_mhz, max_speed_mhz)
+    statement = apply_sort(
+        statement,
+        sort,
+        {"id": CPU.id, "model": CPU.model, "speed_mhz": CPU.speed_mhz, "core_count": CPU.core_count},
+        CPU.id,
+    )
+    return list_rows(db, statement, columns, expansions)
 
 
-@router.get("/{cpu_id}", response_model=CPU)
-def get_cpu(cpu_id: int, db: Session = Depends(get_db)):
-    cpu = db.get(CPU, cpu_id)
+@router.get("/{cpu_id}")
+def get_cpu(cpu_id: int, db: Session = Depends(get_db), expand: str | None = None):
+    expansions = parse_expand(expand, CPU_EXPANSIONS)
+    cpu = db.exec(apply_expand(select(CPU).where(CPU.id == cpu_id), expansions)).first()
     if not cpu:
         raise HTTPException(status_code=404, detail="CPU not found")
-    return cpu
+    return expand_row(cpu, expansions)
 
 
 @router.put("/{cpu_id}", response_model=CPU)
@@ -174,12 +190,12 @@ def update_cpu(cpu_id: int, cpu: CPU, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="CPU not found")
 
     if cpu.cpu_brand_id is not None:
-        brand = db.get(CPUBrand, cpu.cpu_brand_id)
+        brand = get_lookup(db, CPUBrand, cpu.cpu_brand_id)
         if not brand:
             raise HTTPException(status_code=400, detail="Invalid CPU brand")
 
     if cpu.cpu_family_id is not None:
-        family = db.get(CPUFamily, cpu.cpu_family_id)
+        family = get_lookup(db, CPUFamily, cpu.cpu_family_id)
         if not family:
             raise HTTPException(status_code=400, detail="Invalid CPU family")
         # Determine the effective brand to validate the family binding
@@ -194,9 +210,7 @@ def update_cpu(cpu_id: int, cpu: CPU, db: Session = Depends(get_db)):
     db_cpu.cpu_brand_id = cpu.cpu_brand_id
     db_cpu.cpu_family_id = cpu.cpu_family_id
 
-    db.commit()
-    db.refresh(db_cpu)
-    return db_cpu
+    return commit_and_return(db, db_cpu)
 
 
 @router.delete("/{cpu_id}", status_code=status.HTTP_200_OK)
@@ -205,10 +219,7 @@ def delete_cpu(cpu_id: int, db: Session = Depends(get_db)):
     if not cpu:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CPU not found")
 
-    in_config = next(
-        (config for config in db.exec(select(Config)).all() if config_has_cpu(config, cpu_id)),
-        None,
-    )
+    in_config = is_referenced(db, ConfigComponent.kind == "cpu", ConfigComponent.component_id == cpu_id)
     if in_config:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
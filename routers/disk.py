@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlmodel import Session, select
-from utils.helper import validate_and_normalize_name
+from utils.helper import list_rows, parse_fields, validate_and_normalize_name
 from models.disk import Disk
 from models.config import Config
 from database import get_db
+from utils.db_write import commit_and_return, is_referenced
 
 router = APIRouter()
 
@@ -13,16 +14,12 @@ def create_disk(disk: Disk, db: Session = Depends(get_db)):
     if hasattr(disk, "name"):
         disk.name = validate_and_normalize_name(disk.name, db, Disk)
 
-    db.add(disk)
-    db.commit()
-    db.refresh(disk)
-    return disk
+    return commit_and_return(db, disk)
 
 
-@router.get("/", response_model=list[Disk])
-def get_disks(db: Session = Depends(get_db)):
-    disks = db.exec(select(Disk)).all()
-    return disks
+@router.get("/")
+def get_disks(db: Session = Depends(get_db), fields: str | None = None):
+    return list_rows(db, select(Disk), parse_fields(fields, Disk))
 
 
 @router.get("/{disk_id}", response_model=Disk)
@@ -44,9 +41,7 @@ def update_disk(disk_id: int, disk: Disk, db: Session = Depends(get_db)):
 
     db_disk.name = disk.name
 
-    db.commit()
-    db.refresh(db_disk)
-    return db_disk
+    return commit_and_return(db, db_disk)
 
 
 @router.delete("/{disk_id}")
@@ -55,7 +50,7 @@ def delete_disk(disk_id: int, db: Session = Depends(get_db)):
     if disk is None:
         raise HTTPException(status_code=404, detail="Disk not found")
 
-    in_config = db.exec(select(Config).where(Config.disk_id == disk_id)).first()
+    in_config = is_referenced(db, Config.disk_id == disk_id)
     if in_config:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -1,21 +1,35 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlmodel import Session, select
-from utils.helper import validate_and_normalize_name
-from utils.config_components import config_has_gpu
+from utils.helper import (
+    apply_expand,
+    apply_range_filter,
+    apply_sort,
+    expand_row,
+    list_rows,
+    parse_expand,
+    parse_fields,
+    validate_and_normalize_name,
+)
 from models.gpu import GPU, GPUManufacturer, GPUBrand, GPUModel, GPUVRAMType
-from models.config import Config
+from models.config import ConfigComponent
 from database import get_db
+from utils.catalog_cache import get_lookup
+from utils.db_write import commit_and_return, is_referenced, require_references
 
 router = APIRouter()
 
+GPU_EXPANSIONS = {
+    "manufacturer": GPU.manufacturer,
+    "brand": GPU.brand,
+    "model": GPU.model,
+    "vram_type": GPU.vram_type,
+}
+
 
 @router.post("/manufacturer/", response_model=GPUManufacturer)
 def create_gpu_manufacturer(gpu_manufacturer: GPUManufacturer, db: Session = Depends(get_db)):
     gpu_manufacturer.name = validate_and_normalize_name(gpu_manufacturer.name, db, GPUManufacturer)
-    db.add(gpu_manufacturer)
-    db.commit()
-    db.refresh(gpu_manufacturer)
-    return gpu_manufacturer
+    return commit_and_return(db, gpu_manufacturer)
 
 
 @router.get("/manufacturer/", response_model=list[GPUManufacturer])
@@ -41,9 +55,7 @@ def update_gpu_manufacturer(manufacturer_id: int, gpu_manufacturer: GPUManufactu
         gpu_manufacturer.name, db, GPUManufacturer, current_id=manufacturer_id
     )
     m.name = gpu_manufacturer.name
-    db.commit()
-    db.refresh(m)
-    return m
+    return commit_and_return(db, m)
 
 
 @router.delete("/manufacturer/{manufacturer_id}")
@@ -52,7 +64,7 @@ def delete_gpu_manufacturer(manufacturer_id: int, db: Session = Depends(get_db))
     if not m:
         raise HTTPException(status_code=404, detail="GPU manufacturer not found")
 
-    has_gpu = db.exec(select(GPU).where(GPU.gpu_manufacturer_id == manufacturer_id)).first()
+    has_gpu = is_referenced(db, GPU.gpu_manufacturer_id == manufacturer_id)
     if has_gpu:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -68,10 +80,7 @@ def delete_gpu_manufacturer(manufacturer_id: int, db: Session = Depends(get_db))
 @router.post("/brand/", response_model=GPUBrand)
 def create_gpu_brand(gpu_brand: GPUBrand, db: Session = Depends(get_db)):
     gpu_brand.name = validate_and_normalize_name(gpu_brand.name, db, GPUBrand)
-    db.add(gpu_brand)
-    db.commit()
-    db.refresh(gpu_brand)
-    return gpu_brand
+    return commit_and_return(db, gpu_brand)
 
 
 @router.get("/brand/", response_model=list[GPUBrand])
@@ -95,9 +104,7 @@ def update_gpu_brand(brand_id: int, gpu_brand: GPUBrand, db: Session = Depends(g
 
     gpu_brand.name = validate_and_normalize_name(gpu_brand.name, db, GPUBrand, current_id=brand_id)
     b.name = gpu_brand.name
-    db.commit()
-    db.refresh(b)
-    return b
+    return commit_and_return(db, b)
 
 
 @router.delete("/brand/{brand_id}")
@@ -106,8 +113,8 @@ def delete_gpu_brand(brand_id: int, db: Session = Depends(get_db)):
     if not b:
         raise HTTPException(status_code=404, detail="GPU brand not found")
 
-    has_model = db.exec(select(GPUModel).where(GPUModel.gpu_brand_id == brand_id)).first()
-    has_gpu = db.exec(select(GPU).where(GPU.gpu_brand_id == brand_id)).first()
+    has_model = is_referenced(db, GPUModel.gpu_brand_id == brand_id)
+    has_gpu = is_referenced(db, GPU.gpu_brand_id == brand_id)
     if has_model or has_gpu:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -124,13 +131,10 @@ def delete_gpu_brand(brand_id: int, db: Session = Depends(get_db)):
 def create_gpu_model(gpu_model: GPUModel, db: Session = Depends(get_db)):
     gpu_model.name = validate_and_normalize_name(gpu_model.name, db, GPUModel)
 
-    if not db.get(GPUBrand, gpu_model.gpu_brand_id):
+    if not get_lookup(db, GPUBrand, gpu_model.gpu_brand_id):
         raise HTTPException(status_code=400, detail="Invalid GPU brand")
 
-    db.add(gpu_model)
-    db.commit()
-    db.refresh(gpu_model)
-    return gpu_model
+    return commit_and_return(db, gpu_model)
 
 
 @router.get("/model/", response_model=list[GPUModel])
@@ -155,14 +159,12 @@ def update_gpu_model(model_id: int, gpu_model: GPUModel, db: Session = Depends(g
     gpu_model.name = validate_and_normalize_name(gpu_model.name, db, GPUModel, current_id=model_id)
 
     if gpu_model.gpu_brand_id is not None and gpu_model.gpu_brand_id != m.gpu_brand_id:
-        if not db.get(GPUBrand, gpu_model.gpu_brand_id):
+        if not get_lookup(db, GPUBrand, gpu_model.gpu_brand_id):
             raise HTTPException(status_code=400, detail="Invalid GPU brand")
         m.gpu_brand_id = gpu_model.gpu_brand_id
 
     m.name = gpu_model.name
-    db.commit()
-    db.refresh(m)
-    return m
+    return commit_and_return(db, m)
 
 
 @router.delete("/model/{model_id}")
@@ -171,7 +173,7 @@ def delete_gpu_model(model_id: int, db: Session = Depends(get_db)):
     if not m:
         raise HTTPException(status_code=404, detail="GPU model not found")
 
-    has_gpu = db.exec(select(GPU).where(GPU.gpu_model_id == model_id)).first()
+    has_gpu = is_referenced(db, GPU.gpu_model_id == model_id)
     if has_gpu:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Cannot delete model with existing GPUs.")
 
@@ -184,10 +186,7 @@ def delete_gpu_model(model_id: int, db: Session = Depends(get_db)):
 @router.post("/vram_type/", response_model=GPUVRAMType)
 def create_gpu_vram_type(gpu_vram_type: GPUVRAMType, db: Session = Depends(get_db)):
     gpu_vram_type.name = validate_and_normalize_name(gpu_vram_type.name, db, GPUVRAMType)
-    db.add(gpu_vram_type)
-    db.commit()
-    db.refresh(gpu_vram_type)
-    return gpu_vram_type
+    return commit_and_return(db, gpu_vram_type)
 
 
 @router.get("/vram_type/", response_model=list[GPUVRAMType])
@@ -211,9 +210,7 @@ def update_gpu_vram_type(vram_type_id: int, gpu_vram_type: GPUVRAMType, db: Sess
 
     gpu_vram_type.name = validate_and_normalize_name(gpu_vram_type.name, db, GPUVRAMType, current_id=vram_type_id)
     vt.name = gpu_vram_type.name
-    db.commit()
-    db.refresh(vt)
-    return vt
+    return commit_and_return(db, vt)
 
 
 @router.delete("/vram_type/{vram_type_id}")
@@ -222,7 +219,7 @@ def delete_gpu_vram_type(vram_type_id: int, db: Session = Depends(get_db)):
     if not vt:
         raise HTTPException(status_code=404, detail="GPU VRAM type not found")
 
-    has_gpu = db.exec(select(GPU).where(GPU.gpu_vram_type_id == vram_type_id)).first()
+    has_gpu = is_referenced(db, GPU.gpu_vram_type_id == vram_type_id)
     if has_gpu:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Cannot delete VRAM type with existing GPUs.")
 
@@ -234,39 +231,45 @@ def delete_gpu_vram_type(vram_type_id: int, db: Session = Depends(get_db)):
 
 @router.post("/", response_model=GPU)
 def create_gpu(gpu: GPU, db: Session = Depends(get_db)):
-    if gpu.gpu_manufacturer_id is not None and not db.get(GPUManufacturer, gpu.gpu_manufacturer_id):
-        raise HTTPException(status_code=400, detail="Invalid GPU manufacturer")
-
-    brand = db.get(GPUBrand, gpu.gpu_brand_id)
-    if not brand:
-        raise HTTPException(status_code=400, detail="Invalid GPU brand")
+    references = []
+    if gpu.gpu_manufacturer_id is not None:
+        references.append((GPUManufacturer, gpu.gpu_manufacturer_id, "Invalid GPU manufacturer"))
+    references.append((GPUBrand, gpu.gpu_brand_id, "Invalid GPU brand"))
+    references.append((GPUVRAMType, gpu.gpu_vram_type_id, "Invalid GPU VRAM type"))
+    require_references(db, references)
 
-    model = db.get(GPUModel, gpu.gpu_model_id)
+    model = get_lookup(db, GPUModel, gpu.gpu_model_id)
     if not model:
         raise HTTPException(status_code=400, detail="Invalid GPU model")
     if model.gpu_brand_id != gpu.gpu_brand_id:
         raise HTTPException(status_code=400, detail="GPU model does not belong to the specified brand")
 
-    if not db.get(GPUVRAMType, gpu.gpu_vram_type_id):
-        raise HTTPException(status_code=400, detail="Invalid GPU VRAM type")
-
-    db.add(gpu)
-    db.commit()
-    db.refresh(gpu)
-    return gpu
-
-
-@router.get("/", response_model=list[GPU])
-def get_gpus(db: Session = Depends(get_db)):
-    return db.exec(select(GPU)).all()
-
-
-@router.get("/{gpu_id}", response_model=GPU)
-def get_gpu(gpu_id: int, db: Session = Depends(get_db)):
-    g = db.get(GPU, gpu_id)
+    return commit_and_return(db, gpu)
+
+
+@router.get("/")
+def get_gpus(
+    db: Session = Depends(get_db),
+    min_vram_bytes: int | None = None,
+    max_vram_bytes: int | None = None,
+    sort: str | None = None,
+    expand: str | None = None,
+    fields: str | None = None,
+):
+    expansions = parse_expand(expand, GPU_EXPANSIONS)
+    columns = parse_fields(fields, GPU)
+    statement = apply_range_filter(select(GPU), GPU.vram_bytes, min_vram_bytes, max_vram_bytes)
+    statement = apply_sort(statement, sort, {"id": GPU.id, "vram_bytes": GPU.vram_bytes}, GPU.id)
+    return list_rows(db, statement, columns, expansions)
+
+
+@router.get("/{gpu_id}")
+def get_gpu(gpu_id: int, db: Session = Depends(get_db), expand: str | None = None):
+    expansions = parse_expand(expand, GPU_EXPANSIONS)
+    g = db.exec(apply_expand(select(GPU).where(GPU.id == gpu_id), expansions)).first()
     if not g:
         raise HTTPException(status_code=404, detail="GPU not found")
-    return g
+    return expand_row(g, expansions)
 
 
 @router.put("/{gpu_id}", response_model=GPU)
@@ -275,16 +278,17 @@ def update_gpu(gpu_id: int, gpu: GPU, db: Session = Depends(get_db)):
     if not db_gpu:
         raise HTTPException(status_code=404, detail="GPU not found")
 
+    references = []
     if gpu.gpu_manufacturer_id is not None:
-        if not db.get(GPUManufacturer, gpu.gpu_manufacturer_id):
-            raise HTTPException(status_code=400, detail="Invalid GPU manufacturer")
-
+        references.append((GPUManufacturer, gpu.gpu_manufacturer_id, "Invalid GPU manufacturer"))
     if gpu.gpu_brand_id is not None:
-        if not db.get(GPUBrand, gpu.gpu_brand_id):
-            raise HTTPException(status_code=400, detail="Invalid GPU brand")
+        references.append((GPUBrand, gpu.gpu_brand_id, "Invalid GPU brand"))
+    if gpu.gpu_vram_type_id is not None:
+        references.append((GPUVRAMType, gpu.gpu_vram_type_id, "Invalid GPU VRAM type"))
+    require_references(db, references)
 
     if gpu.gpu_model_id is not None:
-        model = db.get(GPUModel, gpu.gpu_model_id)
+        model = get_lookup(db, GPUModel, gpu.gpu_model_id)
         if not model:
             raise HTTPException(status_code=400, detail="Invalid GPU model")
 
@@ -292,10 +296,6 @@ def update_gpu(gpu_id: int, gpu: GPU, db: Session = Depends(get_db)):
         if model.gpu_brand_id != effective_brand_id:
             raise HTTPException(status_code=400, detail="GPU model does not belong to the specified brand")
 
-    if gpu.gpu_vram_type_id is not None:
-        if not db.get(GPUVRAMType, gpu.gpu_vram_type_id):
-            raise HTTPException(status_code=400, detail="Invalid GPU VRAM type")
-
     db_gpu.vram_size = gpu.vram_size
     db_gpu.serial = gpu.serial
     db_gpu.gpu_manufacturer_id = gpu.gpu_manufacturer_id
@@ -303,9 +303,7 @@ def update_gpu(gpu_id: int, gpu: GPU, db: Session = Depends(get_db)):
     db_gpu.gpu_model_id = gpu.gpu_model_id
     db_gpu.gpu_vram_type_id = gpu.gpu_vram_type_id
 
-    db.commit()
-    db.refresh(db_gpu)
-    return db_gpu
+    return commit_and_return(db, db_gpu)
 
 
 @router.delete("/{gpu_id}")
@@ -314,10 +312,7 @@ def delete_gpu(gpu_id: int, db: Session = Depends(get_db)):
     if not g:
         raise HTTPException(status_code=404, detail="GPU not found")
 
-    in_config = next(
-        (config for config in db.exec(select(Config)).all() if config_has_gpu(config, gpu_id)),
-        None,
-    )
+    in_config = is_referenced(db, ConfigComponent.kind == "gpu", ConfigComponent.component_id == gpu_id)
     if in_config:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -1,20 +1,20 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlmodel import Session, select
-from utils.helper import validate_and_normalize_name
+from utils.helper import apply_expand, expand_row, list_rows, parse_expand, parse_fields, validate_and_normalize_name
 from models.motherboard import MotherboardManufacturer, MotherboardChipset, Motherboard
 from models.config import Config
 from database import get_db
+from utils.db_write import commit_and_return, is_referenced, require_references
 
 router = APIRouter()
 
+MOTHERBOARD_EXPANSIONS = {"manufacturer": Motherboard.manufacturer, "chipset": Motherboard.chipset}
+
 
 @router.post("/manufacturer/", response_model=MotherboardManufacturer)
 def create_manufacturer(manufacturer: MotherboardManufacturer, db: Session = Depends(get_db)):
     manufacturer.name = validate_and_normalize_name(manufacturer.name, db, MotherboardManufacturer)
-    db.add(manufacturer)
-    db.commit()
-    db.refresh(manufacturer)
-    return manufacturer
+    return commit_and_return(db, manufacturer)
 
 
 @router.get("/manufacturer/", response_model=list[MotherboardManufacturer])
@@ -40,9 +40,7 @@ def update_manufacturer(manufacturer_id: int, manufacturer: MotherboardManufactu
         manufacturer.name, db, MotherboardManufacturer, current_id=manufacturer_id
     )
     db_m.name = manufacturer.name
-    db.commit()
-    db.refresh(db_m)
-    return db_m
+    return commit_and_return(db, db_m)
 
 
 @router.delete("/manufacturer/{manufacturer_id}")
@@ -51,7 +49,7 @@ def delete_manufacturer(manufacturer_id: int, db: Session = Depends(get_db)):
     if not m:
         raise HTTPException(status_code=404, detail="Motherboard manufacturer not found")
 
-    has_board = db.exec(select(Motherboard).where(Motherboard.manufacturer_id == manufacturer_id)).first()
+    has_board = is_referenced(db, Motherboard.manufacturer_id == manufacturer_id)
     if has_board:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -67,10 +65,7 @@ def delete_manufacturer(manufacturer_id: int, db: Session = Depends(get_db)):
 @router.post("/chipset/", response_model=MotherboardChipset)
 def create_chipset(chipset: MotherboardChipset, db: Session = Depends(get_db)):
     chipset.name = validate_and_normalize_name(chipset.name, db, MotherboardChipset)
-    db.add(chipset)
-    db.commit()
-    db.refresh(chipset)
-    return chipset
+    return commit_and_return(db, chipset)
 
 
 @router.get("/chipset/", response_model=list[MotherboardChipset])
@@ -94,9 +89,7 @@ def update_chipset(chipset_id: int, chipset: MotherboardChipset, db: Session = D
 
     chipset.name = validate_and_normalize_name(chipset.name, db, MotherboardChipset, current_id=chipset_id)
     db_c.name = chipset.name
-    db.commit()
-    db.refresh(db_c)
-    return db_c
+    return commit_and_return(db, db_c)
 
 
 @router.delete("/chipset/{chipset_id}")
@@ -105,7 +98,7 @@ def delete_chipset(chipset_id: int, db: Session = Depends(get_db)):
     if not c:
         raise HTTPException(status_code=404, detail="Motherboard chipset not found")
 
-    has_board = db.exec(select(Motherboard).where(Motherboard.chipset_id == chipset_id)).first()
+    has_board = is_referenced(db, Motherboard.chipset_id == chipset_id)
     if has_board:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -121,28 +114,27 @@ def delete_chipset(chipset_id: int, db: Session = Depends(get_db)):
 @router.post("/", response_model=Motherboard)
 def create_motherboard(board: Motherboard, db: Session = Depends(get_db)):
     # Validate FKs
-    if not db.get(MotherboardManufacturer, board.manufacturer_id):
-        raise HTTPException(status_code=400, detail="Invalid motherboard manufacturer")
-    if not db.get(MotherboardChipset, board.chipset_id):
-        raise HTTPException(status_code=400, detail="Invalid motherboard chipset")
+    require_references(db, [
+        (MotherboardManufacturer, board.manufacturer_id, "Invalid motherboard manufacturer"),
+        (MotherboardChipset, board.chipset_id, "Invalid motherboard chipset"),
+    ])
 
-    db.add(board)
-    db.commit()
-    db.refresh(board)
-    return board
+    return commit_and_return(db, board)
 
 
-@router.get("/", response_model=list[Motherboard])
-def get_motherboards(db: Session = Depends(get_db)):
-    return db.exec(select(Motherboard)).all()
+@router.get("/")
+def get_motherboards(db: Session = Depends(get_db), expand: str | None = None, fields: str | None = None):
+    expansions = parse_expand(expand, MOTHERBOARD_EXPANSIONS)
+    return list_rows(db, select(Motherboard), parse_fields(fields, Motherboard), expansions)
 
 
-@router.get("/{board_id}", response_model=Motherboard)
-def get_motherboard(board_id: int, db: Session = Depends(get_db)):
-    b = db.get(Motherboard, board_id)
+@router.get("/{board_id}")
+def get_motherboard(board_id: int, db: Session = Depends(get_db), expand: str | None = None):
+    expansions = parse_expand(expand, MOTHERBOARD_EXPANSIONS)
+    b = db.exec(apply_expand(select(Motherboard).where(Motherboard.id == board_id), expansions)).first()
     if not b:
         raise HTTPException(status_code=404, detail="Motherboard not found")
-    return b
+    return expand_row(b, expansions)
 
 
 @router.put("/{board_id}", response_model=Motherboard)
@@ -151,23 +143,23 @@ def update_motherboard(board_id: int, board: Motherboard, db: Session = Depends(
     if not db_b:
         raise HTTPException(status_code=404, detail="Motherboard not found")
 
+    references = []
     if board.manufacturer_id is not None:
-        if not db.get(MotherboardManufacturer, board.manufacturer_id):
-            raise HTTPException(status_code=400, detail="Invalid motherboard manufacturer")
-        db_b.manufacturer_id = board.manufacturer_id
+        references.append((MotherboardManufacturer, board.manufacturer_id, "Invalid motherboard manufacturer"))
+    if board.chipset_id is not None:
+        references.append((MotherboardChipset, board.chipset_id, "Invalid motherboard chipset"))
+    require_references(db, references)
 
+    if board.manufacturer_id is not None:
+        db_b.manufacturer_id = board.manufacturer_id
     if board.chipset_id is not None:
-        if not db.get(MotherboardChipset, board.chipset_id):
-            raise HTTPException(status_code=400, detail="Invalid motherboard chipset")
         db_b.chipset_id = board.chipset_id
 
     db_b.model = board.model
     db_b.serial = board.serial
     db_b.notes = board.notes
 
-    db.commit()
-    db.refresh(db_b)
-    return db_b
+    return commit_and_return(db, db_b)
 
 
 @router.delete("/{board_id}")
@@ -176,7 +168,7 @@ def delete_motherboard(board_id: int, db: Session = Depends(get_db)):
     if not b:
         raise HTTPException(status_code=404, detail="Motherboard not found")
 
-    in_config = db.exec(select(Config).where(Config.motherboard_id == board_id)).first()
+    in_config = is_referenced(db, Config.motherboard_id == board_id)
     if in_config:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlmodel import Session, select
-from utils.helper import validate_and_normalize_name
+from utils.helper import list_rows, parse_fields, validate_and_normalize_name
 from models.oses import OS
 from models.config import Config
 from database import get_db
+from utils.db_write import commit_and_return, is_referenced
 
 router = APIRouter()
 
@@ -11,16 +12,12 @@ router = APIRouter()
 @router.post("/", response_model=OS)
 def create_os(os: OS, db: Session = Depends(get_db)):
     os.name = validate_and_normalize_name(os.name, db, OS)
-    db.add(os)
-    db.commit()
-    db.refresh(os)
-    return os
+    return commit_and_return(db, os)
 
 
-@router.get("/", response_model=list[OS])
-def get_oses(db: Session = Depends(get_db)):
-    oses = db.exec(select(OS)).all()
-    return oses
+@router.get("/")
+def get_oses(db: Session = Depends(get_db), fields: str | None = None):
+    return list_rows(db, select(OS), parse_fields(fields, OS))
 
 
 @router.get("/{os_id}", response_model=OS)
@@ -38,9 +35,7 @@ def update_os(os_id: int, os: OS, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="OS not found")
     os.name = validate_and_normalize_name(os.name, db, OS, current_id=os_id)
     db_os.name = os.name
-    db.commit()
-    db.refresh(db_os)
-    return db_os
+    return commit_and_return(db, db_os)
 
 
 @router.delete("/{os_id}")
@@ -49,7 +44,7 @@ def delete_os(os_id: int, db: Session = Depends(get_db)):
     if os is None:
         raise HTTPException(status_code=404, detail="OS not found")
 
-    in_config = db.exec(select(Config).where(Config.os_id == os_id)).first()
+    in_config = is_referenced(db, Config.os_id == os_id)
     if in_config:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
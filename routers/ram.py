@@ -3,21 +3,19 @@ from sqlmodel import Session, select
 from models.ram import RAM
 from models.config import Config
 from database import get_db
-from utils.helper import validate_and_normalize_name
+from utils.helper import list_rows, parse_fields, validate_and_normalize_name
+from utils.db_write import commit_and_return, is_referenced
 
 router = APIRouter()
 
 @router.post("/", response_model=RAM)
 def create_ram(ram: RAM, db: Session = Depends(get_db)):
     ram.name = validate_and_normalize_name(ram.name, db, RAM)
-    db.add(ram)
-    db.commit()
-    db.refresh(ram)
-    return ram
+    return commit_and_return(db, ram)
 
-@router.get("/", response_model=list[RAM])
-def get_rams(db: Session = Depends(get_db)):
-    return db.exec(select(RAM)).all()
+@router.get("/")
+def get_rams(db: Session = Depends(get_db), fields: str | None = None):
+    return list_rows(db, select(RAM), parse_fields(fields, RAM))
 
 @router.get("/{ram_id}", response_model=RAM)
 def get_ram(ram_id: int, db: Session = Depends(get_db)):
@@ -33,9 +31,7 @@ def update_ram(ram_id: int, ram: RAM, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="RAM not found")
     ram.name = validate_and_normalize_name(ram.name, db, RAM, current_id=ram_id)
     r.name = ram.name
-    db.commit()
-    db.refresh(r)
-    return r
+    return commit_and_return(db, r)
 
 @router.delete("/{ram_id}")
 def delete_ram(ram_id: int, db: Session = Depends(get_db)):
@@ -43,7 +39,7 @@ def delete_ram(ram_id: int, db: Session = Depends(get_db)):
     if not r:
         raise HTTPException(status_code=404, detail="RAM not found")
 
-    in_config = db.exec(select(Config).where(Config.ram_id == ram_id)).first()
+    in_config = is_referenced(db, Config.ram_id == ram_id)
     if in_config:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
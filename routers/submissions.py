@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from models.config import Config
+from routers.benchmark_results import BULK_MAX_RESULTS
+from routers.config import normalize_config_components
+from database import get_db
+from utils.db_write import commit_and_return
+from utils.helper import validate_and_normalize_name
+from utils.result_ingest import ingest_results
+
+router = APIRouter()
+
+class SubmissionResult(BaseModel):
+    benchmark_id: int
+    result: float
+    option_values: str | dict | None = None
+    settings: str | None = None
+    timestamp: str | None = None
+    notes: str | None = None
+
+
+class Submission(BaseModel):
+    config: Config
+    results: list[SubmissionResult] = []
+
+
+@router.post("/", response_model=dict)
+def create_submission(submission: Submission, db: Session = Depends(get_db)):
+    """Create a config and all of its results in one transaction; any invalid part rejects the whole submission."""
+    if len(submission.results) > BULK_MAX_RESULTS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_RESULTS} results can be submitted at once")
+
+    config = Config.model_validate(submission.config.model_dump(exclude={"id"}))
+    config.name = validate_and_normalize_name(config.name, db, Config)
+    normalize_config_components(config, db)
+
+    try:
+        db.add(config)
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="A configuration with this name already exists")
+
+    created, duplicates, errors = ingest_results(db, [
+        {**result.model_dump(), "config_id": config.id} for result in submission.results
+    ])
+    if errors:
+        db.rollback()
+        raise HTTPException(status_code=400, detail={"message": "Invalid results", "errors": errors})
+    commit_and_return(db, config)
+
+    return {"config": config, "created": created, "duplicates": duplicates}
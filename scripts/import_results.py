@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Stream benchmark results from a CSV or NDJSON file into Benchmarkinator."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlmodel import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from database import engine, init_db
+from utils.result_import import detect_format, import_results, iter_import_rows
+
+
+def read_checkpoint(path: Path | None) -> int:
+    if path is None or not path.exists():
+        return 0
+    value = path.read_text(encoding="utf-8").strip()
+    return int(value) if value.isdigit() else 0
+
+
+def write_checkpoint(path: Path | None, next_row: int) -> None:
+    if path is not None:
+        path.write_text(f"{next_row}\n", encoding="utf-8")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import benchmark results from CSV or NDJSON.")
+    parser.add_argument("path", type=Path, help="CSV or NDJSON file to import.")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="File format (default: from the file extension).")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per committed chunk.")
+    parser.add_argument("--start-row", type=int, help="Skip data rows before this index.")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="File storing the next row to import; read on start and updated after every chunk.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    file_format = detect_format(args.path.name, args.format)
+    start_row = args.start_row if args.start_row is not None else read_checkpoint(args.checkpoint)
+
+    def report(summary: dict) -> None:
+        write_checkpoint(args.checkpoint, summary["next_row"])
+        print(
+            f"[import] rows {summary['next_row']}: "
+            f"{summary['created']} created, {summary['failed']} failed",
+            flush=True,
+        )
+
+    init_db()
+    with Session(engine) as session, args.path.open("rb") as stream:
+        summary = import_results(
+            session,
+            iter_import_rows(stream, file_format),
+            chunk_size=args.chunk_size,
+            start_row=start_row,
+            progress=report,
+        )
+
+    for error in summary["errors"]:
+        print(f"  row {error['row']}: {error['detail']}")
+    if summary["failed"] > len(summary["errors"]):
+        print(f"  ... {summary['failed'] - len(summary['errors'])} more errors not shown")
+
+    if summary["aborted"]:
+        print(f"[import] Aborted: {summary['aborted']}")
+        print(f"[import] Resume with --start-row {summary['next_row']}")
+        return 1
+
+    print(f"[import] Done: {summary['created']} created, {summary['failed']} failed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
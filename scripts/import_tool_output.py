@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Parse benchmark tool output files (SuperPi, Quake, 3DMark, CrystalDiskMark) into Benchmarkinator results."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlmodel import Session, select
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from database import engine, init_db
+from models.config import Config
+from utils.tool_output import TOOL_PARSERS, ingest_tool_output, iter_tool_files, parse_tool_files
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import raw benchmark tool output for one config.")
+    parser.add_argument("paths", nargs="+", type=Path, help="Files or directories with tool output.")
+    parser.add_argument("--config", required=True, help="Config name or ID the results belong to.")
+    parser.add_argument("--tool", choices=sorted(TOOL_PARSERS), help="Parser to use (default: detect per file).")
+    parser.add_argument("--workers", type=int, default=4, help="Files parsed in parallel.")
+    return parser.parse_args()
+
+
+def resolve_config(session: Session, value: str) -> Config | None:
+    if value.isdigit():
+        return session.get(Config, int(value))
+    return session.exec(select(Config).where(Config.name == value)).first()
+
+
+def main() -> int:
+    args = parse_args()
+
+    init_db()
+    with Session(engine) as session:
+        config = resolve_config(session, args.config)
+        if config is None:
+            print(f"[tool-import] Unknown config '{args.config}'")
+            return 1
+
+        parsed = parse_tool_files(iter_tool_files(args.paths), args.tool, args.workers)
+        summary = ingest_tool_output(session, config.id, parsed)
+
+    for error in summary["errors"]:
+        print(f"  {error['file']}: {error['detail']}")
+    print(
+        f"[tool-import] {summary['files']} files, {summary['parsed']} results parsed: "
+        f"{summary['created']} created, {summary['duplicates']} duplicates, {summary['failed']} failed"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
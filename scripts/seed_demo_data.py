@@ -18,7 +18,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from database import engine, init_db
 from models.benchmark import Benchmark, BenchmarkTarget
-from models.benchmark_results import BenchmarkResult
+from models.benchmark_results import BenchmarkResult, BenchmarkResultOption
 from models.config import Config
 from models.cpu import CPU, CPUBrand, CPUFamily
 from models.disk import Disk
@@ -26,6 +26,7 @@ from models.gpu import GPU, GPUBrand, GPUManufacturer, GPUModel, GPUVRAMType
 from models.motherboard import Motherboard, MotherboardChipset, MotherboardManufacturer
 from models.oses import OS
 from models.ram import RAM
+from utils.result_settings import settings_key
 
 DEMO_PREFIX = "Demo - "
 DEMO_SERIAL_PREFIX = "DEMO-"
@@ -133,17 +134,23 @@ def get_or_create(session: Session, model, defaults: dict | None = None, **looku
     return item
 
 
+def delete_results(session: Session, condition) -> None:
+    result_ids = select(BenchmarkResult.id).where(condition)
+    session.exec(delete(BenchmarkResultOption).where(BenchmarkResultOption.result_id.in_(result_ids)))
+    session.exec(delete(BenchmarkResult).where(condition))
+
+
 def reset_demo_data(session: Session) -> None:
     demo_configs = session.exec(select(Config).where(Config.name.startswith(DEMO_PREFIX))).all()
     demo_config_ids = [config.id for config in demo_configs if config.id is not None]
     if demo_config_ids:
-        session.exec(delete(BenchmarkResult).where(BenchmarkResult.config_id.in_(demo_config_ids)))
+        delete_results(session, BenchmarkResult.config_id.in_(demo_config_ids))
         session.exec(delete(Config).where(Config.id.in_(demo_config_ids)))
 
     demo_benchmarks = session.exec(select(Benchmark).where(Benchmark.name.startswith(DEMO_PREFIX))).all()
     demo_benchmark_ids = [benchmark.id for benchmark in demo_benchmarks if benchmark.id is not None]
     if demo_benchmark_ids:
-        session.exec(delete(BenchmarkResult).where(BenchmarkResult.benchmark_id.in_(demo_benchmark_ids)))
+        delete_results(session, BenchmarkResult.benchmark_id.in_(demo_benchmark_ids))
         session.exec(delete(Benchmark).where(Benchmark.id.in_(demo_benchmark_ids)))
 
 
@@ -353,7 +360,7 @@ def seed_demo_data(session: Session, *, reset_demo: bool = False, append: bool =
 
     demo_config_ids = [config.id for config, *_ in configs]
     if demo_config_ids:
-        session.exec(delete(BenchmarkResult).where(BenchmarkResult.config_id.in_(demo_config_ids)))
+        delete_results(session, BenchmarkResult.config_id.in_(demo_config_ids))
         session.flush()
 
     base_date = datetime(2026, 7, 1, 12, 0, tzinfo=timezone.utc)
@@ -375,12 +382,14 @@ def seed_demo_data(session: Session, *, reset_demo: bool = False, append: bool =
 
             score = score_for(benchmark_name, cpu_power, gpu_power, disk_index, rng)
             timestamp = base_date + timedelta(days=system_index, minutes=benchmark_index * 7)
+            settings = settings_for(benchmark_name, os_name)
             session.add(
                 BenchmarkResult(
                     benchmark_id=benchmarks[benchmark_name].id,
                     config_id=config.id,
                     result=score,
-                    settings=settings_for(benchmark_name, os_name),
+                    settings=settings,
+                    settings_key=settings_key([], settings),
                     timestamp=timestamp.isoformat().replace("+00:00", "Z"),
                     notes=f"Demo {target_name.lower()} run",
                 )
@@ -15,12 +15,16 @@ import pytest
 from sqlmodel import SQLModel, Session
 
 from database import engine
+from utils.catalog_cache import clear_catalog_cache
+from utils.option_cache import clear_option_cache
 
 
 @pytest.fixture(autouse=True)
 def reset_database():
     SQLModel.metadata.drop_all(bind=engine)
     SQLModel.metadata.create_all(bind=engine)
+    clear_option_cache()
+    clear_catalog_cache()
     yield
     SQLModel.metadata.drop_all(bind=engine)
 
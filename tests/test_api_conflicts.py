@@ -1,10 +1,18 @@
+import io
+
 import pytest
 from fastapi import HTTPException
+from sqlalchemy import event, text
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
 from starlette.requests import Request
+from starlette.responses import Response
 
+from models import units
 from models.benchmark import Benchmark, BenchmarkOption, BenchmarkTarget
 from models.benchmark_results import BenchmarkResult
-from models.config import Config
+from models.config import Config, ConfigComponent
 from models.cpu import CPU, CPUBrand, CPUFamily
 from models.disk import Disk
 from models.gpu import GPU, GPUBrand, GPUManufacturer, GPUModel, GPUVRAMType
@@ -12,8 +20,9 @@ from models.motherboard import Motherboard, MotherboardChipset, MotherboardManuf
 from models.oses import OS
 from models.ram import RAM
 from routers import benchmark as benchmark_router
-from routers import benchmark_results, config, cpu, disk, gpu, motherboard, oses, ram
-from utils import auth
+from routers import benchmark_results, catalog, config, cpu, disk, gpu, motherboard, oses, ram, submissions
+from database import engine
+from utils import auth, catalog_cache, db_write, result_import, tool_output
 
 
 def _create_referenced_graph(db):
@@ -445,3 +454,1228 @@ def test_benchmark_options_generate_result_settings(db):
 
     assert result.option_values == f'{{"{option.id}": "1024 x 768"}}'
     assert result.settings == "Resolution: 1024 x 768"
+
+
+def test_compare_configs_uses_first_matching_run_per_settings_group(db):
+    records = _create_referenced_graph(db)
+    config_2 = config.create_config(
+        Config(
+            name="Repeat runs rig",
+            cpu_id=records["cpu"].id,
+            motherboard_id=records["motherboard"].id,
+            gpu_id=records["gpu"].id,
+            disk_id=records["disk"].id,
+            os_id=records["os"].id,
+            ram_id=records["ram"].id,
+            ram_size="32GB",
+        ),
+        db,
+    )
+
+    for value in (10000, 15000):
+        benchmark_results.create_benchmark_result(
+            BenchmarkResult(benchmark_id=records["benchmark"].id, config_id=config_2.id, result=value),
+            db,
+        )
+
+    comparison = benchmark_results.compare_configs(records["config"].id, config_2.id, db=db)
+
+    assert len(comparison) == 1
+    assert comparison[0]["settings"] == ""
+    assert comparison[0]["config_1_result"] == 12345
+    assert comparison[0]["config_2_result"] == 10000
+
+
+def test_compare_matrix_reports_deltas_against_baseline_and_gaps(db):
+    records = _create_referenced_graph(db)
+    config_ids = [records["config"].id]
+    for name in ("Matrix rig B", "Matrix rig C"):
+        config_ids.append(config.create_config(
+            Config(
+                name=name,
+                cpu_id=records["cpu"].id,
+                motherboard_id=records["motherboard"].id,
+                gpu_id=records["gpu"].id,
+                disk_id=records["disk"].id,
+                os_id=records["os"].id,
+                ram_id=records["ram"].id,
+                ram_size="32GB",
+            ),
+            db,
+        ).id)
+    superpi = benchmark_router.create_benchmark(
+        Benchmark(name="SuperPi", benchmark_target_id=records["target"].id, lower_is_better=True),
+        db,
+    )
+
+    for benchmark_id, config_id, value in [
+        (records["benchmark"].id, config_ids[1], 24690),
+        (superpi.id, config_ids[0], 20),
+        (superpi.id, config_ids[1], 10),
+        (superpi.id, config_ids[1], 14),
+    ]:
+        benchmark_results.create_benchmark_result(
+            BenchmarkResult(benchmark_id=benchmark_id, config_id=config_id, result=value),
+            db,
+        )
+
+    matrix = benchmark_results.compare_matrix(",".join(map(str, config_ids)), db=db)
+    rows = {row["benchmark_name"]: row for row in matrix["rows"]}
+
+    assert matrix["baseline_config_id"] == config_ids[0]
+    assert rows["3DMark"]["results"] == [12345, 24690, None]
+    assert rows["3DMark"]["percentage_change"] == [0.0, 100.0, None]
+    assert rows["3DMark"]["missing_config_ids"] == [config_ids[2]]
+    assert rows["SuperPi"]["results"] == [20, 12, None]
+    assert rows["SuperPi"]["runs"] == [1, 2, 0]
+    assert rows["SuperPi"]["percentage_change"] == [0.0, 40.0, None]
+    assert [entry["covered"] for entry in matrix["coverage"]] == [2, 2, 0]
+
+    with pytest.raises(HTTPException) as exc:
+        benchmark_results.compare_matrix(f"{config_ids[0]},9999", db=db)
+    assert exc.value.status_code == 404
+
+
+def test_result_stats_aggregate_per_group(db, monkeypatch):
+    records = _create_referenced_graph(db)
+    for value in (10000, 14000, 20000):
+        benchmark_results.create_benchmark_result(
+            BenchmarkResult(benchmark_id=records["benchmark"].id, config_id=records["config"].id, result=value),
+            db,
+        )
+    benchmark_results.create_benchmark_result(
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=records["config"].id,
+            result=500,
+            settings="640x480",
+        ),
+        db,
+    )
+
+    stats = benchmark_results.get_result_stats(group_by="benchmark,settings,gpu_model", percentiles="25,50", db=db)
+    default_group = next(group for group in stats if group["settings"] == "")
+
+    assert len(stats) == 2
+    assert default_group["benchmark_name"] == "3DMark"
+    assert default_group["gpu_model_name"] == "GTX 1080"
+    assert default_group["count"] == 4
+    assert default_group["min"] == 10000
+    assert default_group["max"] == 20000
+    assert default_group["median"] == 13172.5
+    assert default_group["percentiles"]["p25"] == 11758.75
+    assert round(default_group["stddev"], 2) == 4270.41
+
+    for offset in (1, 2, 3):
+        benchmark_results.create_benchmark_result(
+            BenchmarkResult(
+                benchmark_id=records["benchmark"].id,
+                config_id=records["config"].id,
+                result=1_000_000_000 + offset,
+                settings="large",
+            ),
+            db,
+        )
+    stats = benchmark_results.get_result_stats(group_by="settings", db=db)
+    large_group = next(group for group in stats if group["settings"] == "large")
+    assert large_group["stddev"] == 1.0
+    assert (large_group["median"], large_group["percentiles"]) == (None, {})
+
+    monkeypatch.setattr(benchmark_results, "STATS_MAX_PERCENTILE_VALUES", 4)
+    assert benchmark_results.get_result_stats(group_by="settings", percentiles="50", limit=1, db=db)[0]["median"]
+    with pytest.raises(HTTPException) as exc:
+        benchmark_results.get_result_stats(group_by="settings", percentiles="50", db=db)
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        benchmark_results.get_result_stats(group_by="colour", db=db)
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException) as exc:
+        benchmark_results.get_result_stats(offset=-1, db=db)
+    assert exc.value.status_code == 400
+
+
+def test_results_can_be_filtered_by_option_value(db):
+    records = _create_referenced_graph(db)
+    option = benchmark_router.create_benchmark_option(
+        BenchmarkOption(
+            benchmark_id=records["benchmark"].id,
+            name="Resolution",
+            values='["800 x 600", "1024 x 768"]',
+        ),
+        db,
+    )
+    low = benchmark_results.create_benchmark_result(
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=records["config"].id,
+            result=2000,
+            option_values=f'{{"{option.id}": "800 x 600"}}',
+        ),
+        db,
+    )
+    high = benchmark_results.create_benchmark_result(
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=records["config"].id,
+            result=1500,
+            option_values=f'{{"{option.id}": "1024 x 768"}}',
+        ),
+        db,
+    )
+
+    filtered = benchmark_results.get_benchmark_results(db, option=[f"{option.id}:1024 x 768"])
+    assert [result.id for result in filtered] == [high.id]
+
+    benchmark_results.update_benchmark_result(
+        low.id,
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=records["config"].id,
+            result=2000,
+            option_values=f'{{"{option.id}": "1024 x 768"}}',
+        ),
+        db,
+    )
+    filtered = benchmark_results.get_results_by_config(
+        records["config"].id,
+        db,
+        option=[f"{option.id}:1024 x 768"],
+    )
+    assert sorted(result.id for result in filtered) == sorted([low.id, high.id])
+
+    with pytest.raises(HTTPException) as exc:
+        benchmark_results.get_benchmark_results(db, option=["Resolution"])
+    assert exc.value.status_code == 400
+
+    too_long = f'{{"{option.id}": "{"x" * 192}"}}'
+    with pytest.raises(HTTPException) as exc:
+        benchmark_results.update_benchmark_result(
+            low.id,
+            BenchmarkResult(
+                benchmark_id=records["benchmark"].id,
+                config_id=records["config"].id,
+                result=2000,
+                option_values=too_long,
+            ),
+            db,
+        )
+    assert exc.value.status_code == 400
+    summary = benchmark_results.create_benchmark_results_bulk([
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=records["config"].id,
+            result=3000,
+            option_values=too_long,
+        )
+    ], db)
+    assert summary["errors"] == [{"index": 0, "detail": "Result option values are limited to 191 characters"}]
+
+
+def test_settings_key_groups_equivalent_settings(db):
+    records = _create_referenced_graph(db)
+    config_2 = config.create_config(
+        Config(
+            name="Spacing rig",
+            cpu_id=records["cpu"].id,
+            motherboard_id=records["motherboard"].id,
+            gpu_id=records["gpu"].id,
+            disk_id=records["disk"].id,
+            os_id=records["os"].id,
+            ram_id=records["ram"].id,
+            ram_size="32GB",
+        ),
+        db,
+    )
+    first = benchmark_results.create_benchmark_result(
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=records["config"].id,
+            result=100,
+            settings="1024x768, 32-bit color",
+        ),
+        db,
+    )
+    second = benchmark_results.create_benchmark_result(
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=config_2.id,
+            result=110,
+            settings="1024x768,32-bit color, 1024x768",
+        ),
+        db,
+    )
+
+    assert first.settings_key == second.settings_key
+    assert len(first.settings_key) == 40
+
+    comparison = benchmark_results.compare_configs(
+        records["config"].id,
+        config_2.id,
+        benchmark_id=records["benchmark"].id,
+        db=db,
+    )
+    assert [row["config_2_result"] for row in comparison] == [110]
+
+    updated = benchmark_results.update_benchmark_result(
+        second.id,
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=config_2.id,
+            result=110,
+            settings="640x480",
+        ),
+        db,
+    )
+    assert updated.settings_key != first.settings_key
+
+
+def test_bulk_result_ingest_reports_errors_per_row(db):
+    records = _create_referenced_graph(db)
+    option = benchmark_router.create_benchmark_option(
+        BenchmarkOption(
+            benchmark_id=records["benchmark"].id,
+            name="Resolution",
+            values='["800 x 600", "1024 x 768"]',
+        ),
+        db,
+    )
+
+    summary = benchmark_results.create_benchmark_results_bulk(
+        [
+            BenchmarkResult(
+                benchmark_id=records["benchmark"].id,
+                config_id=records["config"].id,
+                result=1000 + index,
+                option_values=f'{{"{option.id}": "800 x 600"}}',
+                settings=f"Run {index}",
+            )
+            for index in range(3)
+        ]
+        + [BenchmarkResult(benchmark_id=9999, config_id=records["config"].id, result=1)],
+        db,
+    )
+
+    assert summary["created"] == 3
+    assert summary["errors"] == [{"index": 3, "detail": "Invalid benchmark ID"}]
+
+    filtered = benchmark_results.get_benchmark_results(db, option=[f"{option.id}:800 x 600"])
+    assert sorted(result.settings for result in filtered) == [
+        "Resolution: 800 x 600, Run 0",
+        "Resolution: 800 x 600, Run 1",
+        "Resolution: 800 x 600, Run 2",
+    ]
+    assert all(result.settings_key for result in filtered)
+
+
+def test_result_import_resolves_names_and_commits_in_chunks(db):
+    records = _create_referenced_graph(db)
+    option = benchmark_router.create_benchmark_option(
+        BenchmarkOption(
+            benchmark_id=records["benchmark"].id,
+            name="Resolution",
+            values='["800 x 600", "1024 x 768"]',
+        ),
+        db,
+    )
+    csv_rows = ["config,benchmark,result,option:Resolution,settings"]
+    csv_rows += [f"Main rig,3dmark,{1000 + index},1024 x 768,Run {index}" for index in range(5)]
+    csv_rows.append("Unknown rig,3DMark,1,,")
+    stream = io.BytesIO("\n".join(csv_rows).encode("utf-8"))
+
+    progress = []
+    summary = result_import.import_results(
+        db,
+        result_import.iter_import_rows(stream, "csv"),
+        chunk_size=2,
+        progress=lambda state: progress.append(state["next_row"]),
+    )
+
+    assert summary["created"] == 5
+    assert summary["errors"] == [{"row": 5, "detail": "Unknown config 'Unknown rig'"}]
+    assert summary["next_row"] == 6
+    assert progress == [2, 4, 6]
+    assert len(benchmark_results.get_benchmark_results(db, option=[f"{option.id}:1024 x 768"])) == 5
+
+    stream = io.BytesIO(b'{"config": "Main rig", "benchmark": "3DMark", "result": 7}\n\nnot json\n')
+    summary = result_import.import_results(db, result_import.iter_import_rows(stream, "ndjson"), start_row=1)
+
+    assert summary["created"] == 0
+    assert summary["errors"] == [{"row": 1, "detail": "Invalid JSON"}]
+
+    stream = io.BytesIO(b'{"config": "Main rig", "benchmark": "3DMark", "result": 9}\n{"notes": "Caf\xe9"}\n')
+    summary = result_import.import_results(db, result_import.iter_import_rows(stream, "ndjson"))
+    assert (summary["created"], summary["errors"]) == (1, [{"row": 1, "detail": "Invalid UTF-8"}])
+
+    # An Excel CP1252 export: CSV cannot skip a record, so the import stops with a resume point.
+    csv_rows = ["config,benchmark,result,notes"] + [f"Main rig,3DMark,{2000 + index}," for index in range(400)]
+    stream = io.BytesIO(("\n".join(csv_rows) + "\nMain rig,3DMark,1,").encode("utf-8") + b"Caf\xe9\n")
+    summary = result_import.import_results(db, result_import.iter_import_rows(stream, "csv"), chunk_size=50)
+    assert summary["aborted"].startswith("Unreadable input")
+    assert 0 < summary["next_row"] <= 400
+    assert summary["created"] == summary["next_row"]
+
+    def broken_rows():
+        yield {"config": "Main rig", "benchmark": "3DMark", "result": 8}, None
+        raise RuntimeError("parser bug")
+
+    with pytest.raises(RuntimeError):
+        result_import.import_results(db, broken_rows())
+
+
+def test_catalog_bulk_upsert_reuses_existing_names(db):
+    _create_referenced_graph(db)
+
+    payload = catalog.CatalogUpsert(
+        cpu_brands=[{"name": " intel ", "families": ["core", "Pentium III", "Pentium III"]}],
+        gpu_brands=[{"name": "ATI", "models": ["Rage 128", "Radeon 9700"]}],
+        gpu_vram_types=["GDDR5X", "DDR"],
+        ram=["DDR 400MHz"],
+        oses=["Windows 98", "windows 98"],
+    )
+    summary = catalog.upsert_catalog(payload, db)
+
+    assert summary["cpu_brands"] == {"created": 0, "existing": 1}
+    assert summary["cpu_families"] == {"created": 1, "existing": 1}
+    assert summary["gpu_brands"] == {"created": 1, "existing": 0}
+    assert summary["gpu_models"] == {"created": 2, "existing": 0}
+    assert summary["gpu_vram_types"] == {"created": 1, "existing": 1}
+    assert summary["oses"] == {"created": 1, "existing": 0}
+    assert summary["disks"] == {"created": 0, "existing": 0}
+
+    families = cpu.get_cpu_families(db)
+    assert sorted(family.name for family in families) == ["Core", "Pentium III"]
+    assert catalog.upsert_catalog(payload, db)["gpu_models"] == {"created": 0, "existing": 2}
+
+    with pytest.raises(HTTPException) as exc:
+        catalog.upsert_catalog(catalog.CatalogUpsert(disks=["  "]), db)
+    assert exc.value.status_code == 400
+
+
+def test_submission_is_all_or_nothing(db, monkeypatch):
+    records = _create_referenced_graph(db)
+    rig = {
+        "cpu_id": records["cpu"].id,
+        "motherboard_id": records["motherboard"].id,
+        "gpu_id": records["gpu"].id,
+        "disk_id": records["disk"].id,
+        "os_id": records["os"].id,
+        "ram_id": records["ram"].id,
+        "ram_size": "64GB",
+    }
+
+    submission = submissions.Submission(
+        config=Config(**rig, name="Dual rig", gpu_component_ids=f"[{records['gpu'].id},{records['gpu'].id}]"),
+        results=[
+            {"benchmark_id": records["benchmark"].id, "result": 100},
+            {"benchmark_id": records["benchmark"].id, "result": 200, "settings": "High"},
+            {"benchmark_id": records["benchmark"].id, "result": 300, "timestamp": "2024-01-01T00:00:00"},
+            {"benchmark_id": records["benchmark"].id, "result": 300, "timestamp": "2024-01-01T00:00:00"},
+        ],
+    )
+    response = submissions.create_submission(submission, db)
+
+    assert (response["created"], response["duplicates"]) == (3, 1)
+    assert response["config"].gpu_quantity == 2
+    assert len(benchmark_results.get_results_by_config(response["config"].id, db)) == 3
+
+    broken = submissions.Submission(
+        config=Config(**rig, name="Broken rig"),
+        results=[
+            {"benchmark_id": records["benchmark"].id, "result": 100},
+            {"benchmark_id": 999, "result": 200},
+        ],
+    )
+    with pytest.raises(HTTPException) as exc:
+        submissions.create_submission(broken, db)
+    assert exc.value.detail["errors"] == [{"index": 1, "detail": "Invalid benchmark ID"}]
+
+    missing_disk = submissions.Submission(config=Config(**{**rig, "disk_id": 999}, name="No disk"))
+    with pytest.raises(HTTPException) as exc:
+        submissions.create_submission(missing_disk, db)
+    assert exc.value.detail == "Invalid Disk"
+
+    # Only the config flush is reported as a name clash; a constraint hit by the results is not.
+    def failing_ingest(*_args, **_kwargs):
+        raise IntegrityError("INSERT INTO benchmarkresult", {}, Exception("constraint failed"))
+
+    monkeypatch.setattr(submissions, "ingest_results", failing_ingest)
+    with pytest.raises(IntegrityError):
+        submissions.create_submission(submissions.Submission(config=Config(**rig, name="Other rig")), db)
+    db.rollback()
+
+    assert sorted(entry.name for entry in config.get_configs(db)) == ["Dual rig", "Main rig"]
+
+
+def test_writes_validate_references_together_and_skip_refresh(db):
+    records = _create_referenced_graph(db)
+
+    with pytest.raises(HTTPException) as exc:
+        motherboard.create_motherboard(
+            Motherboard(model="P2B", manufacturer_id=records["motherboard_manufacturer"].id, chipset_id=999),
+            db,
+        )
+    assert exc.value.detail == "Invalid motherboard chipset"
+
+    board = motherboard.create_motherboard(
+        Motherboard(
+            model="P2B",
+            manufacturer_id=records["motherboard_manufacturer"].id,
+            chipset_id=records["chipset"].id,
+        ),
+        db,
+    )
+    assert board.id is not None
+    assert not sa_inspect(board).expired_attributes
+
+
+def test_config_component_lists_are_validated_per_slot(db):
+    records = _create_referenced_graph(db)
+    gpu_id = records["gpu"].id
+
+    with pytest.raises(HTTPException) as exc:
+        config.update_config(
+            records["config"].id,
+            Config(
+                name="Main rig",
+                cpu_id=records["cpu"].id,
+                gpu_component_ids=f"[{gpu_id},999]",
+                motherboard_id=records["motherboard"].id,
+                disk_id=records["disk"].id,
+                os_id=records["os"].id,
+                ram_id=records["ram"].id,
+                ram_size="32GB",
+            ),
+            db,
+        )
+    assert exc.value.detail == "Invalid GPU"
+
+    updated = config.update_config(
+        records["config"].id,
+        Config(
+            name="Main rig",
+            cpu_component_ids=f"[{records['cpu'].id},{records['cpu'].id}]",
+            gpu_component_ids=f"[{gpu_id},{gpu_id}]",
+            motherboard_id=records["motherboard"].id,
+            disk_id=records["disk"].id,
+            os_id=records["os"].id,
+            ram_id=records["ram"].id,
+            ram_size="32GB",
+        ),
+        db,
+    )
+    assert (updated.cpu_quantity, updated.gpu_quantity) == (2, 2)
+
+
+def test_option_cache_is_invalidated_by_option_handlers(db):
+    records = _create_referenced_graph(db)
+    benchmark_id = records["benchmark"].id
+    option = benchmark_router.create_benchmark_option(
+        BenchmarkOption(benchmark_id=benchmark_id, name="Resolution", values='["640 x 480"]'),
+        db,
+    )
+
+    result = benchmark_results.create_benchmark_result(
+        BenchmarkResult(
+            benchmark_id=benchmark_id,
+            config_id=records["config"].id,
+            result=1,
+            option_values=f'{{"{option.id}": "640 x 480"}}',
+        ),
+        db,
+    )
+    assert result.settings == "Resolution: 640 x 480"
+
+    benchmark_router.update_benchmark_option(
+        option.id,
+        BenchmarkOption(benchmark_id=benchmark_id, name="Screen", values='["640 x 480"]'),
+        db,
+    )
+    result = benchmark_results.create_benchmark_result(
+        BenchmarkResult(
+            benchmark_id=benchmark_id,
+            config_id=records["config"].id,
+            result=2,
+            option_values=f'{{"{option.id}": "640 x 480"}}',
+        ),
+        db,
+    )
+    assert result.settings == "Screen: 640 x 480"
+
+
+def test_option_cache_skips_racing_loads_and_follows_shared_generation(db, monkeypatch):
+    from utils import option_cache
+
+    records = _create_referenced_graph(db)
+    benchmark_id = records["benchmark"].id
+    benchmark_router.create_benchmark_option(
+        BenchmarkOption(benchmark_id=benchmark_id, name="Resolution", values='["640 x 480"]'),
+        db,
+    )
+
+    def invalidate_during_load(_conn, _cursor, statement, *_args):
+        if "FROM benchmarkoption" in statement:
+            option_cache.invalidate_benchmark_options(benchmark_id)
+
+    event.listen(engine, "before_cursor_execute", invalidate_during_load)
+    try:
+        loaded = option_cache.get_benchmark_options(db, [benchmark_id])
+    finally:
+        event.remove(engine, "before_cursor_execute", invalidate_during_load)
+    assert [option.name for option in loaded[benchmark_id]] == ["Resolution"]
+    assert benchmark_id not in option_cache._option_cache
+
+    cached = option_cache.get_benchmark_options(db, [benchmark_id])[benchmark_id]
+    assert option_cache.get_benchmark_options(db, [benchmark_id])[benchmark_id] is cached
+
+    # Another worker renamed the option and published a new options generation.
+    db.exec(text("UPDATE benchmarkoption SET name = 'Screen' WHERE benchmark_id = :id").bindparams(id=benchmark_id))
+    db.exec(
+        text("UPDATE settings SET value = 'elsewhere' WHERE key = :key").bindparams(
+            key=catalog_cache.SHARED_GENERATION_KEYS[catalog_cache.OPTIONS]
+        )
+    )
+    db.commit()
+    monkeypatch.setattr(catalog_cache, "GENERATION_CHECK_SECONDS", 0)
+    assert [option.name for option in option_cache.get_benchmark_options(db, [benchmark_id])[benchmark_id]] == [
+        "Screen"
+    ]
+
+
+def test_retried_results_are_deduplicated(db):
+    records = _create_referenced_graph(db)
+
+    def batch():
+        return [
+            BenchmarkResult(
+                benchmark_id=records["benchmark"].id,
+                config_id=records["config"].id,
+                result=500 + index,
+                timestamp="2026-10-19T10:00:00",
+            )
+            for index in range(3)
+        ]
+
+    first = benchmark_results.create_benchmark_results_bulk(batch(), db)
+    retry = benchmark_results.create_benchmark_results_bulk(batch() + batch()[:1], db)
+    assert (first["created"], first["duplicates"]) == (3, 0)
+    assert (retry["created"], retry["duplicates"]) == (0, 4)
+
+    keyed = benchmark_results.create_benchmark_results_bulk(batch(), db, idempotency_key="upload-42")
+    keyed_retry = benchmark_results.create_benchmark_results_bulk(batch(), db, idempotency_key="upload-42")
+    assert (keyed["created"], keyed_retry["created"], keyed_retry["duplicates"]) == (3, 0, 3)
+
+    # Without a timestamp or key nothing tells two runs with the same score apart, so both are kept.
+    single = BenchmarkResult(benchmark_id=records["benchmark"].id, config_id=records["config"].id, result=12345)
+    assert benchmark_results.create_benchmark_result(single, db).id != records["result"].id
+    assert len(benchmark_results.get_benchmark_results(db)) == 8
+
+    def keyed_single(result):
+        response = Response()
+        stored = benchmark_results.create_benchmark_result(
+            BenchmarkResult(benchmark_id=records["benchmark"].id, config_id=records["config"].id, result=result),
+            db,
+            "single-7",
+            response,
+        )
+        return stored, response.headers.get("Idempotent-Replayed")
+
+    stored, replayed = keyed_single(77)
+    assert replayed is None
+    benchmark_results.update_benchmark_result(stored.id, BenchmarkResult(**{**stored.model_dump(), "notes": "ok"}), db)
+    assert keyed_single(77) == (stored, "true")
+    with pytest.raises(HTTPException) as exc:
+        keyed_single(78)
+    assert exc.value.status_code == 409
+
+    reused = benchmark_results.create_benchmark_results_bulk(batch()[:1] + batch()[:1], db, idempotency_key="upload-42")
+    assert (reused["created"], reused["duplicates"]) == (0, 1)
+    assert reused["errors"] == [{"index": 1, "detail": "Idempotency key was already used with a different result"}]
+    assert len(benchmark_results.get_benchmark_results(db)) == 9
+
+    with pytest.raises(HTTPException) as exc:
+        benchmark_results.update_benchmark_result(
+            records["result"].id,
+            BenchmarkResult(
+                benchmark_id=records["benchmark"].id,
+                config_id=records["config"].id,
+                result=500,
+                timestamp="2026-10-19T10:00:00",
+            ),
+            db,
+        )
+    assert exc.value.status_code == 409
+
+
+def test_bulk_result_and_config_maintenance(db, monkeypatch):
+    # Moved rows are rehashed a chunk at a time; a chunk of one covers the chunk boundaries.
+    monkeypatch.setattr(benchmark_results, "MULTI_ROW_INSERT_SIZE", 1)
+    records = _create_referenced_graph(db)
+    benchmark_results.create_benchmark_results_bulk(
+        [
+            BenchmarkResult(
+                benchmark_id=records["benchmark"].id,
+                config_id=records["config"].id,
+                result=index,
+                timestamp=f"2026-10-{10 + index}T12:00:00Z",
+            )
+            for index in range(4)
+        ],
+        db,
+    )
+    spare = config.create_config(
+        Config(
+            name="Spare rig",
+            cpu_id=records["cpu"].id,
+            motherboard_id=records["motherboard"].id,
+            gpu_id=records["gpu"].id,
+            disk_id=records["disk"].id,
+            os_id=records["os"].id,
+            ram_id=records["ram"].id,
+            ram_size="16GB",
+        ),
+        db,
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        benchmark_results.delete_benchmark_results_bulk(benchmark_results.ResultSelection(), db)
+    assert exc.value.detail == "At least one filter is required"
+
+    window = {"timestamp_from": "2026-10-11", "timestamp_to": "2026-10-13"}
+    moved = benchmark_results.update_benchmark_results_bulk(
+        benchmark_results.ResultBulkUpdate(**window, set_config_id=spare.id, dry_run=True),
+        db,
+    )
+    assert moved == {"matched": 2, "dry_run": True}
+    moved = benchmark_results.update_benchmark_results_bulk(
+        benchmark_results.ResultBulkUpdate(**window, set_config_id=spare.id),
+        db,
+    )
+    assert moved["updated"] == 2
+    moved_results = benchmark_results.get_results_by_config(spare.id, db)
+    assert len(moved_results) == 2
+
+    # Moved rows are rehashed, so resubmitting one under its new config resolves to it.
+    resubmitted = benchmark_results.create_benchmark_result(
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=spare.id,
+            result=1,
+            timestamp="2026-10-11T12:00:00Z",
+        ),
+        db,
+    )
+    assert resubmitted.id in {result.id for result in moved_results}
+    twin = benchmark_results.create_benchmark_result(
+        BenchmarkResult(
+            benchmark_id=records["benchmark"].id,
+            config_id=records["config"].id,
+            result=1,
+            timestamp="2026-10-11T12:00:00Z",
+        ),
+        db,
+    )
+    with pytest.raises(HTTPException) as exc:
+        benchmark_results.update_benchmark_results_bulk(
+            benchmark_results.ResultBulkUpdate(ids=[twin.id], set_config_id=spare.id),
+            db,
+        )
+    assert exc.value.status_code == 409
+    assert benchmark_results.delete_benchmark_results_bulk(
+        benchmark_results.ResultSelection(ids=[twin.id]),
+        db,
+    )["deleted"] == 1
+
+    fixed = benchmark_results.update_benchmark_results_bulk(
+        benchmark_results.ResultBulkUpdate(config_id=spare.id, set_benchmark_id=records["benchmark"].id),
+        db,
+    )
+    assert fixed["matched"] == 2
+
+    with pytest.raises(HTTPException) as exc:
+        config.delete_configs_bulk(config.ConfigSelection(ids=[records["config"].id, spare.id]), db)
+    assert exc.value.status_code == 409
+
+    deleted = benchmark_results.delete_benchmark_results_bulk(
+        benchmark_results.ResultSelection(config_id=spare.id),
+        db,
+    )
+    assert deleted["deleted"] == 2
+
+    with pytest.raises(HTTPException) as exc:
+        config.update_configs_bulk(config.ConfigBulkUpdate(set_ram_id=records["ram"].id), db)
+    assert exc.value.detail == "At least one filter is required"
+    selected = config.update_configs_bulk(
+        config.ConfigBulkUpdate(cpu_id=records["cpu"].id, set_os_id=records["os"].id, dry_run=True),
+        db,
+    )
+    assert selected == {"matched": 2, "dry_run": True}
+    assert config.delete_configs_bulk(config.ConfigSelection(ids=[spare.id]), db)["deleted"] == 1
+    assert [entry.name for entry in config.get_configs(db)] == ["Main rig"]
+
+
+def test_tool_output_directory_is_parsed_and_ingested(db, tmp_path):
+    records = _create_referenced_graph(db)
+    target_id = records["target"].id
+    superpi = benchmark_router.create_benchmark(
+        Benchmark(name="SuperPi 1M", benchmark_target_id=target_id, lower_is_better=True),
+        db,
+    )
+    quake = benchmark_router.create_benchmark(
+        Benchmark(name="Quake Timedemo", benchmark_target_id=target_id, lower_is_better=False),
+        db,
+    )
+    demo = benchmark_router.create_benchmark_option(
+        BenchmarkOption(benchmark_id=quake.id, name="Demo", values='["demo1", "demo2"]'),
+        db,
+    )
+
+    (tmp_path / "superpi.txt").write_text(
+        "Ver 1.1e calculation start. 1M digits\n"
+        "+ 000h 00m 01.875s Loop 1 finished\n"
+        "+ 000h 00m 32.125s PI value output -> pi_data.txt\n"
+    )
+    (tmp_path / "quake").mkdir()
+    (tmp_path / "quake" / "qconsole.log").write_text(
+        "] timedemo demo1\n969 frames 13.2 seconds 73.4 fps\n] timedemo demo2\n812 frames 11.1 seconds 73.2 fps\n"
+    )
+    (tmp_path / "3dmark.txt").write_text("3DMark2001 SE\n1024 x 768 32 bit\n12,345 3DMarks\n")
+    (tmp_path / "notes.txt").write_text("nothing to see here\n")
+
+    parsed = tool_output.parse_tool_files(tool_output.iter_tool_files([tmp_path]), workers=2)
+    summary = tool_output.ingest_tool_output(db, records["config"].id, parsed)
+
+    assert (summary["files"], summary["parsed"], summary["created"]) == (4, 4, 3)
+    assert sorted(error["detail"] for error in summary["errors"]) == [
+        "No parser recognizes this file",
+        "Unknown benchmark '3DMark2001 SE'",
+    ]
+    results = benchmark_results.get_benchmark_results(db)
+    assert [result.result for result in results if result.benchmark_id == superpi.id] == [32.125]
+    demo2 = benchmark_results.get_benchmark_results(db, option=[f"{demo.id}:demo2"])
+    assert [(result.result, result.settings) for result in demo2] == [(73.2, "Demo: demo2")]
+
+
+def test_name_uniqueness_uses_normalized_name_key(db):
+    brand = cpu.create_cpu_brand(CPUBrand(name="Intel"), db)
+    assert brand.name_key == "intel"
+
+    with pytest.raises(HTTPException) as exc_info:
+        cpu.create_cpu_brand(CPUBrand(name="  INTEL "), db)
+    assert exc_info.value.status_code == 400
+
+    disk.create_disk(Disk(name="Quantum  Fireball"), db)
+    with pytest.raises(HTTPException):
+        disk.create_disk(Disk(name="quantum fireball"), db)
+
+    renamed = cpu.update_cpu_brand(brand.id, CPUBrand(name="intel"), db)
+    assert (renamed.name, renamed.name_key) == ("intel", "intel")
+
+    summary = catalog.upsert_catalog(catalog.CatalogUpsert(cpu_brands=[{"name": "INTEL", "families": ["Core"]}]), db)
+    assert summary["cpu_brands"] == {"created": 0, "existing": 1}
+    assert db.get(CPUFamily, 1).name_key == "core"
+
+
+def test_catalog_upsert_handles_legacy_non_unique_name_key_index(db):
+    # init_db creates the index non-unique when legacy rows differ only in case.
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_os_name_key"))
+        conn.execute(text("CREATE INDEX ix_os_name_key ON os (name_key)"))
+        conn.execute(text(
+            "INSERT INTO os (name, name_key) VALUES ('Windows 98', 'windows 98'), ('WINDOWS 98', 'windows 98')"
+        ))
+
+    payload = catalog.CatalogUpsert(oses=["windows 98", "Windows XP"])
+    assert catalog.upsert_catalog(payload, db)["oses"] == {"created": 1, "existing": 1}
+    assert catalog.upsert_catalog(payload, db)["oses"] == {"created": 0, "existing": 2}
+    assert db.exec(select(OS).where(OS.name_key == "windows xp")).all()[0].name == "Windows XP"
+
+
+def test_catalog_tree_nests_hierarchy_with_usage(db):
+    graph = _create_referenced_graph(db)
+
+    tree = catalog.get_catalog_tree("cpu", db)
+    assert [brand["name"] for brand in tree] == ["Intel"]
+    family = tree[0]["families"][0]
+    assert family["name"] == "Core"
+    assert family["cpus"][0]["model"] == "i7-8700K"
+    assert tree[0]["usage"] == family["usage"] == family["cpus"][0]["usage"] == 1
+
+    gpu_tree = catalog.get_catalog_tree("gpu", db)
+    gpu_entry = gpu_tree[0]["models"][0]["gpus"][0]
+    assert (gpu_entry["manufacturer"], gpu_entry["vram_type"], gpu_entry["usage"]) == ("ASUS", "GDDR5X", 1)
+
+    assert catalog.get_catalog_tree("cpu", db) is tree
+    cpu.create_cpu_family(CPUFamily(name="Atom", cpu_brand_id=graph["cpu_brand"].id), db)
+    refreshed = catalog.get_catalog_tree("cpu", db)
+    assert [family["name"] for family in refreshed[0]["families"]] == ["Atom", "Core"]
+    assert refreshed[0]["families"][0]["usage"] == 0
+
+    motherboards = catalog.get_catalog_tree("motherboard", db)
+    assert motherboards[0]["motherboards"][0]["usage"] == 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        catalog.get_catalog_tree("ram", db)
+    assert exc_info.value.status_code == 400
+
+
+def test_catalog_suggest_matches_word_prefixes_by_usage(db):
+    graph = _create_referenced_graph(db)
+    spare = cpu.create_cpu(
+        CPU(
+            model="i7-8700",
+            speed="3.2GHz",
+            core_count=6,
+            cpu_brand_id=graph["cpu_brand"].id,
+            cpu_family_id=graph["cpu_family"].id,
+        ),
+        db,
+    )
+
+    suggestions = catalog.suggest_catalog("cpu", "intel 8700", 10, db)
+    assert [suggestion["id"] for suggestion in suggestions] == [graph["cpu"].id, spare.id]
+    assert suggestions[0] == {
+        "id": graph["cpu"].id,
+        "name": "Intel Core i7-8700K (3.7GHz, 6 cores)",
+        "usage": 1,
+    }
+    assert catalog.suggest_catalog("cpu", "core 3.2", 10, db)[0]["id"] == spare.id
+    assert catalog.suggest_catalog("cpu", "amd", 10, db) == []
+
+    gpu_names = [suggestion["name"] for suggestion in catalog.suggest_catalog("gpu", "gtx", 10, db)]
+    assert gpu_names == ["ASUS NVIDIA GTX 1080 (8GB GDDR5X)"]
+
+    ram.create_ram(RAM(name="DDR4-2666"), db)
+    ram_names = [suggestion["name"] for suggestion in catalog.suggest_catalog("ram", "ddr4", 10, db)]
+    assert ram_names == ["DDR4 3200", "DDR4-2666"]
+
+    with pytest.raises(HTTPException):
+        catalog.suggest_catalog("cpu", "", 0, db)
+
+
+def test_parsed_numeric_columns_filter_and_sort(db):
+    graph = _create_referenced_graph(db)
+    assert graph["cpu"].speed_mhz == 3700
+    assert graph["gpu"].vram_bytes == 8 * 1024 ** 3
+
+    slow = cpu.create_cpu(
+        CPU(
+            model="Coppermine",
+            speed="700MHz",
+            core_count=1,
+            cpu_brand_id=graph["cpu_brand"].id,
+            cpu_family_id=graph["cpu_family"].id,
+        ),
+        db,
+    )
+    ryzen = cpu.create_cpu(
+        CPU(
+            model="Zen 2",
+            speed="5 3600 3.6GHz",
+            core_count=6,
+            cpu_brand_id=graph["cpu_brand"].id,
+            cpu_family_id=graph["cpu_family"].id,
+        ),
+        db,
+    )
+    assert ryzen.speed_mhz == 3600
+
+    updated = cpu.update_cpu(slow.id, CPU(**{**slow.model_dump(), "speed": "1.1 GHz"}), db)
+    assert updated.speed_mhz == 1100
+
+    assert [entry.id for entry in cpu.get_cpus(db, 1000, 3650, "-speed_mhz")] == [ryzen.id, slow.id]
+    assert [entry.speed_mhz for entry in cpu.get_cpus(db, sort="speed_mhz")] == [1100, 3600, 3700]
+    with pytest.raises(HTTPException):
+        cpu.get_cpus(db, sort="speed")
+
+    assert units.parse_size_bytes("1,024MB") == 1024 * 1024 ** 2
+    assert units.parse_size_bytes("1,5GB") == round(1.5 * 1024 ** 3)
+    assert units.parse_clock_mhz("1,200MHz") == 1200
+
+    assert graph["config"].ram_bytes == 32 * 1024 ** 3
+    assert [entry.id for entry in config.get_configs(db, min_ram_bytes=8 * 1024 ** 3)] == [graph["config"].id]
+    assert config.get_configs(db, max_ram_bytes=8 * 1024 ** 3) == []
+
+    result = graph["result"]
+    assert [entry.id for entry in benchmark_results.get_benchmark_results(db, min_cpu_speed_mhz=3000)] == [result.id]
+    assert benchmark_results.get_benchmark_results(db, min_vram_bytes=16 * 1024 ** 3) == []
+    assert len(benchmark_results.get_benchmark_results(db, sort="-ram_bytes")) == 1
+
+
+def test_lookup_cache_reads_through_and_follows_shared_generation(db, monkeypatch):
+    brand = cpu.create_cpu_brand(CPUBrand(name="Intel"), db)
+    assert catalog_cache.get_lookup(db, CPUBrand, brand.id).name == "Intel"
+    assert catalog_cache.lookup_rows(db, CPUBrand) is catalog_cache.lookup_rows(db, CPUBrand)
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert db_write.missing_references(db, [(CPUBrand, [brand.id])]) == []
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert not [statement for statement in statements if "cpubrand" in statement]
+
+    # Rows added in the current transaction are found by reading through.
+    pending = CPUBrand(name="AMD")
+    db.add(pending)
+    db.flush()
+    assert catalog_cache.get_lookup(db, CPUBrand, pending.id).name == "AMD"
+    db.rollback()
+
+    # Another worker renames the brand outside this process and publishes a new generation.
+    monkeypatch.setattr(catalog_cache, "GENERATION_CHECK_SECONDS", 0)
+    assert catalog_cache.get_lookup(db, CPUBrand, brand.id).name == "Intel"
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE cpubrand SET name = 'Intel Corporation' WHERE id = :id"), {"id": brand.id})
+        conn.execute(
+            text("UPDATE settings SET value = 'other-worker' WHERE key = :key"),
+            {"key": catalog_cache.SHARED_GENERATION_KEYS[catalog_cache.LOOKUP]},
+        )
+    db.commit()
+    assert catalog_cache.get_lookup(db, CPUBrand, brand.id).name == "Intel Corporation"
+
+    family = cpu.create_cpu_family(CPUFamily(name="Core", cpu_brand_id=brand.id), db)
+    assert catalog_cache.get_lookup(db, CPUFamily, family.id).cpu_brand_id == brand.id
+
+
+
+def test_config_writes_keep_lookup_snapshots_and_publish_nothing(db):
+    graph = _create_referenced_graph(db)
+    references = {
+        "motherboard_id": graph["motherboard"].id,
+        "disk_id": graph["disk"].id,
+        "os_id": graph["os"].id,
+        "ram_id": graph["ram"].id,
+        "ram_size": "16GB",
+    }
+    config.create_config(Config(name="Warm-up rig", cpu_id=graph["cpu"].id, gpu_id=graph["gpu"].id, **references), db)
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        for name in ("Second rig", "Third rig"):
+            config.create_config(Config(name=name, cpu_id=graph["cpu"].id, gpu_id=graph["gpu"].id, **references), db)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert not [statement for statement in statements if "FROM disk" in statement or "FROM os" in statement]
+    assert not [statement for statement in statements if "UPDATE settings" in statement]
+
+    # Snapshots only contain committed rows, even when built inside a transaction that renamed one.
+    catalog_cache.clear_catalog_cache()
+    db.get(Disk, graph["disk"].id).name = "Renamed disk"
+    db.flush()
+    assert catalog_cache.lookup_rows(db, Disk)[graph["disk"].id].name == "Samsung 970 EVO 1TB"
+    db.rollback()
+
+def test_component_references_use_config_component_rows(db):
+    graph = _create_referenced_graph(db)
+    second_cpu = cpu.create_cpu(
+        CPU(
+            model="i7-8700",
+            speed="3.2GHz",
+            core_count=6,
+            cpu_brand_id=graph["cpu_brand"].id,
+            cpu_family_id=graph["cpu_family"].id,
+        ),
+        db,
+    )
+    spare_cpu = cpu.create_cpu(
+        CPU(
+            model="i5-8400",
+            speed="2.8GHz",
+            core_count=6,
+            cpu_brand_id=graph["cpu_brand"].id,
+            cpu_family_id=graph["cpu_family"].id,
+        ),
+        db,
+    )
+
+    rig = graph["config"]
+    updated = config.update_config(
+        rig.id,
+        Config(**{**rig.model_dump(), "cpu_component_ids": f"[{rig.cpu_id},{second_cpu.id}]"}),
+        db,
+    )
+    rows = db.exec(select(ConfigComponent).where(ConfigComponent.config_id == updated.id)).all()
+    assert sorted((row.kind, row.slot, row.component_id) for row in rows) == [
+        ("cpu", 0, graph["cpu"].id),
+        ("cpu", 1, second_cpu.id),
+        ("gpu", 0, graph["gpu"].id),
+    ]
+
+    # A CPU that only sits in the second slot still blocks deletion.
+    with pytest.raises(HTTPException) as exc_info:
+        cpu.delete_cpu(second_cpu.id, db)
+    assert exc_info.value.status_code == 409
+    assert cpu.delete_cpu(spare_cpu.id, db) == {"message": "CPU deleted successfully"}
+
+    assert catalog.get_component_usage("cpu", db) == {graph["cpu"].id: 1, second_cpu.id: 1}
+    assert catalog.get_component_usage("ram", db) == {graph["ram"].id: 1}
+
+    benchmark_results.delete_benchmark_result(graph["result"].id, db)
+    config.delete_config(rig.id, db)
+    assert db.exec(select(ConfigComponent)).all() == []
+    assert cpu.delete_cpu(second_cpu.id, db) == {"message": "CPU deleted successfully"}
+
+
+def test_catalog_merge_moves_config_references_to_survivor(db):
+    graph = _create_referenced_graph(db)
+    duplicate = cpu.create_cpu(
+        CPU(
+            model="i7-8700K",
+            speed="3.7 GHz",
+            core_count=6,
+            cpu_brand_id=graph["cpu_brand"].id,
+            cpu_family_id=graph["cpu_family"].id,
+        ),
+        db,
+    )
+    survivor_id, victim_id, rig_id = graph["cpu"].id, duplicate.id, graph["config"].id
+    dual = config.create_config(
+        Config(
+            name="Dual rig",
+            cpu_component_ids=f"[{duplicate.id},{duplicate.id}]",
+            gpu_id=graph["gpu"].id,
+            motherboard_id=graph["motherboard"].id,
+            disk_id=graph["disk"].id,
+            os_id=graph["os"].id,
+            ram_id=graph["ram"].id,
+            ram_size="4GB",
+        ),
+        db,
+    )
+    dual_id = dual.id
+
+    merge = catalog.CatalogMerge(kind="cpu", survivor_id=survivor_id, victim_ids=[victim_id], dry_run=True)
+    assert catalog.merge_catalog_entries(merge, db)["configs"] == 1
+    assert db.get(CPU, victim_id) is not None
+
+    summary = catalog.merge_catalog_entries(merge.model_copy(update={"dry_run": False}), db)
+    assert (summary["configs"], summary["deleted"]) == (1, 1)
+
+    db.expire_all()
+    assert db.get(CPU, victim_id) is None
+    merged = db.get(Config, dual_id)
+    assert merged.cpu_id == survivor_id
+    assert merged.cpu_component_ids == f"[{survivor_id},{survivor_id}]"
+    assert db.get(Config, rig_id).cpu_id == survivor_id
+    assert catalog.get_component_usage("cpu", db) == {survivor_id: 2}
+
+    with pytest.raises(HTTPException) as exc_info:
+        catalog.merge_catalog_entries(
+            catalog.CatalogMerge(kind="cpu", survivor_id=survivor_id, victim_ids=[survivor_id]),
+            db,
+        )
+    assert exc_info.value.status_code == 400
+
+
+def test_display_names_follow_parent_renames(db):
+    graph = _create_referenced_graph(db)
+    cpu_id, gpu_id, config_id = graph["cpu"].id, graph["gpu"].id, graph["config"].id
+    assert db.get(CPU, cpu_id).display_name == "Intel Core i7-8700K (3.7GHz, 6 cores)"
+    assert db.get(Motherboard, graph["motherboard"].id).display_name == "Gigabyte Z370 AORUS (Z370)"
+    assert db.get(Config, config_id).display_name == (
+        "Main rig: Intel Core i7-8700K (3.7GHz, 6 cores) / ASUS NVIDIA GTX 1080 (8GB GDDR5X)"
+    )
+
+    cpu.update_cpu_brand(graph["cpu_brand"].id, CPUBrand(name="Intel Corp"), db)
+    gpu.update_gpu_vram_type(graph["gpu_vram_type"].id, GPUVRAMType(name="GDDR5"), db)
+
+    db.expire_all()
+    assert db.get(CPU, cpu_id).display_name == "Intel Corp Core i7-8700K (3.7GHz, 6 cores)"
+    assert db.get(GPU, gpu_id).display_name == "ASUS NVIDIA GTX 1080 (8GB GDDR5)"
+    assert db.get(Config, config_id).display_name == (
+        "Main rig: Intel Corp Core i7-8700K (3.7GHz, 6 cores) / ASUS NVIDIA GTX 1080 (8GB GDDR5)"
+    )
+    assert catalog.suggest_catalog("cpu", "intel corp", 10, db)[0]["name"] == db.get(CPU, cpu_id).display_name
+
+    # Parent names come from the lookup snapshots, and unrelated updates skip the recompute.
+    brand_id, family_id = graph["cpu_brand"].id, graph["cpu_family"].id
+    catalog_cache.lookup_rows(db, CPUBrand)
+    catalog_cache.lookup_rows(db, CPUFamily)
+    db.expire_all()
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        created = cpu.create_cpu(
+            CPU(
+                model="i5-8400",
+                speed="2.8GHz",
+                core_count=6,
+                cpu_brand_id=brand_id,
+                cpu_family_id=family_id,
+            ),
+            db,
+        )
+        main_rig = db.get(Config, config_id)
+        main_rig.notes = "Retired"
+        db.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert created.display_name == "Intel Corp Core i5-8400 (2.8GHz, 6 cores)"
+    parent_tables = (f"FROM {CPUBrand.__tablename__}", f"FROM {CPUFamily.__tablename__}")
+    assert not [statement for statement in statements if any(table in statement for table in parent_tables)]
+    assert not [statement for statement in statements if f"FROM {CPU.__tablename__} " in statement]
+
+
+def test_expand_embeds_related_rows_in_batched_queries(db):
+    graph = _create_referenced_graph(db)
+    config_id, result_id = graph["config"].id, graph["result"].id
+    gpu_id = graph["gpu"].id
+    graph["config"].gpu_component_ids = f"[{gpu_id}, {gpu_id}]"
+    db.commit()
+    db.expire_all()
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        expanded = config.get_config(config_id, db, expand="cpu,gpu,motherboard,os,ram,disk,results")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 8
+    assert [entry["model"] for entry in expanded["cpu"]] == ["i7-8700K"]
+    assert [entry["vram_size"] for entry in expanded["gpu"]] == ["8GB", "8GB"]
+    assert expanded["motherboard"]["model"] == "Z370 AORUS"
+    assert expanded["ram"]["name"] == "DDR4 3200"
+    assert [entry["id"] for entry in expanded["results"]] == [result_id]
+    assert config.get_config(config_id, db).id == config_id
+
+    result = benchmark_results.get_benchmark_results(db, expand="benchmark,gpu")[0]
+    assert (result["benchmark"]["name"], len(result["gpu"])) == ("3DMark", 2)
+    assert "config" not in result
+    assert cpu.get_cpu(graph["cpu"].id, db, expand="brand,family")["family"]["name"] == "Core"
+
+    with pytest.raises(HTTPException) as exc_info:
+        config.get_configs(db, expand="cpu,benchmark")
+    assert exc_info.value.status_code == 400
+
+
+def test_fields_project_list_columns_in_the_select(db):
+    graph = _create_referenced_graph(db)
+
+    assert config.get_configs(db, fields="id,name") == [{"id": graph["config"].id, "name": "Main rig"}]
+    assert ram.get_rams(db, fields="name") == [{"name": "DDR4 3200"}]
+    assert benchmark_results.get_benchmark_results(db, min_cpu_speed_mhz=3000, fields="id,result") == [
+        {"id": graph["result"].id, "result": 12345}
+    ]
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        cpu.get_cpus(db, sort="-speed_mhz", fields="id,display_name")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert "core_count" not in statements[0] and "ORDER BY" in statements[0]
+
+    with pytest.raises(HTTPException) as exc_info:
+        gpu.get_gpus(db, fields="id,notes")
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException) as exc_info:
+        config.get_configs(db, expand="cpu", fields="id")
+    assert exc_info.value.status_code == 400
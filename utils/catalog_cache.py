@@ -0,0 +1,212 @@
+import time
+from threading import Lock
+from typing import Callable
+from uuid import uuid4
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.benchmark import BenchmarkOption
+from models.config import Config
+from models.cpu import CPU, CPUBrand, CPUFamily
+from models.disk import Disk
+from models.gpu import GPU, GPUBrand, GPUManufacturer, GPUModel, GPUVRAMType
+from models.motherboard import Motherboard, MotherboardChipset, MotherboardManufacturer
+from models.oses import OS
+from models.ram import RAM
+from models.settings import Setting
+
+# Cached views depend on one or more scopes, each with its own generation counter. Lookup, component
+# and benchmark option generations are shared by all workers through settings rows, re-read at most this often.
+GENERATION_CHECK_SECONDS = 2
+LOOKUP, COMPONENTS, USAGE, OPTIONS = "lookup", "components", "usage", "options"
+SHARED_GENERATION_KEYS = {
+    LOOKUP: "lookup_generation",
+    COMPONENTS: "catalog_generation",
+    OPTIONS: "option_generation",
+}
+# Config writes only bump this worker's usage generation, so views with usage counts are also
+# rebuilt after this long to pick up configs written by other workers.
+USAGE_REFRESH_SECONDS = 60
+
+# Small, rarely changing tables that are cached whole.
+LOOKUP_MODELS = (
+    CPUBrand, CPUFamily,
+    GPUManufacturer, GPUBrand, GPUModel, GPUVRAMType,
+    MotherboardManufacturer, MotherboardChipset,
+    RAM, Disk, OS,
+)
+
+CACHE_SCOPES = {
+    LOOKUP: LOOKUP_MODELS,
+    COMPONENTS: (CPU, GPU, Motherboard),
+    USAGE: (Config,),
+    OPTIONS: (BenchmarkOption,),
+}
+CATALOG_VIEW_SCOPES = (LOOKUP, COMPONENTS, USAGE)
+
+_catalog_lock = Lock()
+_generations = {scope: 0 for scope in CACHE_SCOPES}
+_shared_tokens: dict[str, str | None] = {}
+_shared_checked_at = float("-inf")
+_catalog_views: dict[str, tuple[tuple[int, ...], float, object]] = {}
+
+
+def catalog_generation(scope: str) -> int:
+    return _generations[scope]
+
+
+def current_generation(bind, scope: str) -> int:
+    """The generation of a scope after adopting changes published by other workers."""
+    _sync_shared_generations(bind)
+    return _generations[scope]
+
+
+def _bump_local_generations(scopes) -> None:
+    with _catalog_lock:
+        for scope in scopes:
+            _generations[scope] += 1
+
+
+def _publish_token(conn, key: str) -> str:
+    token = uuid4().hex
+    settings = Setting.__table__
+    updated = conn.execute(update(settings).where(settings.c.key == key).values(value=token)).rowcount
+    if not updated:
+        try:
+            with conn.begin_nested():
+                conn.execute(insert(settings).values(key=key, value=token))
+        except IntegrityError:
+            # Another worker created the row first; its token already invalidates everyone.
+            pass
+    return token
+
+
+def bump_catalog_generation(bind, *scopes: str) -> None:
+    """
+    Mark cached views that depend on the given scopes (all of them by default) stale in this
+    process and, for shared scopes, in every other worker. Session commits do this on their
+    own; call it after writes that bypass the ORM unit of work.
+    """
+    scopes = scopes or tuple(CACHE_SCOPES)
+    tokens = {}
+    shared = [scope for scope in scopes if scope in SHARED_GENERATION_KEYS]
+    if shared:
+        with bind.begin() as conn:
+            for scope in shared:
+                tokens[scope] = _publish_token(conn, SHARED_GENERATION_KEYS[scope])
+
+    with _catalog_lock:
+        for scope in scopes:
+            _generations[scope] += 1
+        _shared_tokens.update(tokens)
+
+
+def _sync_shared_generations(bind) -> None:
+    """Adopt changes published by other workers."""
+    global _shared_checked_at
+    now = time.monotonic()
+    if now - _shared_checked_at < GENERATION_CHECK_SECONDS:
+        return
+
+    # A connection of its own, so a transaction open on the request session cannot hide new tokens.
+    with bind.connect() as conn:
+        tokens = dict(conn.execute(
+            select(Setting.key, Setting.value).where(Setting.key.in_(SHARED_GENERATION_KEYS.values()))
+        ).all())
+    with _catalog_lock:
+        _shared_checked_at = now
+        for scope, key in SHARED_GENERATION_KEYS.items():
+            if tokens.get(key) != _shared_tokens.get(scope):
+                _shared_tokens[scope] = tokens.get(key)
+                _generations[scope] += 1
+
+
+def cached_catalog_view(db: Session, name: str, build: Callable[[], object], scopes=CATALOG_VIEW_SCOPES):
+    """Return the view built for the current generations of its scopes, building it on a miss."""
+    _sync_shared_generations(db.get_bind())
+    now = time.monotonic()
+    with _catalog_lock:
+        generation = tuple(_generations[scope] for scope in scopes)
+        entry = _catalog_views.get(name)
+        if (
+            entry is not None
+            and entry[0] == generation
+            and (USAGE not in scopes or now - entry[1] < USAGE_REFRESH_SECONDS)
+        ):
+            return entry[2]
+
+    # A write committed while building bumps the generation, so the stale result is never served.
+    value = build()
+    with _catalog_lock:
+        _catalog_views[name] = (generation, now, value)
+    return value
+
+
+def lookup_rows(db: Session, model) -> dict[int, Row]:
+    """
+    Every committed row of a lookup table by ID, as immutable rows. The snapshot is read on a
+    connection of its own so rows flushed, renamed or deleted by an open transaction never enter it.
+    """
+    table = model.__table__
+
+    def build():
+        with db.get_bind().connect() as conn:
+            return {row.id: row for row in conn.execute(select(table).order_by(table.c.id))}
+
+    return cached_catalog_view(db, f"lookup:{table.name}", build, (LOOKUP,))
+
+
+def get_lookup(db: Session, model, lookup_id: int | None) -> Row | None:
+    """
+    Read-through lookup of one row. Rows missing from the snapshot are read from the
+    session, so rows written earlier in the same transaction are found too.
+    """
+    if lookup_id is None:
+        return None
+    row = lookup_rows(db, model).get(int(lookup_id))
+    if row is None:
+        table = model.__table__
+        row = db.execute(select(table).where(table.c.id == int(lookup_id))).first()
+    return row
+
+
+def lookup_dicts(db: Session, model) -> list[dict]:
+    return [row._asdict() for row in lookup_rows(db, model).values()]
+
+
+def clear_catalog_cache() -> None:
+    global _shared_checked_at
+    with _catalog_lock:
+        _catalog_views.clear()
+        _shared_tokens.clear()
+        _shared_checked_at = float("-inf")
+
+
+@event.listens_for(Session, "after_flush")
+def _note_catalog_changes(session, _flush_context):
+    instances = (*session.new, *session.dirty, *session.deleted)
+    scopes = {
+        scope
+        for scope, models in CACHE_SCOPES.items()
+        if any(isinstance(instance, models) for instance in instances)
+    }
+    if scopes:
+        session.info.setdefault("catalog_changes", set()).update(scopes)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_after_catalog_commit(session):
+    scopes = session.info.pop("catalog_changes", None)
+    if scopes:
+        bump_catalog_generation(session.get_bind(), *scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_catalog_changes(session):
+    # Views built on the request session inside the rolled back transaction may have seen its flushed rows.
+    scopes = session.info.pop("catalog_changes", None)
+    if scopes:
+        _bump_local_generations(scopes)
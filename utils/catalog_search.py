@@ -0,0 +1,62 @@
+import re
+from bisect import bisect_left
+from typing import NamedTuple
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+class Suggestion(NamedTuple):
+    id: int
+    name: str
+    usage: int
+
+
+def search_tokens(text: str) -> list[str]:
+    """Lowercased alphanumeric words; 'i7-8700K 3.7GHz' -> ['i7', '8700k', '3', '7ghz']."""
+    return _TOKEN.findall(text.casefold())
+
+
+class PrefixIndex:
+    """
+    In-memory word-prefix index over display names. Every query word must be the
+    prefix of some word in the name; matches are ranked by usage.
+    """
+
+    def __init__(self, entries: list[Suggestion]):
+        self.entries = entries
+        self._names = [entry.name.casefold() for entry in entries]
+        self._tokens = sorted(
+            (token, position)
+            for position, entry in enumerate(entries)
+            for token in set(search_tokens(entry.name))
+        )
+        self._by_usage = sorted(range(len(entries)), key=lambda position: self._rank(position, ""))
+
+    def _rank(self, position: int, query: str):
+        # Names that start with the whole query come first, then by usage, then alphabetically.
+        return (not self._names[position].startswith(query), -self.entries[position].usage, self._names[position])
+
+    def _matching(self, prefix: str) -> set[int]:
+        start = bisect_left(self._tokens, (prefix,))
+        matches = set()
+        for token, position in self._tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            matches.add(position)
+        return matches
+
+    def search(self, query: str, limit: int) -> list[Suggestion]:
+        words = search_tokens(query)
+        if not words:
+            return [self.entries[position] for position in self._by_usage[:limit]]
+
+        candidates = None
+        for word in sorted(set(words), key=len, reverse=True):
+            matches = self._matching(word)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        query = query.strip().casefold()
+        ranked = sorted(candidates, key=lambda position: self._rank(position, query))
+        return [self.entries[position] for position in ranked[:limit]]
@@ -0,0 +1,113 @@
+from collections import defaultdict
+
+from fastapi import HTTPException
+from sqlalchemy import exists, insert, literal, select, union_all
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlmodel import Session
+
+from utils.catalog_cache import LOOKUP_MODELS, lookup_rows
+
+MULTI_ROW_INSERT_SIZE = 500
+
+
+def insert_returning_ids(db: Session, model, rows: list[dict]) -> list[int]:
+    """
+    Insert rows with a single executemany and return their generated IDs in row order.
+    Dialects without executemany RETURNING (MySQL) fall back to one INSERT per row.
+    """
+    if not rows:
+        return []
+
+    table = model.__table__
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows)
+        return list(result.scalars())
+
+    return [db.execute(insert(table), row).inserted_primary_key[0] for row in rows]
+
+
+def insert_ignoring_conflicts(db: Session, model, rows: list[dict], conflict_columns: list[str]) -> None:
+    """
+    Insert rows as multi-row VALUES statements, leaving rows that hit the unique key untouched.
+    MySQL uses ON DUPLICATE KEY UPDATE with a no-op assignment, SQLite/PostgreSQL use ON CONFLICT DO NOTHING.
+    """
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+
+    for start in range(0, len(rows), MULTI_ROW_INSERT_SIZE):
+        chunk = rows[start:start + MULTI_ROW_INSERT_SIZE]
+        if dialect == "mysql":
+            statement = mysql.insert(table).values(chunk)
+            statement = statement.on_duplicate_key_update(
+                {column: statement.inserted[column] for column in conflict_columns}
+            )
+        elif dialect in ("sqlite", "postgresql"):
+            dialect_module = sqlite if dialect == "sqlite" else postgresql
+            statement = dialect_module.insert(table).values(chunk).on_conflict_do_nothing(
+                index_elements=conflict_columns
+            )
+        else:
+            statement = insert(table).values(chunk)
+        db.execute(statement)
+
+
+def missing_references(db: Session, references: list[tuple[object, list[int | None]]]) -> list:
+    """
+    Check referenced IDs of several tables with one UNION ALL query.
+    Takes (model, ids) pairs and returns the models, in the given order, with at least one unknown or None ID.
+    """
+    found = defaultdict(set)
+    queries = []
+    for index, (model, ids) in enumerate(references):
+        known_ids = {int(value) for value in ids if value is not None}
+        if model in LOOKUP_MODELS:
+            # Lookup tables are answered from the catalog cache; only IDs it lacks reach the database.
+            cached = known_ids & lookup_rows(db, model).keys()
+            found[index] |= cached
+            known_ids -= cached
+        if known_ids:
+            table = model.__table__
+            queries.append(select(literal(index).label("ref"), table.c.id).where(table.c.id.in_(known_ids)))
+
+    if queries:
+        statement = queries[0] if len(queries) == 1 else union_all(*queries)
+        for ref, found_id in db.execute(statement):
+            found[ref].add(found_id)
+
+    return [
+        model
+        for index, (model, ids) in enumerate(references)
+        if not ids or any(value is None or int(value) not in found[index] for value in ids)
+    ]
+
+
+def require_references(db: Session, checks: list[tuple[object, int | list[int | None] | None, str]]) -> None:
+    """
+    Validate (model, id or ids, detail) reference checks with one query.
+    Raises a 400 with the detail of the first failing check, in the given order.
+    """
+    references = [(model, ids if isinstance(ids, list) else [ids]) for model, ids, _detail in checks]
+    missing = missing_references(db, references)
+    for model, _ids, detail in checks:
+        if model in missing:
+            raise HTTPException(status_code=400, detail=detail)
+
+
+def commit_and_return(db: Session, instance):
+    """
+    Commit and hand the instance back without expiring it, so serializing it needs no follow-up SELECT.
+    Generated IDs are already on the instance: the flush reads them from the INSERT (RETURNING or lastrowid).
+    """
+    db.add(instance)
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+    return instance
+
+
+def is_referenced(db: Session, *conditions) -> bool:
+    """EXISTS check for delete guards; the conditions should be covered by an index."""
+    return bool(db.execute(select(exists().where(*conditions))).scalar())
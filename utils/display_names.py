@@ -0,0 +1,55 @@
+from collections import Counter
+
+# Room for long multi-CPU config summaries while still fitting a MySQL index.
+DISPLAY_NAME_LENGTH = 255
+
+
+def _compact(parts) -> str:
+    return " ".join(str(part).strip() for part in parts if part is not None and str(part).strip())
+
+
+def _with_details(name: str, details) -> str:
+    details = [str(detail).strip() for detail in details if detail is not None and str(detail).strip()]
+    return f"{name} ({', '.join(details)})" if details else name
+
+
+def cpu_display_name(
+    brand: str | None,
+    family: str | None,
+    model: str | None,
+    speed: str | None,
+    core_count: int | None,
+) -> str:
+    """'Intel Pentium III 700 (700MHz, 1 cores)', matching getCPUDisplayName in the web UI."""
+    return _with_details(_compact([brand, family, model]), [speed, f"{core_count} cores" if core_count else None])
+
+
+def gpu_display_name(
+    manufacturer: str | None,
+    brand: str | None,
+    model: str | None,
+    vram_size: str | None,
+    vram_type: str | None,
+) -> str:
+    """'Leadtek NVIDIA TNT2 Ultra (32MB SDR)', matching getGPUDisplayName in the web UI."""
+    vram = _compact([vram_size, vram_type])
+    return _with_details(_compact([manufacturer, brand, model]), [vram])
+
+
+def motherboard_display_name(manufacturer: str | None, model: str | None, chipset: str | None) -> str:
+    """'ASUS P3B-F (Intel 440BX)', matching getMotherboardDisplayName in the web UI."""
+    return _with_details(_compact([manufacturer, model]), [chipset])
+
+
+def summarize_components(names) -> list[str]:
+    """Count repeated components in slot order: ['A', 'A', 'B'] -> ['2x A', 'B'], like summarizeComponents."""
+    counts = Counter(name for name in names if name)
+    return [f"{count}x {name}" if count > 1 else name for name, count in counts.items()]
+
+
+def config_display_name(name: str, cpu_names, gpu_names) -> str:
+    """'Retro rig: 2x Intel Pentium III 700 (700MHz, 1 cores) / Leadtek NVIDIA TNT2 Ultra (32MB SDR)'."""
+    hardware = " / ".join(
+        ", ".join(summary) for summary in (summarize_components(cpu_names), summarize_components(gpu_names)) if summary
+    )
+    return f"{name}: {hardware}" if hardware else name
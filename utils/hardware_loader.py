@@ -9,7 +9,8 @@ from typing import Iterable, Iterator
 from sqlalchemy import text
 from sqlalchemy.engine import Connection
 
-from database import engine
+from database import backfill_display_names, backfill_name_keys, backfill_parsed_units, engine
+from utils.catalog_cache import bump_catalog_generation
 
 # --- Era → files mapping ------------------------------------------------------
 
@@ -268,6 +269,13 @@ def run_if_enabled() -> dict | None:
                 trans.rollback()
                 raise
 
+            # The seed files insert through raw SQL, so the ORM never filled name_key, the parsed
+            # unit columns or display_name.
+            backfill_name_keys()
+            backfill_parsed_units()
+            backfill_display_names()
+            bump_catalog_generation(engine)
+
             finished = datetime.utcnow()
             took_ms = int((finished - started).total_seconds() * 1000)
 
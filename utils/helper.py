@@ -1,26 +1,140 @@
 from fastapi import HTTPException
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 
+from models.name_key import normalize_name_key
+
+
+def normalize_name(name: str) -> str:
+    """Strip leading and trailing spaces; a name that is empty afterwards is rejected."""
+    normalized_name = name.strip()
+    if not normalized_name:
+        raise HTTPException(status_code=400, detail="Name cannot be empty")
+    return normalized_name
+
 
 def validate_and_normalize_name(name: str, db: Session, model_class, current_id: int = None):
     """
     Validates and normalizes the name field:
-    - Strips leading and trailing spaces.
-    - Checks for case-insensitive uniqueness in the database.
+    - Strips leading and trailing spaces and rejects empty names.
+    - Checks for case-insensitive uniqueness in the database through the indexed name_key.
     - Allows updates to the same record (if current_id is provided).
     """
-    normalized_name = name.strip()
+    normalized_name = normalize_name(name)
 
-    print(f"Normalized Name: {normalized_name}, Current ID: {current_id}")
+    query = select(model_class.id).where(model_class.name_key == normalize_name_key(normalized_name))
+    if current_id is not None:
+        query = query.where(model_class.id != current_id)
 
-    query = select(model_class).where(model_class.name.ilike(normalized_name))
-    existing_entry = db.exec(query).first()
+    if db.exec(query.limit(1)).first() is not None:
+        raise HTTPException(status_code=400, detail="Name already exists")
 
-    if existing_entry:
-        print(f"Existing Entry: {existing_entry.name}, ID: {existing_entry.id}")
+    return normalized_name
 
-    if existing_entry:
-        if current_id is None or existing_entry.id != current_id:
-            raise HTTPException(status_code=400, detail="Name already exists")
 
-    return normalized_name
+def apply_range_filter(statement, column, minimum=None, maximum=None):
+    """Inclusive range filter on a numeric column; either bound may be omitted."""
+    if minimum is not None:
+        statement = statement.where(column >= minimum)
+    if maximum is not None:
+        statement = statement.where(column <= maximum)
+    return statement
+
+
+def apply_sort(statement, sort: str | None, columns: dict, tie_breaker=None):
+    """
+    Order by one of the allowed columns, 'name' ascending or '-name' descending.
+    Rows without a value sort last in both directions.
+    """
+    if not sort:
+        return statement
+    descending = sort.startswith("-")
+    key = sort[1:] if descending else sort
+    if key not in columns:
+        raise HTTPException(status_code=400, detail=f"Invalid sort. Use: {', '.join(columns)}")
+
+    column = columns[key]
+    statement = statement.order_by(column.is_(None), column.desc() if descending else column.asc())
+    if tie_breaker is not None:
+        statement = statement.order_by(tie_breaker)
+    return statement
+
+
+def parse_expand(expand: str | None, relationships: dict) -> dict:
+    """
+    Pick the requested relationships from a comma separated list, e.g. 'cpu,gpu'.
+    Values of relationships are a relationship attribute or a tuple path through several;
+    a path through a collection embeds a list.
+    """
+    expansions = {}
+    for name in (expand or "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in relationships:
+            raise HTTPException(status_code=400, detail=f"Invalid expand. Use: {', '.join(relationships)}")
+        path = relationships[name]
+        expansions[name] = path if isinstance(path, tuple) else (path,)
+    return expansions
+
+
+def apply_expand(statement, expansions: dict):
+    """
+    Load every expanded relationship with one batched selectin query per level;
+    many-to-one hops below the first level are joined into the query of the level above.
+    """
+    for path in expansions.values():
+        loader = selectinload(path[0])
+        for attribute in path[1:]:
+            loader = loader.selectinload(attribute) if attribute.property.uselist else loader.joinedload(attribute)
+        statement = statement.options(loader)
+    return statement
+
+
+def expand_row(row, expansions: dict):
+    """The row itself without expansions, else its fields with each expansion embedded under its name."""
+    if not expansions:
+        return row
+
+    data = row.model_dump()
+    for name, path in expansions.items():
+        value = row
+        for attribute in path:
+            if isinstance(value, list):
+                value = [getattr(item, attribute.key) for item in value]
+            else:
+                value = getattr(value, attribute.key) if value is not None else None
+        if isinstance(value, list):
+            data[name] = [item.model_dump() for item in value if item is not None]
+        else:
+            data[name] = value.model_dump() if value is not None else None
+    return data
+
+
+def parse_fields(fields: str | None, model) -> list:
+    """Columns of the model named in a comma separated list, e.g. 'id,name'; empty means whole rows."""
+    columns = model.__table__.c
+    selected = []
+    for name in (fields or "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in columns:
+            raise HTTPException(status_code=400, detail=f"Invalid fields. Use: {', '.join(columns.keys())}")
+        if columns[name] not in selected:
+            selected.append(columns[name])
+    return selected
+
+
+def list_rows(db: Session, statement, columns: list | None = None, expansions: dict | None = None) -> list:
+    """
+    Run a list query. With columns, only those are selected and returned as plain dicts,
+    without building ORM instances; otherwise whole rows with any expansions embedded.
+    """
+    if columns:
+        if expansions:
+            raise HTTPException(status_code=400, detail="fields cannot be combined with expand")
+        return [dict(row) for row in db.execute(statement.with_only_columns(*columns)).mappings()]
+
+    expansions = expansions or {}
+    return [expand_row(row, expansions) for row in db.exec(apply_expand(statement, expansions)).all()]
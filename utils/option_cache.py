@@ -0,0 +1,70 @@
+from threading import Lock
+from typing import NamedTuple
+
+from sqlmodel import Session, select
+
+from models.benchmark import BenchmarkOption
+from utils.catalog_cache import OPTIONS, current_generation
+
+
+class CachedOption(NamedTuple):
+    """Detached snapshot of the BenchmarkOption fields used to build result settings."""
+    id: int
+    benchmark_id: int
+    name: str
+
+
+_option_cache_lock = Lock()
+# benchmark ID -> (options generation, options)
+_option_cache: dict[int, tuple[int, list[CachedOption]]] = {}
+# Bumped by every invalidation, so a load that raced with one is not stored.
+_option_versions: dict[int, int] = {}
+
+
+def get_benchmark_options(db: Session, benchmark_ids) -> dict[int, list[CachedOption]]:
+    """
+    Options of every given benchmark in display order. Cached per benchmark until the option
+    handlers invalidate it or any worker commits an option change (the shared options generation).
+    """
+    benchmark_ids = set(benchmark_ids)
+    generation = current_generation(db.get_bind(), OPTIONS)
+    options = {}
+    with _option_cache_lock:
+        for benchmark_id in benchmark_ids:
+            entry = _option_cache.get(benchmark_id)
+            if entry is not None and entry[0] == generation:
+                options[benchmark_id] = entry[1]
+        versions = {
+            benchmark_id: _option_versions.get(benchmark_id, 0)
+            for benchmark_id in benchmark_ids
+            if benchmark_id not in options
+        }
+
+    if versions:
+        loaded = {benchmark_id: [] for benchmark_id in versions}
+        for row in db.exec(
+            select(BenchmarkOption.id, BenchmarkOption.benchmark_id, BenchmarkOption.name)
+            .where(BenchmarkOption.benchmark_id.in_(versions))
+            .order_by(BenchmarkOption.sort_order, BenchmarkOption.id)
+        ).all():
+            loaded[row.benchmark_id].append(CachedOption(*row))
+        with _option_cache_lock:
+            for benchmark_id, benchmark_options in loaded.items():
+                if _option_versions.get(benchmark_id, 0) == versions[benchmark_id]:
+                    _option_cache[benchmark_id] = (generation, benchmark_options)
+        options.update(loaded)
+
+    return options
+
+
+def invalidate_benchmark_options(*benchmark_ids: int | None) -> None:
+    with _option_cache_lock:
+        for benchmark_id in benchmark_ids:
+            _option_cache.pop(benchmark_id, None)
+            _option_versions[benchmark_id] = _option_versions.get(benchmark_id, 0) + 1
+
+
+def clear_option_cache() -> None:
+    with _option_cache_lock:
+        _option_cache.clear()
+        _option_versions.clear()
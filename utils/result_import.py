@@ -0,0 +1,191 @@
+import csv
+import io
+import json
+from typing import BinaryIO, Callable, Iterator
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+
+from models.benchmark import Benchmark, BenchmarkOption
+from models.config import Config
+from utils.result_ingest import ingest_results
+
+IMPORT_FORMATS = ("csv", "ndjson")
+OPTION_COLUMN_PREFIX = "option:"
+MAX_REPORTED_ERRORS = 100
+
+
+def detect_format(filename: str | None, requested: str | None = None) -> str:
+    if requested:
+        if requested not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format '{requested}'. Use: {', '.join(IMPORT_FORMATS)}")
+        return requested
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    raise ValueError("Cannot detect import format from the file name; pass format=csv or format=ndjson")
+
+
+def iter_import_rows(stream: BinaryIO, file_format: str) -> Iterator[tuple[dict | None, str | None]]:
+    """
+    Yield (row, error) pairs one data row at a time without reading the whole file.
+    NDJSON lines are decoded one by one, so a line that is not UTF-8 is a row error; CSV records can
+    span lines, so undecodable or malformed CSV raises UnicodeDecodeError or csv.Error.
+    """
+    if file_format == "csv":
+        for row in csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")):
+            yield {key.strip(): value for key, value in row.items() if key is not None}, None
+        return
+
+    for number, raw_line in enumerate(stream):
+        try:
+            line = raw_line.decode("utf-8-sig" if number == 0 else "utf-8").strip()
+        except UnicodeDecodeError:
+            yield None, "Invalid UTF-8"
+            continue
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            yield None, "Invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield None, "Each line must be a JSON object"
+            continue
+        yield row, None
+
+
+class ImportLookups:
+    """Name → ID maps for configs, benchmarks and benchmark options, loaded once per import."""
+
+    def __init__(self, db: Session):
+        self.configs = {name.casefold(): config_id for config_id, name in db.exec(select(Config.id, Config.name)).all()}
+        self.benchmarks = {
+            name.casefold(): benchmark_id for benchmark_id, name in db.exec(select(Benchmark.id, Benchmark.name)).all()
+        }
+        self.options = {
+            (benchmark_id, name.casefold()): option_id
+            for option_id, benchmark_id, name in db.exec(
+                select(BenchmarkOption.id, BenchmarkOption.benchmark_id, BenchmarkOption.name)
+            ).all()
+        }
+
+    def resolve(self, row: dict) -> dict:
+        """Turn an import row into an ingest row; raises ValueError for unknown names."""
+        config_id = row.get("config_id")
+        if config_id in (None, "") and row.get("config"):
+            config_id = self.configs.get(str(row["config"]).strip().casefold())
+            if config_id is None:
+                raise ValueError(f"Unknown config '{row['config']}'")
+
+        benchmark_id = row.get("benchmark_id")
+        if benchmark_id in (None, "") and row.get("benchmark"):
+            benchmark_id = self.benchmarks.get(str(row["benchmark"]).strip().casefold())
+            if benchmark_id is None:
+                raise ValueError(f"Unknown benchmark '{row['benchmark']}'")
+
+        option_values = row.get("option_values") or None
+        named_options = {
+            key[len(OPTION_COLUMN_PREFIX):].strip(): value
+            for key, value in row.items()
+            if key.startswith(OPTION_COLUMN_PREFIX) and value not in (None, "")
+        }
+        if named_options:
+            try:
+                benchmark_key = int(benchmark_id)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid benchmark ID")
+            option_values = {}
+            for name, value in named_options.items():
+                option_id = self.options.get((benchmark_key, name.casefold()))
+                if option_id is None:
+                    raise ValueError(f"Unknown option '{name}' for this benchmark")
+                option_values[str(option_id)] = value
+
+        return {
+            "benchmark_id": benchmark_id,
+            "config_id": config_id,
+            "result": row.get("result"),
+            "option_values": option_values,
+            "settings": row.get("settings"),
+            "timestamp": row.get("timestamp"),
+            "notes": row.get("notes"),
+        }
+
+
+def import_results(
+    db: Session,
+    rows: Iterator[tuple[dict | None, str | None]],
+    chunk_size: int = 1000,
+    start_row: int = 0,
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Ingest parsed import rows, committing every chunk_size rows.
+    Rows before start_row are skipped so a failed import can resume from the reported next_row.
+    """
+    lookups = ImportLookups(db)
+    summary = {
+        "processed": 0,
+        "created": 0,
+        "duplicates": 0,
+        "failed": 0,
+        "chunks": 0,
+        "next_row": start_row,
+        "errors": [],
+        "aborted": None,
+    }
+
+    def record_error(index: int, detail: str):
+        summary["failed"] += 1
+        if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+            summary["errors"].append({"row": index, "detail": detail})
+
+    chunk = []
+    chunk_indexes = []
+
+    def flush(end_row: int):
+        if chunk:
+            created, duplicates, errors = ingest_results(db, chunk)
+            db.commit()
+            summary["created"] += created
+            summary["duplicates"] += duplicates
+            for error in errors:
+                record_error(chunk_indexes[error["index"]], error["detail"])
+            summary["chunks"] += 1
+        summary["next_row"] = end_row
+        chunk.clear()
+        chunk_indexes.clear()
+        if progress is not None:
+            progress(summary)
+
+    index = -1
+    try:
+        try:
+            for index, (row, error) in enumerate(rows):
+                if index < start_row:
+                    continue
+                summary["processed"] += 1
+                if error is None:
+                    try:
+                        chunk.append(lookups.resolve(row))
+                        chunk_indexes.append(index)
+                    except ValueError as exc:
+                        error = str(exc)
+                if error is not None:
+                    record_error(index, error)
+                if len(chunk) >= chunk_size:
+                    flush(index + 1)
+        except (UnicodeDecodeError, csv.Error, json.JSONDecodeError) as exc:
+            # The file cannot be read past here; rows parsed before it are still stored below.
+            summary["aborted"] = f"Unreadable input after row {index}: {exc}"
+        flush(max(index + 1, start_row))
+    except SQLAlchemyError as exc:
+        # Earlier chunks are committed; report where to resume instead of failing the request.
+        db.rollback()
+        summary["aborted"] = str(exc)
+
+    return summary
@@ -0,0 +1,231 @@
+import hashlib
+import json
+
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from models.benchmark import Benchmark
+from models.benchmark_results import BenchmarkResult, BenchmarkResultOption
+from models.config import Config
+from utils.db_write import MULTI_ROW_INSERT_SIZE, insert_ignoring_conflicts, insert_returning_ids
+from utils.option_cache import CachedOption, get_benchmark_options
+from utils.result_settings import generate_settings, parse_option_values
+
+RESULT_FIELDS = ("benchmark_id", "config_id", "result", "option_values", "settings", "timestamp", "notes")
+# Columns the content hash is built from.
+RESULT_HASH_FIELDS = ("config_id", "benchmark_id", "settings_key", "result", "timestamp")
+
+
+def _as_id(value, detail: str) -> int:
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(detail)
+    if parsed < 1:
+        raise ValueError(detail)
+    return parsed
+
+
+def _as_text(value) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def result_content_hash(values: dict, idempotency_key: str | None = None, index: int = 0) -> str | None:
+    """
+    Deduplication key of a result: config, benchmark, settings key, result and timestamp. Without an
+    idempotency key a result without a timestamp cannot be told apart from another run with the same
+    score, so it gets no hash and is never deduplicated. With a key, the key and the row's position in
+    the request are hashed too, so a retried request maps onto the same rows.
+    """
+    content = [
+        values["config_id"],
+        values["benchmark_id"],
+        values.get("settings_key"),
+        repr(float(values["result"])),
+        values.get("timestamp"),
+    ]
+    if idempotency_key:
+        content = ["idempotency", idempotency_key, index, *content]
+    elif values.get("timestamp") is None:
+        return None
+    return hashlib.sha1(json.dumps(content, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def result_idempotency_hash(idempotency_key: str | None, index: int = 0) -> str | None:
+    """Identifies the row at an index of a keyed request, whatever its body; None without a key."""
+    if not idempotency_key:
+        return None
+    canonical = json.dumps(["idempotency", idempotency_key, index], separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def result_ids_by_hash(db: Session, hashes: list[str]) -> dict[str, int]:
+    """Map content hashes to existing result IDs through the unique content_hash index."""
+    found = {}
+    for start in range(0, len(hashes), MULTI_ROW_INSERT_SIZE):
+        chunk = hashes[start:start + MULTI_ROW_INSERT_SIZE]
+        found.update(
+            db.exec(
+                select(BenchmarkResult.content_hash, BenchmarkResult.id)
+                .where(BenchmarkResult.content_hash.in_(chunk))
+            ).all()
+        )
+    return found
+
+
+def content_hashes_by_idempotency_hash(db: Session, hashes: list[str]) -> dict[str, str | None]:
+    """Content hashes of the rows already stored for the given keyed request rows."""
+    found = {}
+    for start in range(0, len(hashes), MULTI_ROW_INSERT_SIZE):
+        chunk = hashes[start:start + MULTI_ROW_INSERT_SIZE]
+        found.update(
+            db.exec(
+                select(BenchmarkResult.idempotency_hash, BenchmarkResult.content_hash)
+                .where(BenchmarkResult.idempotency_hash.in_(chunk))
+            ).all()
+        )
+    return found
+
+
+def prepare_result_row(
+    row: dict,
+    known_benchmarks: set[int],
+    known_configs: set[int],
+    options_by_benchmark: dict[int, list[CachedOption]],
+) -> tuple[dict, list[tuple[int, str]]]:
+    """
+    Validate one incoming result and build its insert values.
+    Returns (benchmarkresult values, selected (option_id, value) pairs); raises ValueError with a row-level message.
+    """
+    benchmark_id = _as_id(row.get("benchmark_id"), "Invalid benchmark ID")
+    if benchmark_id not in known_benchmarks:
+        raise ValueError("Invalid benchmark ID")
+    config_id = _as_id(row.get("config_id"), "Invalid config ID")
+    if config_id not in known_configs:
+        raise ValueError("Invalid config ID")
+
+    try:
+        result = float(row.get("result"))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid result value")
+
+    raw_option_values = row.get("option_values")
+    if isinstance(raw_option_values, dict):
+        raw_option_values = json.dumps(raw_option_values)
+    raw_option_values = _as_text(raw_option_values)
+    option_values = parse_option_values(raw_option_values)
+    settings, key, selected = generate_settings(
+        option_values,
+        options_by_benchmark.get(benchmark_id, []) if option_values else [],
+        _as_text(row.get("settings")),
+    )
+
+    values = {
+        "benchmark_id": benchmark_id,
+        "config_id": config_id,
+        "result": result,
+        "option_values": raw_option_values,
+        "settings": settings,
+        "settings_key": key,
+        "timestamp": _as_text(row.get("timestamp")),
+        "notes": _as_text(row.get("notes")),
+    }
+    return values, [(option.id, value) for option, value in selected]
+
+
+def ingest_results(
+    db: Session,
+    rows: list[dict],
+    start_index: int = 0,
+    idempotency_key: str | None = None,
+) -> tuple[int, int, list[dict]]:
+    """
+    Validate and insert a batch of results in the caller's transaction (nothing is committed).
+    Referenced benchmarks and configs are checked with one IN query each, options are loaded once
+    for every benchmark involved, and valid rows are written with multi-row inserts that skip
+    results whose content hash already exists.
+    Returns (rows created, duplicate rows skipped, [{"index": ..., "detail": ...}] for rejected rows).
+    """
+    benchmark_ids = set()
+    config_ids = set()
+    for row in rows:
+        for field, ids in (("benchmark_id", benchmark_ids), ("config_id", config_ids)):
+            try:
+                ids.add(int(row.get(field)))
+            except (TypeError, ValueError):
+                pass
+
+    known_benchmarks = set()
+    if benchmark_ids:
+        known_benchmarks = set(db.exec(select(Benchmark.id).where(Benchmark.id.in_(benchmark_ids))).all())
+    known_configs = set()
+    if config_ids:
+        known_configs = set(db.exec(select(Config.id).where(Config.id.in_(config_ids))).all())
+    options_by_benchmark = get_benchmark_options(db, known_benchmarks)
+
+    prepared = {}
+    unhashed = []
+    errors = []
+    accepted = 0
+    for index, row in enumerate(rows, start=start_index):
+        try:
+            values, selected = prepare_result_row(row, known_benchmarks, known_configs, options_by_benchmark)
+        except ValueError as exc:
+            errors.append({"index": index, "detail": str(exc)})
+            continue
+        accepted += 1
+        values["content_hash"] = result_content_hash(values, idempotency_key, index)
+        values["idempotency_hash"] = result_idempotency_hash(idempotency_key, index)
+        if values["content_hash"] is None:
+            unhashed.append((values, selected))
+        else:
+            prepared.setdefault(values["content_hash"], (index, values, selected))
+
+    if idempotency_key:
+        # A key reused with another body must neither resolve to the earlier rows nor sit next to them.
+        stored = content_hashes_by_idempotency_hash(
+            db, [values["idempotency_hash"] for _index, values, _selected in prepared.values()]
+        )
+        for content_hash, (index, values, _selected) in list(prepared.items()):
+            if stored.get(values["idempotency_hash"], content_hash) != content_hash:
+                del prepared[content_hash]
+                accepted -= 1
+                errors.append({"index": index, "detail": "Idempotency key was already used with a different result"})
+        errors.sort(key=lambda error: error["index"])
+
+    existing = result_ids_by_hash(db, list(prepared))
+    new_rows = [
+        (values, selected)
+        for content_hash, (_index, values, selected) in prepared.items()
+        if content_hash not in existing
+    ]
+    insert_ignoring_conflicts(db, BenchmarkResult, [values for values, _selected in new_rows], ["content_hash"])
+
+    option_rows = []
+    with_options = [(values, selected) for values, selected in new_rows if selected]
+    if with_options:
+        result_ids = result_ids_by_hash(db, [values["content_hash"] for values, _selected in with_options])
+        option_rows = [
+            {"result_id": result_ids[values["content_hash"]], "option_id": option_id, "value": value}
+            for values, selected in with_options
+            for option_id, value in selected
+        ]
+
+    # Rows without a hash are always new; only those with options need their IDs back.
+    plain = [values for values, selected in unhashed if not selected]
+    if plain:
+        db.execute(insert(BenchmarkResult.__table__), plain)
+    optioned = [(values, selected) for values, selected in unhashed if selected]
+    optioned_ids = insert_returning_ids(db, BenchmarkResult, [values for values, _selected in optioned])
+    option_rows.extend(
+        {"result_id": result_id, "option_id": option_id, "value": value}
+        for result_id, (_values, selected) in zip(optioned_ids, optioned)
+        for option_id, value in selected
+    )
+    insert_ignoring_conflicts(db, BenchmarkResultOption, option_rows, ["result_id", "option_id"])
+
+    created = len(new_rows) + len(unhashed)
+    return created, accepted - created, errors
@@ -0,0 +1,90 @@
+import hashlib
+import json
+
+# Longest benchmark_result_option value; keeps the (option_id, value) index within MySQL's key size.
+OPTION_VALUE_LENGTH = 191
+
+
+def dedupe_setting_parts(value: str | None) -> str:
+    """Same normalization as dedupeSettingParts in the web UI."""
+    parts = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if part and part not in parts:
+            parts.append(part)
+    return ", ".join(parts)
+
+
+def parse_option_values(raw: str | None) -> dict[str, str]:
+    """Parse a result's option_values JSON into {option_id: value}; raises ValueError when malformed."""
+    if not raw:
+        return {}
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError:
+        raise ValueError("Invalid result option values")
+    if not isinstance(parsed, dict):
+        raise ValueError("Invalid result option values")
+    values = {str(key): str(value).strip() for key, value in parsed.items() if str(value).strip()}
+    if any(len(value) > OPTION_VALUE_LENGTH for value in values.values()):
+        raise ValueError(f"Result option values are limited to {OPTION_VALUE_LENGTH} characters")
+    return values
+
+
+def selected_options(option_values: dict[str, str], options: list) -> list[tuple]:
+    """Pair each option (in option order) with its selected value, skipping unselected ones."""
+    return [
+        (option, option_values[str(option.id)])
+        for option in options
+        if option_values.get(str(option.id))
+    ]
+
+
+def generate_settings(
+    option_values: dict[str, str],
+    options: list,
+    settings: str | None,
+) -> tuple[str | None, str, list[tuple]]:
+    """
+    Build the stored settings label of a result from its selected options and custom settings.
+    Returns (settings, settings_key, selected options).
+    """
+    selected = selected_options(option_values, options)
+    labels = [f"{option.name}: {value}" for option, value in selected]
+    generated_settings, custom_settings = split_settings(settings, labels)
+
+    if labels:
+        settings = ", ".join([generated_settings] + ([custom_settings] if custom_settings else []))
+    else:
+        settings = custom_settings or None
+    return settings, settings_key([(option.id, value) for option, value in selected], custom_settings), selected
+
+
+def split_settings(settings: str | None, labels: list[str]) -> tuple[str, str]:
+    """
+    Split a result's settings into the label generated from its options and the custom remainder.
+    Returns (generated_settings, custom_settings).
+    """
+    generated_settings = ", ".join(labels)
+    custom_settings = (settings or "").strip()
+    if generated_settings and custom_settings == generated_settings:
+        custom_settings = ""
+    elif generated_settings and custom_settings.startswith(f"{generated_settings}, "):
+        custom_settings = custom_settings[len(generated_settings) + 2:].strip()
+    return generated_settings, custom_settings
+
+
+def settings_key(selected: list[tuple[int, str]], custom_settings: str | None) -> str:
+    """
+    Fixed-width key identifying a settings group: the selected option IDs/values in
+    option order plus the normalized custom settings.
+    """
+    canonical = json.dumps(
+        {
+            "options": [[int(option_id), value] for option_id, value in selected],
+            "custom": dedupe_setting_parts(custom_settings),
+        },
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,252 @@
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from sqlmodel import Session
+
+from utils.result_import import MAX_REPORTED_ERRORS, OPTION_COLUMN_PREFIX, ImportLookups
+from utils.result_ingest import ingest_results
+
+# A parser takes the decoded text of one tool output file and returns result rows:
+# {"benchmark": name, "result": float, "options": {option name: value}, "timestamp": iso or None}
+ToolParser = Callable[[str], list[dict]]
+
+TOOL_PARSERS: dict[str, tuple[re.Pattern, ToolParser]] = {}
+
+
+def register_parser(tool: str, detect: str):
+    """Register a parser under a tool name; detect is a regex that recognizes the tool's output."""
+    def decorator(parser: ToolParser) -> ToolParser:
+        TOOL_PARSERS[tool] = (re.compile(detect, re.IGNORECASE), parser)
+        return parser
+    return decorator
+
+
+def _number(value: str) -> float:
+    return float(value.replace(",", ""))
+
+
+def _result_row(benchmark: str, result: float, options: dict | None = None, timestamp: str | None = None) -> dict:
+    return {
+        "benchmark": benchmark,
+        "result": result,
+        "options": {name: value for name, value in (options or {}).items() if value},
+        "timestamp": timestamp,
+    }
+
+
+@register_parser("superpi", r"\d+h\s*\d+m\s*\d+(?:\.\d+)?s")
+def parse_superpi(text: str) -> list[dict]:
+    times = re.findall(r"(\d+)h\s*(\d+)m\s*(\d+(?:\.\d+)?)s", text)
+    digits = re.search(r"(\d+[KM])\s*digits", text, re.IGNORECASE)
+    if not times or not digits:
+        raise ValueError("SuperPi log has no digit count or timing")
+    hours, minutes, seconds = times[-1]
+    elapsed = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return [_result_row(f"SuperPi {digits.group(1).upper()}", round(elapsed, 3))]
+
+
+_QUAKE_DEMO = re.compile(r"\b(?:timedemo|playdemo|demomap|map)\s+([a-z][\w-]*)", re.IGNORECASE)
+_QUAKE_RESULT = re.compile(
+    r"(\d+)\s+frames(,)?\s+(\d+(?:\.\d+)?)\s+seconds:?\s+(\d+(?:\.\d+)?)\s+fps",
+    re.IGNORECASE,
+)
+
+
+@register_parser("quake", r"\d+\s+frames,?\s+\d+(?:\.\d+)?\s+seconds")
+def parse_quake_timedemo(text: str) -> list[dict]:
+    """Quake console logs; Quake II prints 'N frames, S seconds: F fps', Quake 'N frames S seconds F fps'."""
+    rows = []
+    demo = None
+    for line in text.splitlines():
+        demo_match = _QUAKE_DEMO.search(line)
+        if demo_match:
+            demo = demo_match.group(1).lower()
+        result = _QUAKE_RESULT.search(line)
+        if result is None:
+            continue
+        fps = float(result.group(4))
+        if result.group(2):
+            rows.append(_result_row(f"Quake II {(demo or 'timedemo').capitalize()}", fps))
+        else:
+            rows.append(_result_row("Quake Timedemo", fps, {"Demo": demo}))
+    if not rows:
+        raise ValueError("Quake log has no timedemo results")
+    return rows
+
+
+_3DMARK_VERSION = re.compile(r"3DMark\s*(2001\s*SE|2001|2000|99|03|05|06)", re.IGNORECASE)
+
+
+@register_parser("3dmark", r"3DMark")
+def parse_3dmark(text: str) -> list[dict]:
+    version = _3DMARK_VERSION.search(text)
+    score = re.search(r"(\d[\d,]*)\s*3DMarks\b", text) or re.search(
+        r"3DMark\s*Score\s*[:=]?\s*(\d[\d,]*)", text, re.IGNORECASE
+    )
+    if version is None or score is None:
+        raise ValueError("3DMark export has no version or score")
+
+    options = {}
+    resolution = re.search(r"(\d{3,4})\s*[x×]\s*(\d{3,4})", text)
+    if resolution:
+        options["Resolution"] = f"{resolution.group(1)} x {resolution.group(2)}"
+    color_depth = re.search(r"\b(16|32)[- ]?bit", text, re.IGNORECASE)
+    if color_depth:
+        options["Color Depth"] = f"{color_depth.group(1)} bit"
+
+    name = "3DMark" + re.sub(r"\s+", " ", version.group(1).upper())
+    return [_result_row(name, _number(score.group(1)), options)]
+
+
+_CDM_SEQUENTIAL = (
+    r"(?:SEQ|Sequential)\s*{read}(?:\d+\s*[KM]i?B\s*)?"
+    r"(?:\(Q=\s*(\d+),\s*T=\s*(\d+)\)\s*)?:\s*(\d+(?:\.\d+)?)\s*MB/s"
+)
+
+
+@register_parser("crystaldiskmark", r"CrystalDiskMark")
+def parse_crystaldiskmark(text: str) -> list[dict]:
+    # CrystalDiskMark 7+ lists "SEQ 1MiB (Q= 8, T= 1): 3500.123 MB/s" under a [Read] header,
+    # older versions print "Sequential Read (Q= 32,T= 1) :   550.123 MB/s" (3.x without the queue part).
+    read_section = re.search(r"\[Read\](.*?)(?:\[Write\]|\Z)", text, re.DOTALL)
+    if read_section:
+        match = re.search(_CDM_SEQUENTIAL.format(read=""), read_section.group(1), re.IGNORECASE)
+    else:
+        match = re.search(_CDM_SEQUENTIAL.format(read=r"Read\s*"), text, re.IGNORECASE)
+    if match is None:
+        raise ValueError("CrystalDiskMark export has no sequential read result")
+    queues, threads, speed = match.groups()
+
+    options = {}
+    if queues and threads:
+        options["Queue Depth"] = f"Q{int(queues)}T{int(threads)}"
+    test_size = re.search(r"Test\s*:\s*(\d+\s*[KMG]i?B)", text)
+    if test_size:
+        options["Test Size"] = re.sub(r"\s+", " ", test_size.group(1))
+
+    timestamp = None
+    date = re.search(r"Date\s*:\s*(\d{4}/\d{1,2}/\d{1,2} \d{1,2}:\d{2}:\d{2})", text)
+    if date:
+        timestamp = datetime.strptime(date.group(1), "%Y/%m/%d %H:%M:%S").isoformat()
+
+    return [_result_row("CrystalDiskMark Seq Read", float(speed), options, timestamp)]
+
+
+def decode_tool_output(data: bytes) -> str:
+    """Tool exports on Windows are UTF-16 with a BOM or UTF-8/ANSI text."""
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16", errors="replace")
+    return data.decode("utf-8-sig", errors="replace")
+
+
+def parse_tool_output(text: str, tool: str | None = None) -> tuple[str, list[dict]]:
+    """Parse one file with the named parser, or the first registered parser that recognizes it."""
+    if tool is not None:
+        if tool not in TOOL_PARSERS:
+            raise ValueError(f"Unknown tool '{tool}'. Use: {', '.join(TOOL_PARSERS)}")
+        return tool, TOOL_PARSERS[tool][1](text)
+
+    for name, (detect, parser) in TOOL_PARSERS.items():
+        if detect.search(text):
+            return name, parser(text)
+    raise ValueError("No parser recognizes this file")
+
+
+def iter_tool_files(paths: Iterable[Path]) -> Iterator[tuple[str, Callable[[], bytes]]]:
+    """Yield (name, reader) for every file, walking directories lazily in name order."""
+    for path in paths:
+        if path.is_dir():
+            for child in sorted(path.rglob("*")):
+                if child.is_file():
+                    yield str(child), child.read_bytes
+        else:
+            yield str(path), path.read_bytes
+
+
+def parse_tool_files(
+    files: Iterable[tuple[str, Callable[[], bytes]]],
+    tool: str | None = None,
+    workers: int = 4,
+) -> Iterator[tuple[str, list[dict] | None, str | None]]:
+    """
+    Read and parse files on a worker pool, yielding (name, rows, error) in input order.
+    At most a few files per worker are in flight, so large directories stream through.
+    """
+    def parse(name: str, reader: Callable[[], bytes]):
+        try:
+            _tool, rows = parse_tool_output(decode_tool_output(reader()), tool)
+            return name, rows, None
+        except (OSError, ValueError) as exc:
+            return name, None, str(exc)
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        for name, reader in files:
+            pending.append(executor.submit(parse, name, reader))
+            if len(pending) >= max(workers, 1) * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def ingest_tool_output(
+    db: Session,
+    config_id: int,
+    parsed_files: Iterable[tuple[str, list[dict] | None, str | None]],
+) -> dict:
+    """
+    Insert every parsed result for one config in a single transaction.
+    Options the benchmark defines become selected option values; others are kept in the settings text.
+    """
+    lookups = ImportLookups(db)
+    summary = {"files": 0, "parsed": 0, "created": 0, "duplicates": 0, "failed": 0, "errors": []}
+
+    def record_error(name: str, detail: str):
+        summary["failed"] += 1
+        if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+            summary["errors"].append({"file": name, "detail": detail})
+
+    rows = []
+    row_files = []
+    for name, parsed_rows, error in parsed_files:
+        summary["files"] += 1
+        if error is not None:
+            record_error(name, error)
+            continue
+
+        for parsed in parsed_rows:
+            summary["parsed"] += 1
+            benchmark_id = lookups.benchmarks.get(parsed["benchmark"].casefold())
+            row = {
+                "config_id": config_id,
+                "benchmark": parsed["benchmark"],
+                "result": parsed["result"],
+                "timestamp": parsed.get("timestamp"),
+                "notes": f"Parsed from {Path(name).name}",
+            }
+            custom = []
+            for option_name, value in parsed["options"].items():
+                if (benchmark_id, option_name.casefold()) in lookups.options:
+                    row[f"{OPTION_COLUMN_PREFIX}{option_name}"] = value
+                else:
+                    custom.append(f"{option_name}: {value}")
+            row["settings"] = ", ".join(custom) or None
+
+            try:
+                rows.append(lookups.resolve(row))
+                row_files.append(name)
+            except ValueError as exc:
+                record_error(name, str(exc))
+
+    created, duplicates, errors = ingest_results(db, rows)
+    for error in errors:
+        record_error(row_files[error["index"]], error["detail"])
+    db.commit()
+
+    summary["created"] = created
+    summary["duplicates"] = duplicates
+    return summary